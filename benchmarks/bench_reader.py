@@ -0,0 +1,118 @@
+"""
+Compares the full read/write openpyxl load against the streaming readers
+(openpyxl read-only mode and the direct sheet-XML parser).
+
+Each measurement runs in a fresh subprocess so peak RSS is not polluted by
+earlier runs:
+
+    python -m benchmarks.bench_reader --sizes 10000 100000 500000
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from src.models.record import WorkRecord, new_record_id
+from src.services import xlsx_io
+from src.utils.logger import configure_logging
+
+MODES = ("full", "readonly", "xml")
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    try:
+        import resource
+    except ImportError: # Windows
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def generate_workbook(path: Path, rows: int):
+    """Writes a synthetic work report workbook with the given number of rows."""
+    start = date(2015, 1, 1)
+    records = (
+        WorkRecord(
+            date=start + timedelta(days=i // 5),
+            project_name=f"Project {i % 37}",
+            summary=f"Summary for entry {i}",
+            details=f"Details for entry {i}. " * 4,
+            record_id=new_record_id()
+        )
+        for i in range(rows)
+    )
+    xlsx_io.write_records(records, str(path))
+
+def read_full(path: Path) -> int:
+    """The pre-streaming path: a read/write load that builds every cell object."""
+    import openpyxl
+    workbook = openpyxl.load_workbook(path)
+    sheet = workbook[xlsx_io.SHEET_NAME]
+    count = 0
+    for row in sheet.iter_rows(min_row=2, values_only=True):
+        if xlsx_io.parse_row(row) is not None:
+            count += 1
+    return count
+
+def read_streaming(path: Path, engine: str) -> int:
+    return sum(1 for _ in xlsx_io.iter_records(str(path), engine=engine))
+
+def run_child(path: Path, mode: str):
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "full":
+        rows = read_full(path)
+    else:
+        rows = read_streaming(path, "openpyxl" if mode == "readonly" else "xml")
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "mode": mode,
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "baseline_rss_mb": round(baseline, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }))
+
+def measure(path: Path, mode: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_reader", "--child", str(path), mode],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--child", nargs=2, metavar=("PATH", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    configure_logging(path="") # keep benchmark runs out of the app log
+
+    if args.child:
+        run_child(Path(args.child[0]), args.child[1])
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = Path(tmp) / f"bench_{size}.xlsx"
+            print(f"Generating {size} rows...", file=sys.stderr)
+            generate_workbook(path, size)
+            for mode in MODES:
+                result = measure(path, mode)
+                result["size"] = size
+                results.append(result)
+                print(f"{size:>8} rows  {mode:<10} {result['seconds']:8.2f} s  "
+                      f"peak RSS {result['peak_rss_mb']:8.1f} MB", file=sys.stderr)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    else:
+        print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Storage benchmark suite: cold load, per-operation latency percentiles and
+peak memory for each backend over synthetic histories of several sizes.
+
+Every (backend, size) pair runs in a fresh subprocess so peak RSS and the
+cold load are not affected by earlier runs:
+
+    python -m benchmarks.bench_storage --sizes 1000 10000 100000 500000 --output results.json
+
+Compare a later run against a saved one; the exit status is 1 if any
+scenario got slower than the allowed regression:
+
+    python -m benchmarks.bench_storage --baseline results.json --max-regression 0.25
+"""
+import argparse
+import json
+import logging
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from statistics import mean
+from typing import Callable, Iterable, List, Optional
+
+from benchmarks.bench_reader import peak_rss_mb
+from benchmarks.workload import generate_records, sample_dates, write_history
+from src.models.record import WorkRecord
+from src.utils.logger import configure_logging
+from src.utils.metrics import PERCENTILES, percentile
+
+BACKENDS = ("excel", "sqlite", "partitioned")
+SUFFIXES = {"excel": ".xlsx", "sqlite": ".db", "partitioned": ""} # partitioned: a directory
+
+def summarize(scenario: str, samples: List[float]) -> dict:
+    """Latency statistics of a scenario, in milliseconds."""
+    ordered = sorted(samples)
+    result = {"scenario": scenario, "ops": len(samples)}
+    for pct in PERCENTILES:
+        result[f"p{pct}_ms"] = round(percentile(ordered, pct) * 1000, 4)
+    result["max_ms"] = round(ordered[-1] * 1000, 4)
+    result["mean_ms"] = round(mean(ordered) * 1000, 4)
+    result["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return result
+
+def timed(operation: Callable, arguments: Iterable) -> List[float]:
+    """Calls operation once per argument and returns the latency of each call in seconds."""
+    samples = []
+    for argument in arguments:
+        start = time.perf_counter()
+        operation(argument)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def open_storage(backend: str, path: Path):
+    if backend == "excel":
+        from src.services.storage import ExcelStorage
+        # The app runs with write-behind; saves are measured in memory and the flush separately
+        return ExcelStorage(str(path), write_behind=True, flush_interval=3600)
+    if backend == "partitioned":
+        from src.services.partitioned_storage import PartitionedStorage
+        return PartitionedStorage(str(path), write_behind=True, flush_interval=3600)
+    from src.services.sqlite_storage import SQLiteStorage
+    return SQLiteStorage(str(path))
+
+def run_scenarios(backend: str, path: Path, ops: int, seed: int) -> List[dict]:
+    rng = random.Random(seed)
+    results = []
+
+    start = time.perf_counter()
+    storage = open_storage(backend, path)
+    storage.preload()
+    results.append(summarize("cold_load", [time.perf_counter() - start]))
+
+    existing = [record_id for record_id, _ in storage.get_records_in_range(date.min, date.max)]
+    first, last = storage.get_record(existing[0]).date, storage.get_record(existing[-1]).date
+    days = sample_dates(first, last, ops * 5, seed)
+    results.append(summarize("get_records_by_date", timed(storage.get_records_by_date, days)))
+
+    # The first write may have to open the data file for writing; keep it out of the save percentiles
+    new_records = list(generate_records(ops + 1, seed + 1, start=last + timedelta(days=1)))
+    for record in new_records:
+        record.record_id = ""
+    results.append(summarize("first_write", timed(storage.save_record, new_records[:1])))
+    results.append(summarize("save_record", timed(storage.save_record, new_records[1:])))
+
+    targets = rng.sample(existing, min(2 * ops, len(existing)))
+    updates, deletes = targets[:len(targets) // 2], targets[len(targets) // 2:]
+
+    def update(record_id: str):
+        record = storage.get_record(record_id)
+        storage.update_record(record_id, WorkRecord(record.date, record.project_name,
+                                                    record.summary + " (edited)", record.details))
+
+    results.append(summarize("update_record", timed(update, updates)))
+    results.append(summarize("delete_record", timed(storage.delete_record, deletes)))
+    results.append(summarize("flush", timed(lambda _: storage.flush(), [None])))
+    storage.close()
+    return results
+
+def run_child(backend: str, path: Path, ops: int, seed: int):
+    for result in run_scenarios(backend, path, ops, seed):
+        print(json.dumps(result))
+
+def measure(backend: str, path: Path, ops: int, seed: int) -> List[dict]:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_storage", "--child", backend, str(path),
+         "--ops", str(ops), "--seed", str(seed)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return [json.loads(line) for line in output.splitlines() if line.startswith("{")]
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results: List[dict], baseline: List[dict], metrics: List[str],
+            max_regression: float, min_delta_ms: float) -> List[str]:
+    """
+    Returns a description of every scenario whose metric grew by more than
+    max_regression (a fraction) relative to the baseline run. Differences
+    below min_delta_ms are treated as noise.
+    """
+    def key(result: dict) -> tuple:
+        return result["backend"], result["size"], result["scenario"]
+
+    previous = {key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get(key(result))
+        if old is None:
+            continue
+        for metric in metrics:
+            if metric not in result or metric not in old:
+                continue
+            before, after = old[metric], result[metric]
+            if metric.endswith("_ms") and after - before < min_delta_ms:
+                continue
+            if before > 0 and after > before * (1 + max_regression):
+                backend, size, scenario = key(result)
+                regressions.append(f"{backend} {size} rows {scenario}: {metric} {before} -> {after} "
+                                   f"(+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--ops", type=int, default=200, help="operations per mutation scenario")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="allowed slowdown versus the baseline as a fraction (default: %(default)s)")
+    parser.add_argument("--metrics", nargs="+", default=["p50_ms", "p90_ms"],
+                        help="result fields compared against the baseline (default: %(default)s)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05,
+                        help="ignore latency differences smaller than this (default: %(default)s)")
+    parser.add_argument("--child", nargs=2, metavar=("BACKEND", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    # Per-record log lines would dominate the timings, and the benchmark's own
+    # runs don't belong in the app log of the working directory
+    logging.disable(logging.INFO)
+    configure_logging(path="")
+
+    if args.child:
+        run_child(args.child[0], Path(args.child[1]), args.ops, args.seed)
+        return 0
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            for backend in args.backends:
+                path = Path(tmp) / f"bench_{size}{SUFFIXES[backend]}"
+                print(f"Generating {size} {backend} rows...", file=sys.stderr)
+                write_history(path, backend, size, args.seed)
+                for result in measure(backend, path, args.ops, args.seed):
+                    result.update(backend=backend, size=size)
+                    results.append(result)
+                    print(f"{backend:<12}{size:>8} rows  {result['scenario']:<20}"
+                          f"p50 {result['p50_ms']:10.3f} ms  p99 {result['p99_ms']:10.3f} ms  "
+                          f"peak RSS {result['peak_rss_mb']:8.1f} MB", file=sys.stderr)
+                if path.is_dir():
+                    shutil.rmtree(path)
+                else:
+                    path.unlink()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "ops": args.ops,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    elif not args.baseline:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline["results"], args.metrics,
+                              args.max_regression, args.min_delta_ms)
+        if regressions:
+            print("Regressions against the baseline:", *regressions, sep="\n  ", file=sys.stderr)
+            return 1
+        print(f"No regressions above {args.max_regression:.0%} against {args.baseline}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
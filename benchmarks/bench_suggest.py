@@ -0,0 +1,78 @@
+"""
+Latency of project name suggestions (ProjectIndex.lookup) as the number of
+distinct project names grows, for the queries a user types into the
+project box: empty, short prefixes, word prefixes, typos, abbreviations
+and misses.
+
+    python -m benchmarks.bench_suggest --sizes 1000 --max-p99-ms 1
+
+The exit status is 1 if the p99 latency of any size exceeds --max-p99-ms.
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List
+
+from src.services.project_index import ProjectIndex
+from src.utils.metrics import PERCENTILES, percentile
+
+WORDS = ["alpha", "beta", "gamma", "delta", "client", "portal", "mobile", "infra", "billing", "report"]
+QUERIES = ["", "al", "alpha be", "porta", "bilgin", "ab 12", "zzzz"]
+
+def build_index(names: int) -> ProjectIndex:
+    """An index of distinct names like "portal billing 12" with varied counts and dates."""
+    index = ProjectIndex()
+    for i in range(names):
+        name = f"{WORDS[i % 10]} {WORDS[i // 10 % 10]} {i // 100}"
+        index.add_count(name, date(2020, 1, 1) + timedelta(days=i % 2000), i % 7 + 1)
+    return index
+
+def measure(names: int, rounds: int) -> dict:
+    index = build_index(names)
+    index.lookup("") # builds the popularity order, as the first save after a change would
+    samples: List[float] = []
+    for _ in range(rounds):
+        for query in QUERIES:
+            start = time.perf_counter()
+            index.lookup(query)
+            samples.append(time.perf_counter() - start)
+    ordered = sorted(samples)
+    result = {"names": names, "ops": len(samples)}
+    for pct in PERCENTILES:
+        result[f"p{pct}_ms"] = round(percentile(ordered, pct) * 1000, 4)
+    result["max_ms"] = round(ordered[-1] * 1000, 4)
+    return result
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--rounds", type=int, default=50, help="times every query is looked up")
+    parser.add_argument("--max-p99-ms", type=float, help="fail if any size's p99 latency is above this")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes:
+        result = measure(size, args.rounds)
+        results.append(result)
+        print(f"{size:>8} names  p50 {result['p50_ms']:8.3f} ms  p99 {result['p99_ms']:8.3f} ms",
+              file=sys.stderr)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.max_p99_ms is not None:
+        slow = [result for result in results if result["p99_ms"] > args.max_p99_ms]
+        if slow:
+            print("Slower than the limit:", *(f"{r['names']} names: p99 {r['p99_ms']} ms" for r in slow),
+                  sep="\n  ", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Deterministic synthetic work record histories for benchmarks.
+
+The same (count, seed) always produces the same records, so timings from
+different commits are measured against identical data. Histories end on
+the day they are generated, so only the dates move between runs.
+"""
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from src.models.record import WorkRecord
+
+_PROJECTS = [f"Project {name}" for name in (
+    "Apollo", "Borealis", "Cobalt", "Delta", "Ember", "Falcon", "Granite", "Harbor",
+    "Iris", "Juniper", "Kestrel", "Lumen", "Mosaic", "Nimbus", "Onyx", "Pioneer",
+)] + ["內部系統", "客服平台", "資料倉儲", "行動應用"]
+_VERBS = ["Fix", "Review", "Implement", "Refactor", "Document", "Test", "Deploy", "Investigate", "修正", "討論"]
+_NOUNS = ["login flow", "report export", "API timeout", "calendar view", "search index",
+          "billing job", "CI pipeline", "dashboard", "報表匯出", "權限設定", "效能問題"]
+_SENTENCES = [
+    "Paired with the team on the remaining edge cases.",
+    "Waiting on feedback from the product owner.",
+    "Added regression tests and updated the changelog.",
+    "Root cause was a missing index on the lookup table.",
+    "與客戶開會確認需求細節。",
+    "修正後已部署到測試環境，待驗證。",
+]
+
+def _day_size(rng: random.Random, day: date) -> int:
+    """Entries on one day: 0-8 per weekday, occasional weekend work."""
+    return rng.randint(0, 8) if day.weekday() < 5 else rng.choice((0, 0, 0, 1))
+
+def generate_records(count: int, seed: int = 0, start: Optional[date] = None,
+                     end: Optional[date] = None) -> Iterator[WorkRecord]:
+    """
+    Yields count records spread over consecutive days, oldest first: 0-8
+    entries per weekday, occasional weekend work, a skewed project mix (a
+    few busy projects, a long tail) and details of varied length.
+
+    The history begins at start if given, otherwise it ends at end (default
+    today), so the current year is populated like in real use: backends
+    that only load recent data up front are measured on real records.
+    Day sizes and record contents come from separate seeded streams, so
+    the same (count, seed) always yields the same records, only their
+    dates move with the anchor day.
+    """
+    sizes_rng = random.Random(f"days-{seed}")
+    step = timedelta(days=1 if start else -1)
+    day = start or end or date.today()
+    days: List[tuple[date, int]] = []
+    planned = 0
+    while planned < count:
+        size = min(_day_size(sizes_rng, day), count - planned)
+        days.append((day, size))
+        planned += size
+        day += step
+    if start is None:
+        days.reverse()
+
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(_PROJECTS))]
+    for day, size in days:
+        for _ in range(size):
+            yield WorkRecord(
+                date=day,
+                project_name=rng.choices(_PROJECTS, weights)[0],
+                summary=f"{rng.choice(_VERBS)} {rng.choice(_NOUNS)} #{rng.randint(100, 9999)}",
+                details=" ".join(rng.choices(_SENTENCES, k=rng.randint(0, 4))),
+                record_id=f"{rng.getrandbits(128):032x}" # like new_record_id(), but reproducible
+            )
+
+def write_history(path: Path, backend: str, count: int, seed: int = 0):
+    """Creates a data file of the given backend holding count generated records."""
+    records = generate_records(count, seed)
+    if backend == "excel":
+        from src.services import xlsx_io
+        xlsx_io.write_records(records, str(path))
+    elif backend == "partitioned":
+        from src.services import xlsx_io
+        from src.services.partitioned_storage import PartitionedStorage
+        monolithic = path.with_suffix(".xlsx")
+        xlsx_io.write_records(records, str(monolithic))
+        PartitionedStorage(str(path)).migrate_from_xlsx(str(monolithic))
+        monolithic.unlink()
+    elif backend == "sqlite":
+        from src.services.sqlite_storage import SQLiteStorage
+        storage = SQLiteStorage(str(path))
+        storage.save_records(records)
+        storage.close()
+    else:
+        raise ValueError(f"Unknown backend '{backend}'")
+
+def sample_dates(first: date, last: date, count: int, seed: int = 0) -> List[date]:
+    """Random days between first and last (inclusive), with repeats."""
+    rng = random.Random(seed)
+    span = (last - first).days
+    return [first + timedelta(days=rng.randint(0, span)) for _ in range(count)]
@@ -0,0 +1,179 @@
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import Counter
+from datetime import date
+from typing import List, Optional
+
+from src.models.record import WorkRecord
+from src.services import record_io, xlsx_io
+from src.services.backend import StorageBackend
+from src.services.factory import BACKENDS, create_storage
+from src.utils.config import CONFIG_FILE, load_config
+from src.utils.logger import configure_logging
+from src.utils.metrics import METRICS_FILE, metrics
+
+# Headless: this module must never import the GUI toolkit
+EXAMPLES = """examples:
+  python -m src.cli import tickets.csv
+  python -m src.cli export backup.jsonl --from 2024-01-01
+  python -m src.cli query --search "login" --format csv
+  python -m src.cli stats
+  python -m src.cli --backend partitioned archive 2022
+"""
+
+def _add_range_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--from", dest="start", metavar="DATE", type=date.fromisoformat,
+                        help="first date to include (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", metavar="DATE", type=date.fromisoformat,
+                        help="last date to include (YYYY-MM-DD)")
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Weekly Report Tool (headless)",
+                                     epilog=EXAMPLES, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default=CONFIG_FILE, help="settings file (default: %(default)s)")
+    parser.add_argument("--backend", choices=BACKENDS, help="override the configured storage backend")
+    parser.add_argument("--metrics", nargs="?", const=METRICS_FILE, metavar="FILE",
+                        help="log storage timings as JSON lines (default file: %(const)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cmd = commands.add_parser("import", help="append records from a CSV, JSONL or xlsx file")
+    cmd.add_argument("file")
+    cmd.add_argument("--format", choices=record_io.FORMATS, help="default: from the file extension")
+
+    cmd = commands.add_parser("export", help="write records to a CSV, JSONL or xlsx file")
+    cmd.add_argument("file")
+    cmd.add_argument("--format", choices=record_io.FORMATS, help="default: from the file extension")
+    _add_range_args(cmd)
+
+    cmd = commands.add_parser("query", help="print matching records")
+    _add_range_args(cmd)
+    cmd.add_argument("--date", type=date.fromisoformat, help="a single day (YYYY-MM-DD)")
+    cmd.add_argument("--project", help="only this project")
+    cmd.add_argument("--search", help="full-text search terms")
+    cmd.add_argument("--format", choices=("table", "csv", "jsonl"), default="table")
+    cmd.add_argument("--limit", type=int, help="print at most this many records")
+
+    cmd = commands.add_parser("stats", help="summarise the stored records")
+    _add_range_args(cmd)
+
+    cmd = commands.add_parser("archive", help="compress closed years into read-only archives (partitioned backend)")
+    cmd.add_argument("years", metavar="YEAR", type=int, nargs="+")
+    return parser.parse_args(argv)
+
+def open_storage(args: argparse.Namespace) -> StorageBackend:
+    config = load_config(args.config)
+    if args.backend:
+        config.backend = args.backend
+    configure_logging(config.log_level)
+    if args.metrics or config.metrics:
+        metrics.enable(args.metrics or METRICS_FILE)
+    # One-shot process: write explicitly at the end of each batch instead of on a timer
+    config.write_behind = False
+    return create_storage(config)
+
+def _rate(count: int, seconds: float) -> str:
+    return f"{count} records in {seconds:.2f}s ({count / seconds if seconds else 0:,.0f} records/s)"
+
+def cmd_import(storage: StorageBackend, args: argparse.Namespace) -> int:
+    errors: List[str] = []
+    records = record_io.iter_records(args.file, args.format,
+                                     on_error=lambda line, e: errors.append(f"  line {line}: {e}"))
+    started = time.perf_counter()
+    count = storage.save_records(records) # one batched write for the whole file
+    print(f"Imported {_rate(count, time.perf_counter() - started)} from {args.file}")
+    if errors:
+        print(f"Skipped {len(errors)} malformed rows:", *errors[:20], sep="\n", file=sys.stderr)
+    return 0
+
+def cmd_export(storage: StorageBackend, args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    records = storage.get_records_in_range(args.start or date.min, args.end or date.max)
+    count = record_io.write_records((record for _, record in records), args.file, args.format)
+    print(f"Exported {_rate(count, time.perf_counter() - started)} to {args.file}")
+    return 0
+
+def _query(storage: StorageBackend, args: argparse.Namespace) -> List[tuple[str, WorkRecord]]:
+    start, end = (args.date, args.date) if args.date else (args.start, args.end)
+    if args.search:
+        return storage.search(args.search, start, end, args.project)
+    records = storage.get_records_in_range(start or date.min, end or date.max)
+    if args.project is not None:
+        records = [(i, r) for i, r in records if r.project_name == args.project]
+    return records
+
+def cmd_query(storage: StorageBackend, args: argparse.Namespace) -> int:
+    records = _query(storage, args)
+    if args.limit is not None:
+        records = records[:args.limit]
+    if args.format == "jsonl":
+        for _, record in records:
+            print(json.dumps(record.to_dict(), ensure_ascii=False))
+    elif args.format == "csv":
+        writer = csv.writer(sys.stdout)
+        writer.writerow(xlsx_io.HEADERS)
+        for _, record in records:
+            writer.writerow(xlsx_io.record_to_row(record))
+    else:
+        width = max((len(r.project_name) for _, r in records), default=7)
+        for record_id, record in records:
+            print(f"{record.date.isoformat()}  {record.project_name:<{width}}  {record.summary}  [{record_id}]")
+        print(f"({len(records)} records)", file=sys.stderr)
+    return 0
+
+def cmd_stats(storage: StorageBackend, args: argparse.Namespace) -> int:
+    records = [r for _, r in storage.get_records_in_range(args.start or date.min, args.end or date.max)]
+    print(f"Records: {len(records)}")
+    if not records:
+        return 0
+    days = {r.date for r in records}
+    print(f"Period:  {min(days).isoformat()} ~ {max(days).isoformat()} ({len(days)} days with records)")
+
+    print("\nBy project:")
+    projects = Counter(r.project_name for r in records)
+    width = max(len(name) for name in projects)
+    for name, count in projects.most_common():
+        print(f"  {name:<{width}}  {count:>6}")
+
+    print("\nBy month:")
+    for month, count in sorted(Counter(r.date.strftime("%Y-%m") for r in records).items()):
+        print(f"  {month}  {count:>6}")
+    return 0
+
+def cmd_archive(storage: StorageBackend, args: argparse.Namespace) -> int:
+    from src.services.partitioned_storage import PartitionedStorage
+    if not isinstance(storage, PartitionedStorage):
+        print("archive needs the partitioned backend (--backend partitioned)", file=sys.stderr)
+        return 2
+    for year in args.years:
+        print(f"Archived {storage.archive_year(year)} records of {year}")
+    return 0
+
+COMMANDS = {
+    "import": cmd_import,
+    "export": cmd_export,
+    "query": cmd_query,
+    "stats": cmd_stats,
+    "archive": cmd_archive,
+}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        storage = open_storage(args)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    try:
+        return COMMANDS[args.command](storage, args)
+    except (OSError, ValueError) as e:
+        print(f"{args.command} failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        storage.close()
+        metrics.disable() # writes the percentile summary
+
+if __name__ == "__main__":
+    sys.exit(main())
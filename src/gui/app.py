@@ -1,13 +1,19 @@
+import calendar
 import customtkinter as ctk
-from datetime import date
-from typing import Optional
+import time
+from datetime import date, timedelta
+from typing import Callable, Iterable, List, Optional
 
-from src.services.storage import ExcelStorage
+from src.services.backend import StorageBackend
+from src.services.day_cache import DayCache, week_of
+from src.services.factory import create_storage
+from src.services.io_executor import IOExecutor
 from src.models.record import WorkRecord
 from src.gui.frames.calendar_frame import CalendarFrame
-from src.gui.frames.records_frame import RecordsFrame
-from src.gui.frames.maintenance_frame import MaintenanceFrame
+from src.utils.config import load_config
 from src.utils.logger import setup_logger
+from src.utils.metrics import metrics
+from src.utils.profiling import StartupProfiler
 
 logger = setup_logger("App")
 
@@ -15,73 +21,389 @@ class App(ctk.CTk):
     """
     Main Application Window.
     Orchestrates tabs and data flow.
+    Storage calls run on an IOExecutor so the Tk main loop never blocks on disk I/O.
+
+    To get the window on screen quickly, the storage backend is opened and
+    preloaded on the I/O thread, and the Records/Maintenance frames are only
+    built the first time they are needed.
+
+    Once storage is open it is polled every WATCH_INTERVAL_MS for changes
+    made by other processes (another instance, a CLI script), and the
+    calendar and records views are refreshed when there are any.
+
+    Day views are served from a DayCache when possible. After a day is
+    shown, its week, the neighbouring days and the month visible in the
+    calendar are loaded into it in the background, so stepping through
+    nearby days rarely waits for storage. Writes invalidate exactly the
+    days they touch.
+
+    Ctrl+Shift+M switches the timing log (metrics.jsonl) on and off; it
+    records how long each click took from request to rendered view.
     """
-    def __init__(self):
+    IO_POLL_MS = 30
+    WATCH_INTERVAL_MS = 3000
+    TAB_HOME = "Home (Calendar)"
+    TAB_RECORDS = "Daily Records"
+    TAB_MAINT = "Maintenance"
+    TAB_REPORT = "Reports"
+
+    def __init__(self, profiler: Optional[StartupProfiler] = None):
         super().__init__()
+        self.profiler = profiler or StartupProfiler()
         
         self.title("Weekly Report Tool")
         self.geometry("800x600")
         
         # Services
-        self.storage = ExcelStorage()
+        # Opened on the writer thread; every later storage call queues behind it
+        self.storage: Optional[StorageBackend] = None
+        self.io = IOExecutor()
+        self.day_cache = DayCache()
+        self.io.submit_write(self._open_storage,
+                             on_done=self._on_storage_ready,
+                             on_error=lambda e: self._on_io_error("Failed to open storage", e))
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.bind("<Control-Shift-KeyPress-M>", lambda e: self.toggle_metrics())
         
         # UI Setup
-        self.tab_view = ctk.CTkTabview(self)
+        self.tab_view = ctk.CTkTabview(self, command=self._on_tab_changed)
         self.tab_view.pack(fill="both", expand=True, padx=10, pady=10)
         
-        self.tab_home = self.tab_view.add("Home (Calendar)")
-        self.tab_records = self.tab_view.add("Daily Records")
-        self.tab_maint = self.tab_view.add("Maintenance")
+        self.tab_home = self.tab_view.add(self.TAB_HOME)
+        self.tab_records = self.tab_view.add(self.TAB_RECORDS)
+        self.tab_maint = self.tab_view.add(self.TAB_MAINT)
+        self.tab_report = self.tab_view.add(self.TAB_REPORT)
         
         # -- Tab 1: Home --
-        self.calendar_frame = CalendarFrame(self.tab_home, on_date_click=self.on_date_selected)
+        self.calendar_frame = CalendarFrame(self.tab_home, on_date_click=self.on_date_selected,
+                                            on_summary_request=self.request_month_summary)
         self.calendar_frame.pack(fill="both", expand=True)
-        
-        # -- Tab 2: Records --
-        self.records_frame = RecordsFrame(self.tab_records, 
-                                          on_delete=self.delete_record,
-                                          on_edit=self.edit_record_request)
-        self.records_frame.pack(fill="both", expand=True)
-        
-        # -- Tab 3: Maintenance --
-        self.maintenance_frame = MaintenanceFrame(self.tab_maint, on_save=self.save_record)
-        self.maintenance_frame.pack(fill="both", expand=True)
+
+        # -- Other tabs are built on first use, see records_frame / maintenance_frame / report_frame --
+        self._records_frame = None
+        self._maintenance_frame = None
+        self._report_frame = None
+
+        self._watch_job: Optional[str] = None
+        self._poll_io()
+        self.after_idle(lambda: self.profiler.mark("first paint"))
+
+    @property
+    def records_frame(self):
+        """The Daily Records tab, built on first access."""
+        if self._records_frame is None:
+            with self.profiler.phase("build RecordsFrame"):
+                from src.gui.frames.records_frame import RecordsFrame
+                self._records_frame = RecordsFrame(self.tab_records, 
+                                                   on_delete=self.delete_record,
+                                                   on_edit=self.edit_record_request,
+                                                   on_search=self.search_records,
+                                                   on_step_day=self.step_day)
+                self._records_frame.pack(fill="both", expand=True)
+        return self._records_frame
+
+    @property
+    def maintenance_frame(self):
+        """The Maintenance tab, built on first access."""
+        if self._maintenance_frame is None:
+            with self.profiler.phase("build MaintenanceFrame"):
+                from src.gui.frames.maintenance_frame import MaintenanceFrame
+                self._maintenance_frame = MaintenanceFrame(self.tab_maint, on_save=self.save_record,
+                                                           on_project_query=self.request_project_suggestions)
+                self._maintenance_frame.pack(fill="both", expand=True)
+                self.request_project_suggestions("")
+        return self._maintenance_frame
+
+    @property
+    def report_frame(self):
+        """The Reports tab, built on first access."""
+        if self._report_frame is None:
+            with self.profiler.phase("build ReportFrame"):
+                from src.gui.frames.report_frame import ReportFrame
+                self._report_frame = ReportFrame(self.tab_report,
+                                                 on_generate=self.generate_report,
+                                                 on_export=self.export_report)
+                self._report_frame.pack(fill="both", expand=True)
+        return self._report_frame
+
+    def _on_tab_changed(self):
+        tab = self.tab_view.get()
+        if tab == self.TAB_RECORDS:
+            self.records_frame
+        elif tab == self.TAB_MAINT:
+            self.maintenance_frame
+        elif tab == self.TAB_REPORT:
+            self.report_frame
+
+    def _open_storage(self) -> StorageBackend:
+        """Runs on the I/O thread: opens the configured backend and warms its cache."""
+        with self.profiler.phase("open storage"):
+            config = load_config()
+            if config.metrics and not metrics.enabled:
+                metrics.enable()
+            storage = create_storage(config)
+        with self.profiler.phase("preload storage"):
+            storage.preload()
+        self.storage = storage
+        return storage
+
+    def _on_storage_ready(self, storage: StorageBackend):
+        self.profiler.mark("storage ready")
+        self.profiler.log(logger)
+        self._watch_job = self.after(self.WATCH_INTERVAL_MS, self._watch_storage)
+
+    def _watch_storage(self):
+        """Checks in the background whether another process changed the records."""
+        self.io.submit_read(
+            self._storage_call("poll_external_changes"),
+            key="watch",
+            on_done=self._on_external_change,
+            on_error=lambda e: logger.error(f"Failed to check for external changes: {e}")
+        )
+        self._watch_job = self.after(self.WATCH_INTERVAL_MS, self._watch_storage)
+
+    def _on_external_change(self, changed: bool):
+        if not changed:
+            return
+        logger.info("Records were changed by another process, refreshing views")
+        self.day_cache.clear()
+        self.calendar_frame.invalidate_all()
+        if self._records_frame is not None:
+            self._refresh_records_view()
+
+    def toggle_metrics(self):
+        enabled = metrics.toggle()
+        logger.info(f"Timing log {'enabled' if enabled else 'disabled'}: {metrics.path}")
+
+    @staticmethod
+    def _timed_callback(name: str, callback: Callable, **fields) -> Callable:
+        """Wraps an on_done callback to log the time from the request to the rendered result."""
+        requested = time.perf_counter()
+
+        def on_done(result):
+            callback(result)
+            metrics.record(name, time.perf_counter() - requested, rows=len(result), **fields)
+        return on_done
+
+    def _storage_call(self, method: str, *args) -> Callable:
+        """Builds a call that resolves self.storage on the worker thread, once it has been opened."""
+        return lambda: getattr(self.storage, method)(*args)
+
+    def _poll_io(self):
+        """Delivers finished background I/O to the UI thread."""
+        self.io.poll()
+        self._io_poll_job = self.after(self.IO_POLL_MS, self._poll_io)
+
+    def on_close(self):
+        """Flushes pending storage writes before the window goes away."""
+        self.after_cancel(self._io_poll_job)
+        if self._watch_job is not None:
+            self.after_cancel(self._watch_job)
+        stats = self.day_cache.stats
+        logger.info(f"Day cache: {stats.hits} hits, {stats.misses} misses ({stats.hit_rate:.0%}), "
+                    f"{stats.prefetched} days prefetched, {stats.stale_drops} dropped as stale")
+        try:
+            # Let queued writes finish before the final flush
+            self.io.shutdown(wait=True)
+            if self.storage is not None:
+                self.storage.close()
+        except Exception as e:
+            logger.error(f"Failed to flush storage on exit: {e}", exc_info=True)
+        self.destroy()
 
     def on_date_selected(self, selected_date: date):
         """Called when a date is clicked in the calendar."""
-        logger.info(f"Date selected: {selected_date}")
-        self.tab_view.set("Daily Records")
+        logger.debug("Date selected: %s", selected_date)
+        self.tab_view.set(self.TAB_RECORDS)
         self.load_records_for_date(selected_date)
 
+    def step_day(self, days: int):
+        """Shows the day before (-1) or after (+1) the one in the Records tab."""
+        current = self.records_frame.current_date or date.today()
+        self.load_records_for_date(current + timedelta(days=days))
+
     def load_records_for_date(self, target_date: date):
-        """Fetches records and updates the view."""
-        records = self.storage.get_records_by_date(target_date)
-        self.records_frame.display_records(target_date, records)
+        """Shows a day from the cache, or fetches it in the background, then prefetches around it."""
+        requested = time.perf_counter()
+        records = self.day_cache.get(target_date)
+        if records is not None:
+            self.io.cancel("records") # an older, slower load must not replace this day
+            self.records_frame.display_records(target_date, records)
+            metrics.record("click.records_for_date", time.perf_counter() - requested, rows=len(records), cached=True)
+            self.prefetch_around(target_date)
+            return
+
+        def on_done(records: List[tuple[str, WorkRecord]]):
+            self.day_cache.store_range(target_date, target_date, records, token, prefetched=False)
+            self.records_frame.display_records(target_date, records)
+            self.prefetch_around(target_date)
+
+        self.records_frame.show_loading(target_date)
+        token = self.day_cache.token()
+        # Keyed so a newer click supersedes a load that is still in flight
+        self.io.submit_read(
+            self._storage_call("get_records_by_date", target_date),
+            key="records",
+            on_done=self._timed_callback("click.records_for_date", on_done, cached=False),
+            on_error=lambda e: self._on_io_error(f"Failed to load records for {target_date}", e)
+        )
+
+    def prefetch_around(self, target_date: date):
+        """
+        Loads the days around target_date that aren't cached yet: its week
+        plus the days either side, and the month shown in the calendar.
+        Each is one range query; a newer prefetch supersedes an older one.
+        """
+        monday, sunday = week_of(target_date)
+        shown = self.calendar_frame.current_date
+        month_start = shown.replace(day=1)
+        month_end = shown.replace(day=calendar.monthrange(shown.year, shown.month)[1])
+        for key, start, end in (("prefetch-week", min(monday, target_date - timedelta(days=1)),
+                                 max(sunday, target_date + timedelta(days=1))),
+                                ("prefetch-month", month_start, month_end)):
+            missing = self.day_cache.missing(start, end)
+            if missing:
+                self._prefetch(key, missing[0], missing[-1])
+
+    def _prefetch(self, key: str, start: date, end: date):
+        token = self.day_cache.token()
+        self.io.submit_read(
+            self._storage_call("get_records_in_range", start, end),
+            key=key,
+            on_done=lambda records: self.day_cache.store_range(start, end, records, token),
+            on_error=lambda e: logger.warning(f"Failed to prefetch {start} ~ {end}: {e}")
+        )
+
+    def search_records(self, query: str):
+        """Runs a full-text search in the background and lists the hits."""
+        self.records_frame.show_searching(query)
+        # Shares the "records" key with date loads: whichever was requested last wins
+        self.io.submit_read(
+            self._storage_call("search", query),
+            key="records",
+            on_done=self._timed_callback("click.search",
+                                         lambda records: self.records_frame.display_search_results(query, records)),
+            on_error=lambda e: self._on_io_error(f"Search for '{query}' failed", e)
+        )
+
+    def _refresh_records_view(self):
+        """Reloads whatever the Records tab is showing: search results or a day."""
+        if self.records_frame.current_query is not None:
+            self.search_records(self.records_frame.current_query)
+        elif self.records_frame.current_date:
+            self.load_records_for_date(self.records_frame.current_date)
+
+    def generate_report(self, start: date, end: date):
+        """Builds a report for a date range in the background."""
+        from src.services.report import build_report
+        self.io.submit_read(
+            lambda: build_report(self.storage, start, end),
+            key="report",
+            on_done=self.report_frame.display_report,
+            on_error=lambda e: self._on_report_error(f"Failed to build report for {start} ~ {end}", e)
+        )
 
-    def save_record(self, record: WorkRecord, row_index: Optional[int]):
+    def export_report(self, report, file_path: str):
+        """Writes a generated report to disk in the background."""
+        from src.services.report import save_report
+        self.io.submit_read(
+            lambda: save_report(report, file_path),
+            on_done=lambda path: logger.info(f"Report saved to {path}"),
+            on_error=lambda e: self._on_report_error(f"Failed to save report to {file_path}", e)
+        )
+
+    def _on_report_error(self, message: str, error: BaseException):
+        logger.error(f"{message}: {error}", exc_info=error)
+        self.report_frame.show_message(f"{message}: {error}")
+
+    def request_month_summary(self, year: int, month: int):
+        """Fetches per-day record counts for the calendar heatmap."""
+        self.io.submit_read(
+            self._storage_call("month_summary", year, month),
+            key=f"summary-{year}-{month}",
+            on_done=self._timed_callback("click.month_summary",
+                                         lambda summary: self.calendar_frame.set_month_summary(year, month, summary)),
+            on_error=lambda e: self._on_summary_error(year, month, e)
+        )
+
+    def _on_summary_error(self, year: int, month: int, error: BaseException):
+        logger.error(f"Failed to load summary for {year}-{month:02d}: {error}")
+        self.calendar_frame.summary_failed(year, month)
+
+    def request_project_suggestions(self, query: str):
+        """Fills the project dropdown from the storage's project index."""
+        self.io.submit_read(
+            self._storage_call("suggest_projects", query),
+            key="projects",
+            on_done=self._timed_callback("click.suggest_projects", lambda usages:
+                                         self.maintenance_frame.set_project_suggestions([u.name for u in usages])),
+            on_error=lambda e: logger.error(f"Failed to suggest projects for '{query}': {e}")
+        )
+
+    def _on_records_changed(self, dates: Iterable[date]):
+        """Invalidates cached calendar months touched by a write and refreshes project suggestions."""
+        for year, month in {(d.year, d.month) for d in dates}:
+            self.calendar_frame.invalidate_month(year, month)
+        if self._maintenance_frame is not None:
+            self.request_project_suggestions("")
+
+    def _on_io_error(self, message: str, error: BaseException):
+        logger.error(f"{message}: {error}", exc_info=error)
+        self.records_frame.show_message(f"{message}.")
+
+    def save_record(self, record: WorkRecord, record_id: Optional[str]):
         """Callback from Maintenance frame to save data."""
-        if row_index:
-            self.storage.update_record_by_row(row_index, record)
-        else:
-            self.storage.save_record(record)
+        def write() -> List[date]:
+            if not record_id:
+                self.storage.save_record(record)
+                dates = [record.date]
+            else:
+                # An edit may move the record to another day, so report both dates
+                old = self.storage.get_record(record_id)
+                self.storage.update_record(record_id, record)
+                dates = [record.date] + ([old.date] if old else [])
+            # Before any read queued behind this write can run
+            self.day_cache.invalidate(dates)
+            return dates
+
+        # Right away as well, so the view below can't be served the day as it was before the write.
+        # Edits start from the Records tab, so the day on show there is the record's old date.
+        stale = [record.date]
+        if record_id and self._records_frame is not None and self._records_frame.current_date is not None:
+            stale.append(self._records_frame.current_date)
+        self.day_cache.invalidate(stale)
+        self.io.submit_write(write,
+                             on_done=self._on_records_changed,
+                             on_error=lambda e: self._on_io_error("Failed to save record", e))
         
         # Refresh views if needed
         # Switch to records view to show the new record? 
         # Or stay on maintenance?
         # Let's switch to the date of the record we just saved/edited
-        self.tab_view.set("Daily Records")
+        self.tab_view.set(self.TAB_RECORDS)
         self.load_records_for_date(record.date)
 
-    def delete_record(self, row_index: int):
+    def delete_record(self, record_id: str):
         """Callback to delete a record."""
         # Confirmation dialog could go here
-        self.storage.delete_record_by_row(row_index)
+        def write() -> List[date]:
+            old = self.storage.get_record(record_id)
+            self.storage.delete_record(record_id)
+            dates = [old.date] if old else []
+            self.day_cache.invalidate(dates)
+            return dates
+
+        # Deletes come from the Records tab, so the day on show is the one losing a record
+        if self.records_frame.current_date is not None:
+            self.day_cache.invalidate([self.records_frame.current_date])
+        self.io.submit_write(write,
+                             on_done=self._on_records_changed,
+                             on_error=lambda e: self._on_io_error("Failed to delete record", e))
         
         # Refresh current view
-        if self.records_frame.current_date:
-            self.load_records_for_date(self.records_frame.current_date)
+        self._refresh_records_view()
 
-    def edit_record_request(self, row_index: int, record: WorkRecord):
+    def edit_record_request(self, record_id: str, record: WorkRecord):
         """Callback to initiate edit."""
-        self.tab_view.set("Maintenance")
-        self.maintenance_frame.load_record(record, row_index)
+        self.tab_view.set(self.TAB_MAINT)
+        self.maintenance_frame.load_record(record, record_id)
@@ -1,93 +1,196 @@
 import calendar
-from datetime import date, timedelta
+from datetime import date
 import customtkinter as ctk
-from typing import Callable
+from typing import Callable, Dict, List, Optional, Set
+from src.utils.metrics import timed
 
 class CalendarFrame(ctk.CTkFrame):
     """
     Displays a monthly calendar.
     Allows navigating months and selecting a date.
+    Days with records are shaded by how many entries they have; the
+    per-month counts come from on_summary_request and are cached per month.
+
+    The 6x7 grid of day buttons is created once and reconfigured in place
+    for every month. Page Up/Down and the mouse wheel step through months;
+    redraws are coalesced so fast scrolling skips intermediate months.
     """
-    def __init__(self, master, on_date_click: Callable[[date], None], **kwargs):
+    # Shades for 1, 2, 3 and 4+ records on a day
+    HEAT_COLORS = ["#5b8def", "#3b6fd6", "#2451b3", "#163a8a"]
+    TODAY_COLOR = "green"
+    WEEKS = 6
+    REDRAW_DELAY_MS = 40
+
+    def __init__(self, master, on_date_click: Callable[[date], None],
+                 on_summary_request: Optional[Callable[[int, int], None]] = None, **kwargs):
         super().__init__(master, **kwargs)
         self.on_date_click = on_date_click
+        self.on_summary_request = on_summary_request
         self.current_date = date.today()
         self.selected_date = None
-        
+        self._summaries: Dict[tuple[int, int], Dict[int, int]] = {} # (year, month) -> {day: count}
+        self._requested: Set[tuple[int, int]] = set()
+        self._redraw_job: Optional[str] = None
+
         # Header (Month Year + Navigation)
         self.header_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.header_frame.pack(fill="x", pady=(0, 10))
-        
+
         self.btn_prev = ctk.CTkButton(self.header_frame, text="<", width=30, command=self.prev_month)
         self.btn_prev.pack(side="left")
-        
+
         self.lbl_month = ctk.CTkLabel(self.header_frame, text="Month Year", font=("Arial", 16, "bold"))
         self.lbl_month.pack(side="left", expand=True)
-        
+
         self.btn_next = ctk.CTkButton(self.header_frame, text=">", width=30, command=self.next_month)
         self.btn_next.pack(side="right")
-        
+
         # Calendar Grid
         self.grid_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.grid_frame.pack(expand=True, fill="both")
-        
-        self.day_buttons = []
+
+        self.day_buttons: List[List[ctk.CTkButton]] = []
+        self._day_dates: List[List[Optional[date]]] = []
         self._build_calendar_grid()
+        self._bind_navigation()
         self._update_calendar()
 
     def _build_calendar_grid(self):
-        """Creates the grid layout for days."""
+        """Creates the weekday headers and the fixed pool of day buttons."""
         days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
         for i, day in enumerate(days):
             lbl = ctk.CTkLabel(self.grid_frame, text=day, font=("Arial", 12, "bold"))
             lbl.grid(row=0, column=i, sticky="nsew", padx=2, pady=2)
             self.grid_frame.grid_columnconfigure(i, weight=1)
 
+        for r in range(self.WEEKS):
+            row_buttons = []
+            for c in range(7):
+                btn = ctk.CTkButton(
+                    self.grid_frame,
+                    text="",
+                    height=40,
+                    command=lambda r=r, c=c: self._on_day_click(r, c)
+                )
+                btn.grid(row=r+1, column=c, sticky="nsew", padx=2, pady=2)
+                row_buttons.append(btn)
+            self.day_buttons.append(row_buttons)
+            self._day_dates.append([None] * 7)
+        self._default_color = self.day_buttons[0][0].cget("fg_color")
+
+    def _bind_navigation(self):
+        """Mouse wheel over the grid and Page Up/Down step through months."""
+        widgets = [self, self.grid_frame] + [btn for row in self.day_buttons for btn in row]
+        for widget in widgets:
+            widget.bind("<MouseWheel>", self._on_mouse_wheel, add="+")
+            widget.bind("<Button-4>", lambda e: self.step_months(-1), add="+") # X11 scroll up
+            widget.bind("<Button-5>", lambda e: self.step_months(1), add="+") # X11 scroll down
+        toplevel = self.winfo_toplevel()
+        toplevel.bind("<Prior>", lambda e: self._on_key_step(-1), add="+")
+        toplevel.bind("<Next>", lambda e: self._on_key_step(1), add="+")
+        toplevel.bind("<Shift-Prior>", lambda e: self._on_key_step(-12), add="+")
+        toplevel.bind("<Shift-Next>", lambda e: self._on_key_step(12), add="+")
+
+    def _on_mouse_wheel(self, event):
+        # Windows reports multiples of 120, macOS small deltas; only the sign matters here
+        if event.delta:
+            self.step_months(-1 if event.delta > 0 else 1)
+
+    def _on_key_step(self, months: int):
+        # Ignore the keys while another tab is showing
+        if self.winfo_ismapped():
+            self.step_months(months)
+
+    def _on_day_click(self, r: int, c: int):
+        dt = self._day_dates[r][c]
+        if dt is not None:
+            self.on_date_click(dt)
+
+    def set_month_summary(self, year: int, month: int, summary: Dict[int, int]):
+        """Stores the record counts of a month and redraws if it is on screen."""
+        self._summaries[(year, month)] = summary
+        self._requested.discard((year, month))
+        if (year, month) == (self.current_date.year, self.current_date.month):
+            self._update_calendar()
+
+    def summary_failed(self, year: int, month: int):
+        """Forgets a failed request so the month is asked for again the next time it is drawn."""
+        self._requested.discard((year, month))
+
+    def invalidate_month(self, year: int, month: int):
+        """Drops the cached counts of a month, e.g. after a record in it was saved."""
+        self._summaries.pop((year, month), None)
+        # Re-request even if a fetch is in flight: it may predate the change
+        self._requested.discard((year, month))
+        if (year, month) == (self.current_date.year, self.current_date.month):
+            self._request_summary(year, month)
+
+    def invalidate_all(self):
+        """Drops every cached month, e.g. after another process changed the records."""
+        self._summaries.clear()
+        self._requested.clear()
+        self._request_summary(self.current_date.year, self.current_date.month)
+
+    def _request_summary(self, year: int, month: int):
+        if self.on_summary_request is None or (year, month) in self._requested:
+            return
+        self._requested.add((year, month))
+        self.on_summary_request(year, month)
+
+    def _day_color(self, count: int):
+        if not count:
+            return self._default_color
+        return self.HEAT_COLORS[min(count, len(self.HEAT_COLORS)) - 1]
+
+    @timed(rows=None)
     def _update_calendar(self):
-        """Refreshes the calendar view for the current month."""
+        """Refreshes the calendar view for the current month by reconfiguring the button pool."""
         self.lbl_month.configure(text=self.current_date.strftime("%B %Y"))
-        
-        # Clear old buttons
-        for btn in self.day_buttons:
-            btn.destroy()
-        self.day_buttons.clear()
-        
+        year, month = self.current_date.year, self.current_date.month
+        summary = self._summaries.get((year, month))
+        if summary is None:
+            self._request_summary(year, month)
+            summary = {}
+
+        today = date.today()
+        today_day = today.day if (today.year, today.month) == (year, month) else None
+
         # Get calendar days
-        cal = calendar.monthcalendar(self.current_date.year, self.current_date.month)
-        
-        for r, week in enumerate(cal):
+        cal = calendar.monthcalendar(year, month)
+
+        for r in range(self.WEEKS):
+            week = cal[r] if r < len(cal) else [0] * 7
             for c, day in enumerate(week):
+                btn = self.day_buttons[r][c]
                 if day == 0:
+                    self._day_dates[r][c] = None
+                    btn.grid_remove()
                     continue
-                
-                # Check if today
-                is_today = (day == date.today().day and 
-                           self.current_date.month == date.today().month and 
-                           self.current_date.year == date.today().year)
-                
-                fg_color = "green" if is_today else None # distinct color for today
-                
-                dt = date(self.current_date.year, self.current_date.month, day)
-                
-                btn = ctk.CTkButton(
-                    self.grid_frame, 
-                    text=str(day),
-                    fg_color=fg_color,
-                    height=40,
-                    command=lambda d=dt: self.on_date_click(d)
-                )
-                btn.grid(row=r+1, column=c, sticky="nsew", padx=2, pady=2)
-                self.day_buttons.append(btn)
 
-    def prev_month(self):
-        first = self.current_date.replace(day=1)
-        prev_month = first - timedelta(days=1)
-        self.current_date = prev_month
+                count = summary.get(day, 0)
+                fg_color = self.TODAY_COLOR if day == today_day else self._day_color(count) # distinct color for today
+                self._day_dates[r][c] = date(year, month, day)
+                btn.configure(text=f"{day} •{count}" if count else str(day), fg_color=fg_color)
+                btn.grid()
+
+    def _schedule_redraw(self):
+        """Coalesces redraws: however many steps happen before it fires, only the last month is drawn."""
+        self.lbl_month.configure(text=self.current_date.strftime("%B %Y"))
+        if self._redraw_job is None:
+            self._redraw_job = self.after(self.REDRAW_DELAY_MS, self._flush_redraw)
+
+    def _flush_redraw(self):
+        self._redraw_job = None
         self._update_calendar()
 
+    def step_months(self, months: int):
+        """Moves the view by a number of months (negative goes back)."""
+        index = self.current_date.year * 12 + (self.current_date.month - 1) + months
+        self.current_date = date(index // 12, index % 12 + 1, 1)
+        self._schedule_redraw()
+
+    def prev_month(self):
+        self.step_months(-1)
+
     def next_month(self):
-        # Stupid simple next month logic
-        days_in_month = calendar.monthrange(self.current_date.year, self.current_date.month)[1]
-        next_month = self.current_date + timedelta(days=days_in_month + 1) # simple jump
-        self.current_date = next_month.replace(day=1)
-        self._update_calendar()
+        self.step_months(1)
@@ -1,16 +1,24 @@
 import customtkinter as ctk
 from datetime import date
 from src.models.record import WorkRecord
-from typing import Callable, Optional
+from typing import Callable, List, Optional
 
 class MaintenanceFrame(ctk.CTkFrame):
     """
     Form to add or edit work records.
+    The project field suggests known project names as you type: on_project_query
+    is called with the text once typing pauses, and the owner answers with
+    set_project_suggestions().
     """
-    def __init__(self, master, on_save: Callable[[WorkRecord, Optional[int]], None], **kwargs):
+    SUGGEST_DELAY_MS = 150
+
+    def __init__(self, master, on_save: Callable[[WorkRecord, Optional[str]], None],
+                 on_project_query: Optional[Callable[[str], None]] = None, **kwargs):
         super().__init__(master, **kwargs)
         self.on_save = on_save
-        self.editing_row_index: Optional[int] = None # If set, we are editing
+        self.on_project_query = on_project_query
+        self.editing_record_id: Optional[str] = None # If set, we are editing
+        self._suggest_job: Optional[str] = None
         
         # Title
         self.lbl_title = ctk.CTkLabel(self, text="Add New Record", font=("Arial", 18, "bold"))
@@ -28,8 +36,10 @@ class MaintenanceFrame(ctk.CTkFrame):
         
         # Project
         ctk.CTkLabel(self.form_frame, text="Project Name:").pack(anchor="w", padx=10)
-        self.entry_project = ctk.CTkEntry(self.form_frame)
+        self.entry_project = ctk.CTkComboBox(self.form_frame, values=[])
+        self.entry_project.set("")
         self.entry_project.pack(fill="x", padx=10, pady=(0, 10))
+        self.entry_project.bind("<KeyRelease>", self._schedule_project_query)
         
         # Summary
         ctk.CTkLabel(self.form_frame, text="Summary:").pack(anchor="w", padx=10)
@@ -48,16 +58,31 @@ class MaintenanceFrame(ctk.CTkFrame):
         self.btn_clear = ctk.CTkButton(self, text="Clear Form", fg_color="gray", command=self.clear_form)
         self.btn_clear.pack(pady=(0, 10))
 
-    def load_record(self, record: WorkRecord, row_index: int):
+    def _schedule_project_query(self, event=None):
+        """Asks for suggestions once typing pauses, not on every key."""
+        if self.on_project_query is None:
+            return
+        if self._suggest_job is not None:
+            self.after_cancel(self._suggest_job)
+        self._suggest_job = self.after(self.SUGGEST_DELAY_MS, self._flush_project_query)
+
+    def _flush_project_query(self):
+        self._suggest_job = None
+        self.on_project_query(self.entry_project.get())
+
+    def set_project_suggestions(self, names: List[str]):
+        """Replaces the project dropdown, best match first."""
+        self.entry_project.configure(values=names)
+
+    def load_record(self, record: WorkRecord, record_id: str):
         """Loads a record into the form for editing."""
-        self.editing_row_index = row_index
+        self.editing_record_id = record_id
         self.lbl_title.configure(text="Edit Record")
         
         self.entry_date.delete(0, "end")
         self.entry_date.insert(0, record.date.isoformat())
         
-        self.entry_project.delete(0, "end")
-        self.entry_project.insert(0, record.project_name)
+        self.entry_project.set(record.project_name)
         
         self.entry_summary.delete(0, "end")
         self.entry_summary.insert(0, record.summary)
@@ -67,13 +92,13 @@ class MaintenanceFrame(ctk.CTkFrame):
 
     def clear_form(self):
         """Resets the form to default state."""
-        self.editing_row_index = None
+        self.editing_record_id = None
         self.lbl_title.configure(text="Add New Record")
         
         self.entry_date.delete(0, "end")
         self.entry_date.insert(0, date.today().isoformat())
         
-        self.entry_project.delete(0, "end")
+        self.entry_project.set("")
         self.entry_summary.delete(0, "end")
         self.txt_details.delete("0.0", "end")
 
@@ -90,7 +115,7 @@ class MaintenanceFrame(ctk.CTkFrame):
                 details=self.txt_details.get("0.0", "end").strip()
             )
             
-            self.on_save(record, self.editing_row_index)
+            self.on_save(record, self.editing_record_id)
             self.clear_form() # optionally clear after save
             
         except ValueError:
@@ -1,68 +1,246 @@
 import customtkinter as ctk
 from datetime import date
-from typing import List, Callable
+from typing import List, Callable, Optional
 from src.models.record import WorkRecord
+from src.utils.metrics import timed
+
+class _RecordRow:
+    """A pooled row widget that is rebound to different records while scrolling."""
+
+    def __init__(self, master, height: int,
+                 on_delete: Callable[[str], None],
+                 on_edit: Callable[[str, WorkRecord], None]):
+        self.item: Optional[tuple[str, WorkRecord]] = None
+        self.show_date = False
+        self.slot: Optional[int] = None # visible position, None while hidden
+        self._on_delete = on_delete
+        self._on_edit = on_edit
+
+        self.frame = ctk.CTkFrame(master, height=height)
+        self.frame.pack_propagate(False) # keep the fixed row height the list relies on
+
+        # Project
+        self.lbl_project = ctk.CTkLabel(self.frame, text="", width=100, anchor="w")
+        self.lbl_project.pack(side="left", padx=5)
+
+        # Summary
+        self.lbl_summary = ctk.CTkLabel(self.frame, text="", width=200, anchor="w")
+        self.lbl_summary.pack(side="left", padx=5)
+
+        # Actions
+        btn_del = ctk.CTkButton(self.frame, text="Del", width=40, fg_color="red", command=self._delete)
+        btn_del.pack(side="right", padx=5)
+
+        btn_edit = ctk.CTkButton(self.frame, text="Edit", width=40, command=self._edit)
+        btn_edit.pack(side="right", padx=5)
+
+        self.widgets = [self.frame, self.lbl_project, self.lbl_summary, btn_del, btn_edit]
+
+    def bind_item(self, item: tuple[str, WorkRecord], show_date: bool = False) -> bool:
+        """
+        Shows item in this row, prefixed with its date in search results.
+        Returns False if it was already showing exactly that.
+        """
+        if item == self.item and show_date == self.show_date:
+            return False
+        self.item = item
+        self.show_date = show_date
+        _, record = item
+        project = f"{record.date.strftime('%Y-%m-%d')}  {record.project_name}" if show_date else record.project_name
+        self.lbl_project.configure(text=project)
+        self.lbl_summary.configure(text=record.summary)
+        return True
+
+    def _delete(self):
+        if self.item is not None:
+            self._on_delete(self.item[0])
+
+    def _edit(self):
+        if self.item is not None:
+            self._on_edit(*self.item)
 
 class RecordsFrame(ctk.CTkFrame):
     """
-    Displays a list of work records for a specific date.
+    Displays a list of work records for a specific date, or the results of
+    a full-text search across all dates.
+
+    The list is virtualized: only enough row widgets for the visible area
+    (plus a small buffer) are created, and they are rebound to other
+    records as the list scrolls. Rows whose record did not change are not
+    touched, so an edit or delete only reconfigures the affected rows.
+
+    With on_step_day, < and > buttons next to the date step to the
+    previous or next day.
     """
-    def __init__(self, master, 
-                 on_delete: Callable[[int], None], 
-                 on_edit: Callable[[int, WorkRecord], None],
+    ROW_HEIGHT = 36
+    BUFFER_ROWS = 2
+    WHEEL_ROWS = 3
+
+    def __init__(self, master,
+                 on_delete: Callable[[str], None],
+                 on_edit: Callable[[str, WorkRecord], None],
+                 on_search: Optional[Callable[[str], None]] = None,
+                 on_step_day: Optional[Callable[[int], None]] = None,
                  **kwargs):
         super().__init__(master, **kwargs)
         self.on_delete = on_delete
         self.on_edit = on_edit
+        self.on_search = on_search
         self.current_date = None
-        
-        # Header
-        self.lbl_date = ctk.CTkLabel(self, text="Select a date to view records", font=("Arial", 16, "bold"))
-        self.lbl_date.pack(pady=10)
-        
-        # Scrollable list
-        self.scroll_frame = ctk.CTkScrollableFrame(self)
-        self.scroll_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-    def display_records(self, target_date: date, records: List[tuple[int, WorkRecord]]):
+        self.current_query: Optional[str] = None # set while showing search results
+        self._items: List[tuple[str, WorkRecord]] = []
+        self._offset = 0
+        self._rows: List[_RecordRow] = []
+
+        # Search bar
+        if on_search is not None:
+            self.search_frame = ctk.CTkFrame(self, fg_color="transparent")
+            self.search_frame.pack(fill="x", padx=10, pady=(10, 0))
+            self.entry_search = ctk.CTkEntry(self.search_frame, placeholder_text="Search project, summary, details...")
+            self.entry_search.pack(side="left", fill="x", expand=True, padx=(0, 5))
+            self.entry_search.bind("<Return>", lambda e: self._submit_search())
+            ctk.CTkButton(self.search_frame, text="Search", width=70, command=self._submit_search).pack(side="left")
+
+        # Header, with previous/next day buttons when the owner handles stepping
+        self.date_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.date_frame.pack(pady=10)
+        if on_step_day is not None:
+            ctk.CTkButton(self.date_frame, text="<", width=30, command=lambda: on_step_day(-1)).pack(side="left")
+        self.lbl_date = ctk.CTkLabel(self.date_frame, text="Select a date to view records", font=("Arial", 16, "bold"))
+        self.lbl_date.pack(side="left", padx=10)
+        if on_step_day is not None:
+            ctk.CTkButton(self.date_frame, text=">", width=30, command=lambda: on_step_day(1)).pack(side="left")
+
+        # Column headers
+        self.header_frame = ctk.CTkFrame(self, fg_color="transparent")
+        ctk.CTkLabel(self.header_frame, text="Project", width=100, anchor="w", font=("Arial", 12, "bold")).pack(side="left", padx=5)
+        ctk.CTkLabel(self.header_frame, text="Summary", width=200, anchor="w", font=("Arial", 12, "bold")).pack(side="left", padx=5)
+
+        # Virtualized list: a fixed viewport of pooled rows plus a scrollbar
+        self.list_frame = ctk.CTkFrame(self)
+        self.list_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.scrollbar = ctk.CTkScrollbar(self.list_frame, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.viewport = ctk.CTkFrame(self.list_frame, fg_color="transparent")
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.viewport.bind("<Configure>", lambda e: self._render())
+        self._bind_wheel(self.viewport)
+
+        self.lbl_message = ctk.CTkLabel(self.viewport, text="")
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.scroll_rows(-self.WHEEL_ROWS if e.delta > 0 else self.WHEEL_ROWS), add="+")
+        widget.bind("<Button-4>", lambda e: self.scroll_rows(-self.WHEEL_ROWS), add="+") # X11 scroll up
+        widget.bind("<Button-5>", lambda e: self.scroll_rows(self.WHEEL_ROWS), add="+") # X11 scroll down
+
+    def _submit_search(self):
+        query = self.entry_search.get().strip()
+        if query:
+            self.on_search(query)
+
+    def show_searching(self, query: str):
+        """Shows a placeholder while a search is running."""
+        self.current_query = query
+        self.lbl_date.configure(text=f"Search: {query}")
+        self.show_message("Searching...")
+
+    def display_search_results(self, query: str, records: List[tuple[str, WorkRecord]]):
+        """Populates the list with search hits from any date, newest first."""
+        if query != self.current_query:
+            self._offset = 0
+        self.current_query = query
+        self.lbl_date.configure(text=f"Search: {query} ({len(records)} found)")
+        self._show_items(records, "No matching records.")
+
+    def show_loading(self, target_date: date):
+        """Shows a placeholder while records for target_date are being fetched."""
+        self.current_query = None
+        self.current_date = target_date
+        self.lbl_date.configure(text=f"Records for {target_date.strftime('%Y-%m-%d')}")
+        self.show_message("Loading...")
+
+    def show_message(self, text: str):
+        """Replaces the list with a single status line."""
+        self._items = []
+        self._offset = 0
+        self.header_frame.pack_forget()
+        self._render()
+        self.lbl_message.configure(text=text)
+        self.lbl_message.place(relx=0.5, y=20, anchor="n")
+
+    def display_records(self, target_date: date, records: List[tuple[str, WorkRecord]]):
         """Populates the list with records."""
+        if target_date != self.current_date:
+            self._offset = 0
+        self.current_query = None
         self.current_date = target_date
         self.lbl_date.configure(text=f"Records for {target_date.strftime('%Y-%m-%d')}")
-        
-        # Clear existing
-        for widget in self.scroll_frame.winfo_children():
-            widget.destroy()
-            
+        self._show_items(records, "No records found.")
+
+    @timed(rows=None)
+    def _show_items(self, records: List[tuple[str, WorkRecord]], empty_message: str):
         if not records:
-            ctk.CTkLabel(self.scroll_frame, text="No records found.").pack(pady=20)
+            self.show_message(empty_message)
             return
 
-        # Headers
-        # Simple headers
-        header_frame = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
-        header_frame.pack(fill="x", pady=2)
-        ctk.CTkLabel(header_frame, text="Project", width=100, anchor="w", font=("Arial", 12, "bold")).pack(side="left", padx=5)
-        ctk.CTkLabel(header_frame, text="Summary", width=200, anchor="w", font=("Arial", 12, "bold")).pack(side="left", padx=5)
-        
-        # Rows
-        for row_idx, record in records:
-            self._create_record_row(row_idx, record)
-
-    def _create_record_row(self, row_idx: int, record: WorkRecord):
-        frame = ctk.CTkFrame(self.scroll_frame)
-        frame.pack(fill="x", pady=2)
-        
-        # Project
-        ctk.CTkLabel(frame, text=record.project_name, width=100, anchor="w").pack(side="left", padx=5)
-        
-        # Summary
-        ctk.CTkLabel(frame, text=record.summary, width=200, anchor="w").pack(side="left", padx=5)
-        
-        # Actions
-        btn_del = ctk.CTkButton(frame, text="Del", width=40, fg_color="red", 
-                                command=lambda r=row_idx: self.on_delete(r))
-        btn_del.pack(side="right", padx=5)
-        
-        btn_edit = ctk.CTkButton(frame, text="Edit", width=40, 
-                                 command=lambda r=row_idx, rec=record: self.on_edit(r, rec))
-        btn_edit.pack(side="right", padx=5)
+        self.lbl_message.place_forget()
+        self.header_frame.pack(fill="x", padx=10, before=self.list_frame)
+        self._items = list(records)
+        self._render()
+
+    def scroll_rows(self, rows: int):
+        """Scrolls the list by a number of rows."""
+        self._set_offset(self._offset + rows)
+
+    def _on_scrollbar(self, *args):
+        """Handles CTkScrollbar's 'moveto <fraction>' and 'scroll <n> units|pages' commands."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._set_offset(round(float(args[1]) * len(self._items)))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self._visible_count() if args[2] == "pages" else 1)
+            self.scroll_rows(step)
+
+    def _set_offset(self, offset: int):
+        offset = max(0, min(offset, len(self._items) - self._visible_count()))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _visible_count(self) -> int:
+        row_height = self.ROW_HEIGHT * ctk.ScalingTracker.get_widget_scaling(self)
+        return max(1, int(self.viewport.winfo_height() // row_height))
+
+    def _ensure_rows(self, count: int):
+        """Grows the row pool; rows are only ever created, never destroyed."""
+        while len(self._rows) < count:
+            row = _RecordRow(self.viewport, self.ROW_HEIGHT, self.on_delete, self.on_edit)
+            for widget in row.widgets:
+                self._bind_wheel(widget)
+            self._rows.append(row)
+
+    def _render(self):
+        """Binds the visible slice of records to the row pool."""
+        visible = self._visible_count()
+        self._ensure_rows(visible + self.BUFFER_ROWS)
+        self._offset = max(0, min(self._offset, len(self._items) - visible))
+
+        for i, row in enumerate(self._rows):
+            index = self._offset + i
+            if i < visible and index < len(self._items):
+                row.bind_item(self._items[index], show_date=self.current_query is not None)
+                if row.slot != i:
+                    row.frame.place(x=0, y=i * self.ROW_HEIGHT, relwidth=1.0)
+                    row.slot = i
+            elif row.slot is not None:
+                row.frame.place_forget()
+                row.slot = None
+
+        total = len(self._items)
+        if total:
+            self.scrollbar.set(self._offset / total, min(1.0, (self._offset + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
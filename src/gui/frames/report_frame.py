@@ -0,0 +1,84 @@
+import customtkinter as ctk
+from datetime import date
+from tkinter import filedialog
+from typing import Callable, Optional
+from src.services.report import RENDERERS, Report, month_range, week_range
+
+class ReportFrame(ctk.CTkFrame):
+    """
+    Generates a weekly or monthly report for the period containing a date.
+    Building the report and exporting it are delegated to the app so the
+    storage access happens off the UI thread.
+    """
+    PERIODS = ("Week", "Month")
+    FORMATS = {"Markdown": "markdown", "Text": "text"}
+
+    def __init__(self, master,
+                 on_generate: Callable[[date, date], None],
+                 on_export: Callable[[Report, str], None],
+                 **kwargs):
+        super().__init__(master, **kwargs)
+        self.on_generate = on_generate
+        self.on_export = on_export
+        self.report: Optional[Report] = None
+
+        # Controls
+        self.controls = ctk.CTkFrame(self, fg_color="transparent")
+        self.controls.pack(fill="x", padx=10, pady=10)
+
+        self.period = ctk.CTkSegmentedButton(self.controls, values=list(self.PERIODS))
+        self.period.set(self.PERIODS[0])
+        self.period.pack(side="left", padx=(0, 10))
+
+        self.entry_date = ctk.CTkEntry(self.controls, width=110)
+        self.entry_date.insert(0, date.today().isoformat())
+        self.entry_date.pack(side="left", padx=(0, 10))
+        self.entry_date.bind("<Return>", lambda e: self.generate())
+
+        self.format = ctk.CTkOptionMenu(self.controls, values=list(self.FORMATS), width=110,
+                                        command=lambda _: self._render())
+        self.format.pack(side="left", padx=(0, 10))
+
+        ctk.CTkButton(self.controls, text="Generate", width=90, command=self.generate).pack(side="left")
+        self.btn_export = ctk.CTkButton(self.controls, text="Save As...", width=90,
+                                        state="disabled", command=self.export)
+        self.btn_export.pack(side="right")
+
+        # Output
+        self.txt_report = ctk.CTkTextbox(self, wrap="word")
+        self.txt_report.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+    def generate(self):
+        """Asks the app for the report of the selected period."""
+        try:
+            anchor = date.fromisoformat(self.entry_date.get().strip())
+        except ValueError:
+            self.show_message("Invalid date format. Use YYYY-MM-DD.")
+            return
+        start, end = week_range(anchor) if self.period.get() == "Week" else month_range(anchor)
+        self.show_message("Generating...")
+        self.on_generate(start, end)
+
+    def show_message(self, text: str):
+        self.txt_report.delete("0.0", "end")
+        self.txt_report.insert("0.0", text)
+
+    def display_report(self, report: Report):
+        self.report = report
+        self.btn_export.configure(state="normal")
+        self._render()
+
+    def _render(self):
+        if self.report is not None:
+            self.show_message(RENDERERS[self.FORMATS[self.format.get()]](self.report))
+
+    def export(self):
+        """Saves the current report; the file extension picks the format."""
+        if self.report is None:
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".md",
+            filetypes=[("Markdown", "*.md"), ("Text", "*.txt"), ("Excel workbook", "*.xlsx")]
+        )
+        if file_path:
+            self.on_export(self.report, file_path)
@@ -1,32 +1,62 @@
 import sys
-import os
+import argparse
 from pathlib import Path
 
 # Add project root to sys.path to allow imports from src
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-import customtkinter as ctk
-from src.gui.app import App
-from src.utils.logger import setup_logger
+from src.utils.profiling import StartupProfiler
+from src.utils.config import load_config
+from src.utils.logger import configure_logging, redirect_stderr, setup_logger
+from src.utils.metrics import metrics
 
 logger = setup_logger("Main")
 
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Weekly Report Tool")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="log an import-time and startup phase breakdown to app_log.txt")
+    parser.add_argument("--metrics", action="store_true",
+                        help="log storage and UI timings as JSON lines to metrics.jsonl "
+                             "(toggle at runtime with Ctrl+Shift+M)")
+    # Nuitka/macOS may pass extra arguments (e.g. -psn_*); ignore them
+    args, _ = parser.parse_known_args(argv)
+    return args
+
 def main():
-    # Redirect stderr to log file to capture C-level warnings (e.g. macOS IMK/TSM logs)
+    args = parse_args()
+    profiler = StartupProfiler(enabled=args.profile_startup)
+    if args.metrics:
+        metrics.enable()
+
+    try:
+        configure_logging(load_config().log_level)
+    except ValueError as e:
+        logger.warning(f"Invalid log level in config, keeping the default: {e}")
+
+    # Redirect stderr to its own file to capture C-level warnings (e.g. macOS IMK/TSM logs)
     # and silence the terminal as requested.
     try:
-        log_file = open("app_log.txt", "a")
-        os.dup2(log_file.fileno(), sys.stderr.fileno())
+        redirect_stderr()
     except Exception as e:
         logger.warning(f"Failed to redirect stderr: {e}")
 
     logger.info("Starting Weekly Report Tool...")
-    ctk.set_appearance_mode("System")
-    ctk.set_default_color_theme("blue")
+
+    # GUI modules are imported here rather than at module level so the
+    # profiler can attribute their cost.
+    with profiler.track_imports(), profiler.phase("import gui"):
+        import customtkinter as ctk
+        from src.gui.app import App
+
+    with profiler.phase("ctk theme setup"):
+        ctk.set_appearance_mode("System")
+        ctk.set_default_color_theme("blue")
     
     try:
-        app = App()
+        with profiler.track_imports(), profiler.phase("App.__init__"):
+            app = App(profiler=profiler)
         app.mainloop()
     except Exception as e:
         logger.critical(f"Application crashed: {e}", exc_info=True)
@@ -1,13 +1,19 @@
+import uuid
 from dataclasses import dataclass
 from datetime import date
 
-@dataclass
+def new_record_id() -> str:
+    """Generates a new unique record ID."""
+    return uuid.uuid4().hex
+
+@dataclass(slots=True)
 class WorkRecord:
     """Represents a single daily work record."""
     date: date
     project_name: str
     summary: str
     details: str
+    record_id: str = "" # assigned by storage on first save
 
     def to_dict(self) -> dict:
         """Converts record to dictionary for storage."""
@@ -15,7 +21,8 @@ class WorkRecord:
             "Date": self.date.isoformat(),
             "Project": self.project_name,
             "Summary": self.summary,
-            "Details": self.details
+            "Details": self.details,
+            "ID": self.record_id
         }
 
     @classmethod
@@ -25,5 +32,6 @@ class WorkRecord:
             date=date.fromisoformat(str(data["Date"]).split("T")[0]), # Handle potential datetime strings
             project_name=str(data["Project"]),
             summary=str(data["Summary"]),
-            details=str(data["Details"])
+            details=str(data["Details"]),
+            record_id=str(data.get("ID") or "")
         )
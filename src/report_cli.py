@@ -0,0 +1,66 @@
+import sys
+import argparse
+from datetime import date
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from src
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.factory import create_storage
+from src.services.report import RENDERERS, build_report, month_range, week_range, write_xlsx
+from src.utils.config import load_config
+
+FORMATS = (*RENDERERS, "xlsx")
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate a weekly or monthly work report")
+    period = parser.add_mutually_exclusive_group()
+    period.add_argument("--week", metavar="DATE", nargs="?", const=date.today().isoformat(),
+                        type=date.fromisoformat, help="the Monday-Sunday week containing DATE (default: this week)")
+    period.add_argument("--month", metavar="DATE", nargs="?", const=date.today().isoformat(),
+                        type=date.fromisoformat, help="the calendar month containing DATE")
+    period.add_argument("--range", metavar=("START", "END"), nargs=2, type=date.fromisoformat,
+                        help="an explicit inclusive date range")
+    parser.add_argument("--format", choices=FORMATS, default="markdown")
+    parser.add_argument("--output", "-o", help="file to write (required for xlsx, default: stdout)")
+    parser.add_argument("--sheet", help="sheet name for xlsx output")
+    parser.add_argument("--title", help="override the report title")
+    return parser.parse_args(argv)
+
+def resolve_range(args: argparse.Namespace) -> tuple[date, date]:
+    if args.range:
+        return args.range[0], args.range[1]
+    if args.month:
+        return month_range(args.month)
+    return week_range(args.week or date.today())
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.format == "xlsx" and not args.output:
+        print("--output is required for xlsx reports", file=sys.stderr)
+        return 2
+
+    start, end = resolve_range(args)
+    storage = create_storage(load_config())
+    try:
+        report = build_report(storage, start, end, args.title)
+        if args.format == "xlsx":
+            sheet = write_xlsx(report, args.output, args.sheet)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    finally:
+        storage.close()
+
+    if args.format == "xlsx":
+        print(f"Wrote '{sheet}' ({report.total} records) to {args.output}")
+    elif args.output:
+        Path(args.output).write_text(RENDERERS[args.format](report), encoding="utf-8")
+        print(f"Wrote {report.total} records to {args.output}")
+    else:
+        sys.stdout.write(RENDERERS[args.format](report))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
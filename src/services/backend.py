@@ -0,0 +1,133 @@
+import calendar
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+from src.models.record import WorkRecord
+from src.services.project_index import ProjectIndex, ProjectUsage, rank
+from src.utils.metrics import timed
+
+class StorageBackend(ABC):
+    """
+    Interface shared by all record stores.
+    Records are addressed by their stable WorkRecord.record_id, which is
+    assigned on first save and never changes afterwards.
+    """
+
+    @abstractmethod
+    def save_record(self, record: WorkRecord) -> str:
+        """Persists a new record, assigning record.record_id if needed. Returns the ID."""
+
+    @abstractmethod
+    def get_record(self, record_id: str) -> Optional[WorkRecord]:
+        """Returns the record with the given ID, or None if it doesn't exist."""
+
+    @abstractmethod
+    def get_records_by_date(self, target_date: date) -> List[tuple[str, WorkRecord]]:
+        """Retrieves records for a specific date as (record_id, WorkRecord) tuples."""
+
+    @abstractmethod
+    def get_records_in_range(self, start: date, end: date) -> List[tuple[str, WorkRecord]]:
+        """Retrieves records between start and end (both inclusive), ordered by date."""
+
+    @abstractmethod
+    def update_record(self, record_id: str, record: WorkRecord):
+        """Replaces the record with the given ID. Raises KeyError if it doesn't exist."""
+
+    @abstractmethod
+    def delete_record(self, record_id: str):
+        """Deletes the record with the given ID. Raises KeyError if it doesn't exist."""
+
+    def get_records_for_week(self, iso_year: int, iso_week: int) -> List[tuple[str, WorkRecord]]:
+        """Retrieves records for an ISO week (Monday to Sunday)."""
+        monday = date.fromisocalendar(iso_year, iso_week, 1)
+        return self.get_records_in_range(monday, monday + timedelta(days=6))
+
+    def count_records_by_month(self, year: int, month: int) -> int:
+        """Counts the records of a calendar month."""
+        last_day = calendar.monthrange(year, month)[1]
+        return len(self.get_records_in_range(date(year, month, 1), date(year, month, last_day)))
+
+    def preload(self):
+        """Loads whatever the backend needs to answer queries quickly. No-op by default."""
+
+    def month_summary(self, year: int, month: int) -> Dict[int, int]:
+        """Returns {day_of_month: record_count} for the days of a month that have records."""
+        last_day = calendar.monthrange(year, month)[1]
+        summary: Dict[int, int] = {}
+        for _, record in self.get_records_in_range(date(year, month, 1), date(year, month, last_day)):
+            summary[record.date.day] = summary.get(record.date.day, 0) + 1
+        return summary
+
+    def search(self, query: str, start: Optional[date] = None, end: Optional[date] = None,
+               project: Optional[str] = None) -> List[tuple[str, WorkRecord]]:
+        """
+        Full-text search over project, summary and details, newest first.
+        Every query term must match; start/end/project narrow the results.
+        The default tokenizes the candidate range on the fly; backends with
+        a persistent index override it.
+        """
+        from src.services.search_index import InvertedIndex
+        candidates = self.get_records_in_range(start or date.min, end or date.max)
+        if project is not None:
+            candidates = [(i, r) for i, r in candidates if r.project_name == project]
+        matches = InvertedIndex.build(candidates).search(query)
+        return sorted(((i, r) for i, r in candidates if i in matches),
+                      key=lambda item: item[1].date, reverse=True)
+
+    def project_usages(self) -> List[ProjectUsage]:
+        """Every distinct project name with its record count and last-used date."""
+        return ProjectIndex.build(record for _, record in self.get_records_in_range(date.min, date.max)).usages()
+
+    def suggest_projects(self, query: str = "", limit: int = 10) -> List[ProjectUsage]:
+        """
+        Project names for autocomplete, best match for query first (prefix,
+        then fuzzy); an empty query lists the most used. The default scans
+        every record; backends that keep a ProjectIndex override both methods.
+        """
+        return rank(query, self.project_usages(), limit)
+
+    def poll_external_changes(self) -> bool:
+        """
+        Returns True if another process changed the records since the last
+        call, so open views can refresh. Backends that can't tell return False.
+        """
+        return False
+
+    def flush(self):
+        """Writes pending changes to disk. No-op for backends that write through."""
+
+    def close(self):
+        """Flushes pending changes and releases resources."""
+        self.flush()
+
+    @contextmanager
+    def batch(self) -> Iterator["StorageBackend"]:
+        """Groups several mutations into one write where the backend supports it."""
+        yield self
+
+    @timed(rows=int)
+    def export_xlsx(self, file_path: str) -> int:
+        """Exports every record to a work report workbook. Returns the record count."""
+        # Imported here so backends that never touch xlsx don't pay for openpyxl
+        from src.services import xlsx_io
+        records = self.get_records_in_range(date.min, date.max)
+        return xlsx_io.write_records((record for _, record in records), file_path)
+
+    def import_xlsx(self, file_path: str) -> int:
+        """
+        Appends every record of a work report workbook, including changes
+        still only in its journal. Returns the record count.
+        """
+        from src.services.storage import ExcelStorage
+        return self.save_records(ExcelStorage.read_records(file_path))
+
+    @timed(rows=int)
+    def save_records(self, records: Iterable[WorkRecord]) -> int:
+        """Saves many new records as one batched write. Returns the record count."""
+        count = 0
+        with self.batch():
+            for record in records:
+                self.save_record(record)
+                count += 1
+        return count
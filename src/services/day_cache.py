@@ -0,0 +1,136 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+from src.models.record import WorkRecord
+
+@dataclass
+class PrefetchStats:
+    """Counters describing how many day views the cache served without a storage call."""
+    hits: int = 0
+    misses: int = 0
+    prefetched: int = 0 # days stored by a background range load
+    invalidations: int = 0
+    evictions: int = 0
+    stale_drops: int = 0 # loaded days discarded because a write touched them meanwhile
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+def week_of(day: date) -> tuple[date, date]:
+    """Monday and Sunday of the ISO week containing day."""
+    monday = day - timedelta(days=day.weekday())
+    return monday, monday + timedelta(days=6)
+
+class DayCache:
+    """
+    A bounded LRU of get_records_by_date() results, one entry per day
+    (days without records are cached as empty lists too).
+
+    A whole range is filled from a single get_records_in_range() call with
+    store_range(). Writes call invalidate() with exactly the dates they
+    touched. Loads can finish after a write that they raced with, so each
+    load takes a token() before it starts, and store_range() drops the days
+    that were invalidated after that token instead of caching stale rows.
+
+    Only the MAX_INVALIDATED most recently invalidated days are remembered.
+    Forgetting an older one raises a floor: loads with a token from before
+    it are dropped whole, so the bookkeeping stays bounded for the session
+    without ever caching stale rows.
+
+    Thread-safe: loads finish on the UI thread, but writes may invalidate
+    from the I/O writer thread.
+    """
+
+    MAX_INVALIDATED = 256
+
+    def __init__(self, capacity: int = 120):
+        self.capacity = capacity
+        self.stats = PrefetchStats()
+        self._days: "OrderedDict[date, List[tuple[str, WorkRecord]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._clock = 0
+        self._invalidated: Dict[date, int] = {} # day -> clock of its last invalidation, oldest first
+        self._floor = 0 # loads with an older token are dropped whole: clear(), forgotten invalidations
+
+    def __contains__(self, day: date) -> bool:
+        with self._lock:
+            return day in self._days
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._days)
+
+    def get(self, day: date) -> Optional[List[tuple[str, WorkRecord]]]:
+        """The cached records of day (counted as a hit), or None (a miss)."""
+        with self._lock:
+            records = self._days.get(day)
+            if records is None:
+                self.stats.misses += 1
+                return None
+            self._days.move_to_end(day)
+            self.stats.hits += 1
+            return list(records)
+
+    def missing(self, start: date, end: date) -> List[date]:
+        """Days from start to end (inclusive) that are not cached, without touching the stats."""
+        with self._lock:
+            days = (start + timedelta(days=i) for i in range((end - start).days + 1))
+            return [day for day in days if day not in self._days]
+
+    def token(self) -> int:
+        """Marks the start of a load; pass it to store_range() when the load finishes."""
+        with self._lock:
+            return self._clock
+
+    def store_range(self, start: date, end: date, records: Iterable[tuple[str, WorkRecord]],
+                    token: int, prefetched: bool = True) -> int:
+        """
+        Caches the records of every day from start to end (inclusive), as
+        returned by get_records_in_range(start, end). Days invalidated since
+        token was taken are skipped. Returns the number of days stored.
+        """
+        by_day: Dict[date, List[tuple[str, WorkRecord]]] = {}
+        for record_id, record in records:
+            by_day.setdefault(record.date, []).append((record_id, record))
+        stored = 0
+        with self._lock:
+            for i in range((end - start).days + 1):
+                day = start + timedelta(days=i)
+                if self._floor > token or self._invalidated.get(day, 0) > token:
+                    self.stats.stale_drops += 1
+                    continue
+                self._days[day] = by_day.get(day, [])
+                self._days.move_to_end(day)
+                stored += 1
+            while len(self._days) > self.capacity:
+                self._days.popitem(last=False)
+                self.stats.evictions += 1
+            if prefetched:
+                self.stats.prefetched += stored
+        return stored
+
+    def invalidate(self, days: Iterable[date]):
+        """Forgets the given days, including any load of them still in flight."""
+        with self._lock:
+            self._clock += 1
+            for day in days:
+                self._invalidated.pop(day, None) # re-inserted last, keeping the dict oldest first
+                self._invalidated[day] = self._clock
+                if self._days.pop(day, None) is not None:
+                    self.stats.invalidations += 1
+            while len(self._invalidated) > self.MAX_INVALIDATED:
+                oldest = next(iter(self._invalidated))
+                self._floor = max(self._floor, self._invalidated.pop(oldest))
+
+    def clear(self):
+        """Forgets every day, e.g. after another process changed the records."""
+        with self._lock:
+            self._clock += 1
+            self._floor = self._clock
+            self._invalidated.clear()
+            self.stats.invalidations += len(self._days)
+            self._days.clear()
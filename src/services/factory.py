@@ -0,0 +1,36 @@
+from pathlib import Path
+from src.services.backend import StorageBackend
+from src.utils.config import AppConfig
+from src.utils.logger import setup_logger
+
+logger = setup_logger("StorageFactory")
+
+BACKENDS = ("excel", "sqlite", "partitioned")
+
+def create_storage(config: AppConfig) -> StorageBackend:
+    """Builds the storage backend selected in the config."""
+    if config.backend == "excel":
+        from src.services.storage import ExcelStorage
+        return ExcelStorage(config.excel_path,
+                            write_behind=config.write_behind,
+                            flush_interval=config.flush_interval)
+
+    if config.backend == "sqlite":
+        from src.services.sqlite_storage import SQLiteStorage
+        storage = SQLiteStorage(config.sqlite_path)
+        # First run on SQLite: bring over the existing Excel history once
+        if Path(config.excel_path).exists():
+            storage.migrate_from_xlsx(config.excel_path)
+        return storage
+
+    if config.backend == "partitioned":
+        from src.services.partitioned_storage import PartitionedStorage
+        storage = PartitionedStorage(config.partition_dir,
+                                     write_behind=config.write_behind,
+                                     flush_interval=config.flush_interval)
+        # First run: split the existing monolithic workbook into yearly partitions once
+        if Path(config.excel_path).exists():
+            storage.migrate_from_xlsx(config.excel_path)
+        return storage
+
+    raise ValueError(f"Unknown storage backend '{config.backend}', expected one of {BACKENDS}")
@@ -0,0 +1,120 @@
+import queue
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from src.utils.logger import setup_logger
+
+logger = setup_logger("IOExecutor")
+
+class IOExecutor:
+    """
+    Runs storage calls off the Tk main loop.
+
+    Reads go to a small thread pool, writes to a single writer thread so
+    they are applied in submission order. A read waits for writes that
+    were submitted before it, so callers always see their own changes.
+
+    Callbacks are never run on the worker threads: finished calls are
+    queued and delivered by poll(), which the UI schedules with after().
+    Submitting with a key supersedes any earlier call with the same key;
+    its result is dropped (and the call cancelled if it hasn't started).
+    """
+
+    def __init__(self, read_workers: int = 2):
+        self._readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="io-read")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="io-write")
+        self._results: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._generations: Dict[str, int] = {}
+        self._pending: Dict[str, Future] = {}
+        self._last_write: Optional[Future] = None
+
+    def submit_read(self, fn: Callable, *args,
+                    on_done: Optional[Callable[[Any], None]] = None,
+                    on_error: Optional[Callable[[BaseException], None]] = None,
+                    key: Optional[str] = None) -> Future:
+        """Schedules a read; on_done(result) runs on the UI thread."""
+        last_write = self._last_write
+
+        def run():
+            if last_write is not None:
+                try:
+                    last_write.result()
+                except BaseException:
+                    pass # the write's own callback reports its failure
+            return fn(*args)
+
+        return self._submit(self._readers, run, on_done, on_error, key)
+
+    def submit_write(self, fn: Callable, *args,
+                     on_done: Optional[Callable[[Any], None]] = None,
+                     on_error: Optional[Callable[[BaseException], None]] = None) -> Future:
+        """Schedules a write on the single writer thread; writes never supersede each other."""
+        future = self._submit(self._writer, lambda: fn(*args), on_done, on_error, None)
+        self._last_write = future
+        return future
+
+    def _submit(self, pool: ThreadPoolExecutor, fn: Callable,
+                on_done: Optional[Callable], on_error: Optional[Callable],
+                key: Optional[str]) -> Future:
+        generation = 0
+        if key is not None:
+            with self._lock:
+                generation = self._generations.get(key, 0) + 1
+                self._generations[key] = generation
+                previous = self._pending.get(key)
+            if previous is not None:
+                previous.cancel()
+
+        future = pool.submit(fn)
+        if key is not None:
+            with self._lock:
+                self._pending[key] = future
+        future.add_done_callback(lambda f: self._results.put((f, on_done, on_error, key, generation)))
+        return future
+
+    def cancel(self, key: str):
+        """Drops the result of the outstanding call submitted under key."""
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            previous = self._pending.pop(key, None)
+        if previous is not None:
+            previous.cancel()
+
+    def poll(self) -> int:
+        """Delivers finished calls to their callbacks. Call from the UI thread. Returns how many ran."""
+        delivered = 0
+        while True:
+            try:
+                future, on_done, on_error, key, generation = self._results.get_nowait()
+            except queue.Empty:
+                return delivered
+
+            if key is not None:
+                with self._lock:
+                    if self._generations.get(key) != generation:
+                        continue # superseded by a newer request
+                    self._pending.pop(key, None)
+
+            try:
+                result = future.result()
+            except CancelledError:
+                continue
+            except BaseException as e:
+                if on_error is not None:
+                    on_error(e)
+                else:
+                    logger.error(f"Background I/O failed: {e}", exc_info=e)
+                continue
+
+            if on_done is not None:
+                try:
+                    on_done(result)
+                except Exception as e:
+                    logger.error(f"I/O callback failed: {e}", exc_info=True)
+            delivered += 1
+
+    def shutdown(self, wait: bool = True):
+        """Stops the workers. Pending writes are always completed."""
+        self._readers.shutdown(wait=wait, cancel_futures=True)
+        self._writer.shutdown(wait=True)
@@ -0,0 +1,101 @@
+import json
+import os
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+from src.models.record import WorkRecord
+from src.utils.logger import setup_logger
+
+logger = setup_logger("Journal")
+
+class Journal:
+    """
+    Append-only JSONL log of record mutations, one entry per line:
+
+        {"op": "save", "id": "...", "record": {...}}
+        {"op": "update", "id": "...", "record": {...}}
+        {"op": "delete", "id": "..."}
+
+    Entries are fsynced as they are appended (or once per batch with
+    sync=False plus sync()), so a mutation is durable before the data file
+    is rewritten. Saves and updates carry the full record, which makes
+    replaying an entry that already reached the data file harmless.
+
+    Several processes may append to the same journal (callers serialise
+    that with a FileLock); changed_elsewhere() tells whether anyone else
+    did since this instance last read, appended to or reset it.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file: Optional[BinaryIO] = None
+        self._unsynced = False
+        self._known_size = 0 # journal size as of our last read/append/reset
+
+    def append(self, op: str, record_id: str, record: Optional[WorkRecord] = None, sync: bool = True):
+        entry = {"op": op, "id": record_id}
+        if record is not None:
+            entry["record"] = record.to_dict()
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        line = json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n"
+        self._file.write(line)
+        self._file.flush()
+        self._known_size += len(line)
+        self._unsynced = True
+        if sync:
+            self.sync()
+
+    def sync(self):
+        """Forces appended entries to disk."""
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = False
+
+    def _size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def changed_elsewhere(self) -> bool:
+        """True if another writer appended to or reset the journal since we last saw it."""
+        return self._size() != self._known_size
+
+    def entries(self) -> Iterator[dict]:
+        """
+        Yields the logged entries in order. A torn last line (a crash in
+        the middle of an append) is skipped.
+        """
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            self._known_size = 0
+            return
+        with f:
+            self._known_size = os.fstat(f.fileno()).st_size
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping unreadable entry {number} of {self.path}")
+
+    def reset(self):
+        """Empties the journal once its entries are safely in the data file."""
+        self.close()
+        # Truncated rather than deleted: other processes may have it open for appending.
+        # Replaying entries that survive a crash before this is durable is harmless.
+        try:
+            with open(self.path, "r+b") as f:
+                f.truncate()
+        except FileNotFoundError:
+            pass
+        self._known_size = 0
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
@@ -0,0 +1,415 @@
+import gzip
+import json
+import threading
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+import openpyxl
+from src.models.record import WorkRecord
+from src.services import xlsx_io
+from src.services.backend import StorageBackend
+from src.services.project_index import ProjectIndex, ProjectUsage
+from src.services.record_table import RecordTable
+from src.services.storage import ExcelStorage
+from src.utils.atomic import atomic_replace
+from src.utils.file_lock import FileLock
+from src.utils.logger import setup_logger
+
+logger = setup_logger("PartitionedStorage")
+
+def read_archive(path: Path) -> Iterator[WorkRecord]:
+    """Streams the records of a gzipped JSONL archive."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield WorkRecord.from_dict(json.loads(line))
+
+def write_archive(records: Iterable[WorkRecord], path: Path) -> int:
+    """Writes records to a gzipped JSONL archive atomically. Returns the record count."""
+    count = 0
+    with atomic_replace(path) as tmp_path:
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record.to_dict(), ensure_ascii=False) + "\n")
+                count += 1
+    return count
+
+@dataclass
+class Partition:
+    """A manifest entry: the records dated within one calendar year and the file holding them."""
+    year: int
+    file: str
+    archived: bool = False
+
+    @property
+    def start(self) -> date:
+        return date(self.year, 1, 1)
+
+    @property
+    def end(self) -> date:
+        return date(self.year, 12, 31)
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "start": self.start.isoformat(), "end": self.end.isoformat()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Partition":
+        return cls(year=int(data["year"]), file=str(data["file"]), archived=bool(data.get("archived", False)))
+
+class ArchivedPartition(StorageBackend):
+    """
+    A closed year compressed to a read-only gzipped JSONL file.
+    It is only decompressed on the first read; writes raise PermissionError.
+    """
+
+    def __init__(self, file_path: Path):
+        self.file_path = Path(file_path)
+        self._table: Optional[RecordTable] = None
+        self._projects: Optional[ProjectIndex] = None
+        self._lock = threading.Lock()
+
+    def _records(self) -> RecordTable:
+        with self._lock:
+            if self._table is None:
+                table = RecordTable()
+                table.extend((record, i) for i, record in enumerate(read_archive(self.file_path), start=1))
+                self._projects = ProjectIndex.build(record for _, record in table.items())
+                self._table = table
+            return self._table
+
+    def _read_only(self, *args):
+        raise PermissionError(f"{self.file_path.name} is archived and read-only")
+
+    save_record = update_record = delete_record = _read_only
+
+    def get_record(self, record_id: str) -> Optional[WorkRecord]:
+        return self._records().get(record_id)
+
+    def get_records_by_date(self, target_date: date) -> List[tuple[str, WorkRecord]]:
+        return self._records().items_in_range(target_date, target_date)
+
+    def get_records_in_range(self, start: date, end: date) -> List[tuple[str, WorkRecord]]:
+        return self._records().items_in_range(start, end)
+
+    def project_usages(self) -> List[ProjectUsage]:
+        self._records()
+        return self._projects.usages()
+
+    def close(self):
+        """Drops the decompressed records; the next read decompresses them again."""
+        with self._lock:
+            if self._table is not None:
+                self._table.close()
+            self._table = None
+            self._projects = None
+
+class PartitionedStorage(StorageBackend):
+    """
+    Stores work records in one workbook per calendar year inside a
+    directory, e.g. work_reports/2024.xlsx, so loading and saving only pay
+    for the year being worked on instead of the whole history.
+
+    manifest.json maps each year's date range to its file. Every year is a
+    regular ExcelStorage (journal, locking, write-behind and all), opened
+    the first time a read or write touches a date in it. Closed years can
+    be archived to read-only YEAR.jsonl.gz files with archive_year().
+
+    Lookups by record ID check the years already open before opening the
+    others, newest first; edits almost always concern recent records.
+    """
+
+    DIR_NAME = "work_reports"
+    MANIFEST_NAME = "manifest.json"
+    MANIFEST_VERSION = 1
+
+    def __init__(self, directory: str = DIR_NAME, write_behind: bool = False, flush_interval: float = 2.0):
+        self.directory = Path(directory)
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._manifest_lock = FileLock(self.directory / "manifest.lock")
+        self._partitions: Dict[int, Partition] = {}
+        self._migrated_from: Optional[str] = None
+        self._manifest_signature: Optional[tuple[int, int]] = None
+        self._open: Dict[int, StorageBackend] = {}
+        self._batch_depth = 0
+        self._batch_stack: Optional[ExitStack] = None
+        self._refresh_manifest()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / self.MANIFEST_NAME
+
+    @property
+    def migrated_from(self) -> Optional[str]:
+        """The monolithic workbook this directory was split from, if any."""
+        return self._migrated_from
+
+    @property
+    def partitions(self) -> List[Partition]:
+        with self._lock:
+            self._refresh_manifest()
+            return [self._partitions[year] for year in sorted(self._partitions)]
+
+    def _signature(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = self.manifest_path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _refresh_manifest(self) -> bool:
+        """Re-reads the manifest if another process changed it. Returns True if it did."""
+        signature = self._signature()
+        if signature == self._manifest_signature:
+            return False
+        data = json.loads(self.manifest_path.read_text(encoding="utf-8")) if signature else {}
+        partitions = {p.year: p for p in map(Partition.from_dict, data.get("partitions", []))}
+        # Years archived elsewhere must be reopened from their new file
+        for year, storage in list(self._open.items()):
+            if year in partitions and partitions[year] != self._partitions.get(year):
+                storage.close()
+                del self._open[year]
+        self._partitions = partitions
+        self._migrated_from = data.get("migrated_from")
+        self._manifest_signature = signature
+        return True
+
+    def _write_manifest(self):
+        """Writes the manifest (the caller holds the manifest lock)."""
+        data = {
+            "version": self.MANIFEST_VERSION,
+            "migrated_from": self._migrated_from,
+            "partitions": [self._partitions[year].to_dict() for year in sorted(self._partitions)],
+        }
+        with atomic_replace(self.manifest_path) as tmp_path:
+            tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        self._manifest_signature = self._signature()
+
+    def _partition_storage(self, year: int, create: bool = False) -> Optional[StorageBackend]:
+        """Returns the open store of a year, opening (or with create, adding) its partition."""
+        with self._lock:
+            # One stat; picks up years archived by another process before touching their workbook
+            self._refresh_manifest()
+            storage = self._open.get(year)
+            if storage is not None:
+                return storage
+            if year not in self._partitions:
+                if not create:
+                    return None
+                with self._manifest_lock:
+                    self._refresh_manifest()
+                    if year not in self._partitions:
+                        self._partitions[year] = Partition(year, f"{year}.xlsx")
+                        self._write_manifest()
+                        logger.info(f"Added partition for {year} to {self.manifest_path}")
+            partition = self._partitions[year]
+            path = self.directory / partition.file
+            if partition.archived:
+                storage = ArchivedPartition(path)
+            else:
+                storage = ExcelStorage(str(path), write_behind=self.write_behind, flush_interval=self.flush_interval)
+            if self._batch_stack is not None:
+                self._batch_stack.enter_context(storage.batch())
+            self._open[year] = storage
+            return storage
+
+    def _years(self, start: date, end: date) -> List[int]:
+        with self._lock:
+            self._refresh_manifest()
+            return [year for year in sorted(self._partitions) if start.year <= year <= end.year]
+
+    def _find(self, record_id: str) -> Optional[tuple[int, StorageBackend]]:
+        """Finds the partition holding a record: open years first, then the rest, newest first."""
+        with self._lock:
+            self._refresh_manifest()
+            opened = sorted(self._open, reverse=True)
+            others = sorted((year for year in self._partitions if year not in self._open), reverse=True)
+        for year in opened + others:
+            storage = self._partition_storage(year)
+            if storage is not None and storage.get_record(record_id) is not None:
+                return year, storage
+        return None
+
+    def preload(self):
+        """Opens and loads the current year, where nearly all reads and writes happen."""
+        storage = self._partition_storage(date.today().year)
+        if storage is not None:
+            storage.preload()
+
+    def save_record(self, record: WorkRecord) -> str:
+        return self._partition_storage(record.date.year, create=True).save_record(record)
+
+    def get_record(self, record_id: str) -> Optional[WorkRecord]:
+        found = self._find(record_id)
+        return found[1].get_record(record_id) if found else None
+
+    def get_records_by_date(self, target_date: date) -> List[tuple[str, WorkRecord]]:
+        storage = self._partition_storage(target_date.year)
+        return storage.get_records_by_date(target_date) if storage else []
+
+    def get_records_in_range(self, start: date, end: date) -> List[tuple[str, WorkRecord]]:
+        records = []
+        for year in self._years(start, end):
+            records.extend(self._partition_storage(year).get_records_in_range(start, end))
+        return records
+
+    def count_records_by_month(self, year: int, month: int) -> int:
+        storage = self._partition_storage(year)
+        return storage.count_records_by_month(year, month) if storage else 0
+
+    def month_summary(self, year: int, month: int) -> Dict[int, int]:
+        storage = self._partition_storage(year)
+        return storage.month_summary(year, month) if storage else {}
+
+    def search(self, query: str, start: Optional[date] = None, end: Optional[date] = None,
+               project: Optional[str] = None) -> List[tuple[str, WorkRecord]]:
+        results = []
+        for year in self._years(start or date.min, end or date.max):
+            results.extend(self._partition_storage(year).search(query, start, end, project))
+        results.sort(key=lambda item: item[1].date, reverse=True)
+        return results
+
+    def project_usages(self) -> List[ProjectUsage]:
+        """
+        Merges the project indexes of the current year and any other year
+        already open. Suggestions never open an old year on their own.
+        """
+        self._partition_storage(date.today().year)
+        with self._lock:
+            storages = list(self._open.values())
+        merged: Dict[str, ProjectUsage] = {}
+        for storage in storages:
+            for usage in storage.project_usages():
+                seen = merged.get(usage.name)
+                if seen is not None:
+                    usage = ProjectUsage(usage.name, seen.count + usage.count, max(seen.last_used, usage.last_used))
+                merged[usage.name] = usage
+        return list(merged.values())
+
+    def update_record(self, record_id: str, record: WorkRecord):
+        """Updates a record in place, moving it to another partition if its year changed."""
+        found = self._find(record_id)
+        if found is None:
+            raise KeyError(record_id)
+        year, storage = found
+        if record.date.year == year:
+            storage.update_record(record_id, record)
+            return
+        if isinstance(storage, ArchivedPartition):
+            # Checked up front: saving to the new year first would leave the record in both
+            raise PermissionError(f"{storage.file_path.name} is archived and read-only")
+        # Save before deleting: a crash in between leaves a duplicate rather than losing the record
+        record.record_id = record_id
+        self._partition_storage(record.date.year, create=True).save_record(record)
+        storage.delete_record(record_id)
+        logger.info(f"Moved record {record_id} from {year} to {record.date.year}")
+
+    def delete_record(self, record_id: str):
+        found = self._find(record_id)
+        if found is None:
+            raise KeyError(record_id)
+        found[1].delete_record(record_id)
+
+    def poll_external_changes(self) -> bool:
+        with self._lock:
+            changed = self._refresh_manifest()
+            storages = list(self._open.values())
+        # Poll every open year, not just up to the first change
+        return any([storage.poll_external_changes() for storage in storages]) or changed
+
+    def flush(self):
+        with self._lock:
+            storages = list(self._open.values())
+        for storage in storages:
+            storage.flush()
+
+    def close(self):
+        with self._lock:
+            storages = list(self._open.values())
+            self._open.clear()
+        for storage in storages:
+            storage.close()
+
+    @contextmanager
+    def batch(self) -> Iterator["PartitionedStorage"]:
+        """Groups mutations into one save per touched year."""
+        with self._lock:
+            if self._batch_depth == 0:
+                self._batch_stack = ExitStack()
+                for storage in self._open.values():
+                    self._batch_stack.enter_context(storage.batch())
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    stack, self._batch_stack = self._batch_stack, None
+                    stack.close()
+
+    def archive_year(self, year: int) -> int:
+        """
+        Compresses a closed year into a read-only YEAR.jsonl.gz and removes
+        its workbook. Returns the number of archived records.
+        """
+        if year >= date.today().year:
+            raise ValueError(f"Only past years can be archived, not {year}")
+        with self._lock, self._manifest_lock:
+            self._refresh_manifest()
+            partition = self._partitions.get(year)
+            if partition is None:
+                raise ValueError(f"There are no records for {year}")
+            if partition.archived:
+                return 0
+            storage = self._partition_storage(year)
+            storage.flush()
+            records = storage.get_records_in_range(partition.start, partition.end)
+            archive = Partition(year, f"{year}.jsonl.gz", archived=True)
+            count = write_archive((record for _, record in records), self.directory / archive.file)
+            storage.close()
+            del self._open[year]
+
+            self._partitions[year] = archive
+            self._write_manifest()
+            # The lock file stays: another process may be waiting on it
+            for leftover in (storage.file_path, storage.journal_path, storage.search_index_path):
+                leftover.unlink(missing_ok=True)
+        logger.info(f"Archived {count} records of {year} to {archive.file}")
+        return count
+
+    def migrate_from_xlsx(self, xlsx_path: str) -> int:
+        """
+        One-shot split of a monolithic work_reports.xlsx into yearly
+        partitions. Writes still only in its journal (e.g. an app that
+        crashed before flushing) are applied in memory, and neither file is
+        written. Recorded in the manifest so it never runs twice. Returns the
+        record count.
+        """
+        with self._lock, self._manifest_lock:
+            self._refresh_manifest()
+            if self._migrated_from or self._partitions:
+                return 0
+            writers = {}
+            count = 0
+            for record in sorted(ExcelStorage.read_records(str(xlsx_path)), key=lambda r: r.date):
+                year = record.date.year
+                if year not in writers:
+                    workbook = openpyxl.Workbook(write_only=True)
+                    sheet = workbook.create_sheet(xlsx_io.SHEET_NAME)
+                    sheet.append(xlsx_io.HEADERS)
+                    writers[year] = (workbook, sheet)
+                writers[year][1].append(xlsx_io.record_to_row(record))
+                count += 1
+            for year, (workbook, _) in sorted(writers.items()):
+                with atomic_replace(self.directory / f"{year}.xlsx") as tmp_path:
+                    workbook.save(tmp_path)
+                self._partitions[year] = Partition(year, f"{year}.xlsx")
+            self._migrated_from = str(xlsx_path)
+            self._write_manifest()
+        logger.info(f"Split {count} records from {xlsx_path} into {len(writers)} yearly partitions")
+        return count
@@ -0,0 +1,174 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+from src.models.record import WorkRecord
+
+@dataclass(frozen=True, slots=True)
+class ProjectUsage:
+    """A distinct project name, how many records use it and the latest date it was used on."""
+    name: str
+    count: int
+    last_used: date
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """True if a and b differ by at most one insertion, deletion, substitution or adjacent swap."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return (a[i + 1:] == b[i + 1:]
+                or (i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]))
+    return a[i + 1:] == b[i:] if len(a) > len(b) else a[i:] == b[i + 1:]
+
+def _is_subsequence(query: str, text: str) -> bool:
+    position = 0
+    for char in query:
+        position = text.find(char, position) + 1
+        if not position:
+            return False
+    return True
+
+def _is_typo_of_prefix(query: str, name: str) -> bool:
+    """A typo in what has been typed so far, e.g. "porj" or "projcet alpha"."""
+    return len(query) >= 3 and (_within_one_edit(query, name[:len(query)]) or _within_one_edit(query, name[:len(query) + 1]))
+
+# Match tests on a normalized query and name, best first: exact, prefix,
+# word prefix, substring, one typo, then abbreviation ("pa", "prj alp")
+_TIERS: Tuple[Callable[[str, str], bool], ...] = (
+    lambda query, name: name == query,
+    lambda query, name: name.startswith(query),
+    lambda query, name: " " + query in name,
+    lambda query, name: query in name,
+    _is_typo_of_prefix,
+    _is_subsequence,
+)
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+def _popularity(usage: ProjectUsage) -> Tuple[int, int, str]:
+    return -usage.count, -usage.last_used.toordinal(), usage.name
+
+def _entry(usage: ProjectUsage) -> Tuple[str, FrozenSet[str], ProjectUsage]:
+    name = _normalize(usage.name)
+    return name, frozenset(name), usage
+
+def _select(query: str, ordered: Sequence[Tuple[str, FrozenSet[str], ProjectUsage]],
+            limit: int) -> List[ProjectUsage]:
+    """
+    Picks the best matches for query from entries that are already in
+    popularity order. Within a tier an earlier usage always wins, so once
+    limit matches are in the better tiers only the tests above them still
+    run on the remaining names. A name missing two of the query's letters
+    (or one it typed twice) cannot match at all and one missing letter
+    leaves only the typo tier; the character sets settle that without
+    looking at the text.
+    """
+    query = _normalize(query)
+    if not query:
+        return [usage for _, _, usage in ordered[:limit]]
+    letters = frozenset(query)
+    repeated = frozenset(char for char in letters if query.count(char) > 1)
+    typo = _TIERS.index(_is_typo_of_prefix)
+    buckets: List[List[ProjectUsage]] = [[] for _ in _TIERS]
+    below = len(_TIERS)
+    for name, chars, usage in ordered:
+        absent = letters - chars
+        missing = len(absent)
+        if missing > 1 or absent & repeated:
+            continue
+        tiers = range(below) if not missing else (typo,) if typo < below else ()
+        for tier in tiers:
+            if _TIERS[tier](query, name):
+                buckets[tier].append(usage)
+                found = 0
+                for better in range(below):
+                    found += len(buckets[better])
+                    if found >= limit:
+                        below = better
+                        break
+                break
+        if not below:
+            break
+    return [usage for bucket in buckets for usage in bucket][:limit]
+
+def rank(query: str, usages: Iterable[ProjectUsage], limit: int = 10) -> List[ProjectUsage]:
+    """
+    Orders usages by how well their name matches query: exact, prefix,
+    word prefix, substring, one typo, then abbreviation; ties go to the
+    most used, then most recently used. An empty query lists the most used.
+    """
+    ordered = sorted(usages, key=_popularity)
+    return _select(query, [_entry(usage) for usage in ordered], limit)
+
+class ProjectIndex:
+    """
+    Distinct project names with their usage counts and last-used dates,
+    kept up to date record by record so suggestions never need a scan of
+    the stored history. Per name it keeps record counts per day, so
+    last_used stays exact when the latest record of a project is deleted.
+    """
+
+    def __init__(self):
+        self._days: Dict[str, Dict[int, int]] = {} # name -> {date ordinal: record count}
+        self._counts: Dict[str, int] = {}
+        self._last: Dict[str, int] = {} # name -> latest date ordinal
+        self._ordered: Optional[List[Tuple[str, FrozenSet[str], ProjectUsage]]] = None # popularity order, rebuilt on lookup
+
+    @classmethod
+    def build(cls, records: Iterable[WorkRecord]) -> "ProjectIndex":
+        index = cls()
+        for record in records:
+            index.add(record)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def add(self, record: WorkRecord):
+        self.add_count(record.project_name, record.date)
+
+    def add_count(self, name: str, on: date, count: int = 1):
+        """Counts count records of a project on a day, e.g. from a GROUP BY query."""
+        day = on.toordinal()
+        self._ordered = None
+        days = self._days.setdefault(name, {})
+        days[day] = days.get(day, 0) + count
+        self._counts[name] = self._counts.get(name, 0) + count
+        if day > self._last.get(name, 0):
+            self._last[name] = day
+
+    def remove(self, record: WorkRecord):
+        name, day = record.project_name, record.date.toordinal()
+        days = self._days.get(name)
+        if not days or day not in days:
+            return
+        self._ordered = None
+        days[day] -= 1
+        if days[day]:
+            self._counts[name] -= 1
+            return
+        del days[day]
+        if not days:
+            del self._days[name], self._counts[name], self._last[name]
+            return
+        self._counts[name] -= 1
+        if day == self._last[name]:
+            self._last[name] = max(days)
+
+    def usage(self, name: str) -> Optional[ProjectUsage]:
+        if name not in self._counts:
+            return None
+        return ProjectUsage(name, self._counts[name], date.fromordinal(self._last[name]))
+
+    def usages(self) -> List[ProjectUsage]:
+        return [ProjectUsage(name, count, date.fromordinal(self._last[name]))
+                for name, count in self._counts.items()]
+
+    def lookup(self, query: str = "", limit: int = 10) -> List[ProjectUsage]:
+        """Project names matching query, best match first (see rank())."""
+        if self._ordered is None:
+            self._ordered = [_entry(usage) for usage in sorted(self.usages(), key=_popularity)]
+        return _select(query, self._ordered, limit)
@@ -0,0 +1,91 @@
+import csv
+import json
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+from src.models.record import WorkRecord
+from src.services import xlsx_io
+
+FORMATS = ("csv", "jsonl", "xlsx")
+
+# Accepted spellings of each column, matched case-insensitively, in HEADERS order
+_ALIASES = [
+    ("date",),
+    ("project", "project_name"),
+    ("summary",),
+    ("details", "detail"),
+    ("id", "record_id"),
+]
+
+def detect_format(file_path: str, fmt: Optional[str] = None) -> str:
+    """Returns fmt if given, otherwise the format implied by the file extension."""
+    fmt = fmt or Path(file_path).suffix.lower().lstrip(".")
+    if fmt == "json":
+        fmt = "jsonl"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}' for {file_path}, expected one of {FORMATS}")
+    return fmt
+
+def _to_row(data: dict) -> tuple:
+    """Orders a mapping of column name -> value like xlsx_io.HEADERS."""
+    lowered = {str(key).strip().lower(): value for key, value in data.items()}
+    row = []
+    for aliases in _ALIASES:
+        row.append(next((lowered[name] for name in aliases if name in lowered), None))
+    return tuple(row)
+
+def _parse(items: Iterable[tuple[int, object]], to_row: Callable[[object], tuple],
+           on_error) -> Iterator[WorkRecord]:
+    for line, raw in items:
+        try:
+            record = xlsx_io.parse_row(to_row(raw))
+        except Exception as e:
+            if on_error is not None:
+                on_error(line, e)
+            continue
+        if record is not None:
+            yield record
+
+def _csv_rows(file_path: str) -> Iterator[tuple[int, dict]]:
+    # utf-8-sig: CSV files saved by Excel start with a BOM
+    with open(file_path, newline="", encoding="utf-8-sig") as f:
+        yield from enumerate(csv.DictReader(f), start=2)
+
+def _jsonl_lines(file_path: str) -> Iterator[tuple[int, str]]:
+    with open(file_path, encoding="utf-8") as f:
+        for line, text in enumerate(f, start=1):
+            if text.strip():
+                yield line, text
+
+def iter_records(file_path: str, fmt: Optional[str] = None,
+                 on_error: Optional[Callable[[int, Exception], None]] = None) -> Iterator[WorkRecord]:
+    """
+    Streams records from a CSV, JSONL or xlsx file, one row at a time.
+    Columns are matched by name (Date, Project, Summary, Details, ID).
+    Malformed rows are skipped; on_error(line_or_row, exception) is called for each.
+    """
+    fmt = detect_format(file_path, fmt)
+    if fmt == "xlsx":
+        return _parse(xlsx_io.iter_rows(file_path), lambda row: row, on_error)
+    if fmt == "csv":
+        return _parse(_csv_rows(file_path), _to_row, on_error)
+    return _parse(_jsonl_lines(file_path), lambda text: _to_row(json.loads(text)), on_error)
+
+def write_records(records: Iterable[WorkRecord], file_path: str, fmt: Optional[str] = None) -> int:
+    """Writes records as CSV, JSONL or an xlsx workbook. Returns the record count."""
+    fmt = detect_format(file_path, fmt)
+    if fmt == "xlsx":
+        return xlsx_io.write_records(records, file_path)
+    count = 0
+    if fmt == "csv":
+        with open(file_path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f)
+            writer.writerow(xlsx_io.HEADERS)
+            for record in records:
+                writer.writerow(xlsx_io.record_to_row(record))
+                count += 1
+    else:
+        with open(file_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record.to_dict(), ensure_ascii=False) + "\n")
+                count += 1
+    return count
@@ -0,0 +1,378 @@
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional
+from src.models.record import WorkRecord
+
+_ID_BYTES = 16 # a new_record_id() hex string packed into bytes
+_EMPTY = -1 # never-used hash table cell
+_DELETED = -2 # cell freed by a removal; lookups probe past it
+
+class _TextColumn:
+    """
+    Variable-length strings stored end to end as UTF-8 and addressed by
+    (offset, length). The bytes live in a bytearray, or with spill=True in
+    an anonymous temporary file, so they only occupy memory while a record
+    is being materialized. Replaced values leave garbage behind until the
+    owning table is vacuumed.
+    """
+
+    def __init__(self, spill: bool = False):
+        self._buffer = bytearray()
+        self._spill = spill
+        self._file: Optional[BinaryIO] = None # the spill file, created on the first write
+        self.size = 0 # bytes written, including garbage
+        self._at_end = True # seeking a buffered file flushes it; only seek back after a read
+        self.offsets = array("Q")
+        self.lengths = array("I")
+        self.garbage = 0
+
+    def _write(self, text: str) -> tuple[int, int]:
+        data = text.encode("utf-8")
+        offset = self.size
+        if data:
+            if not self._spill:
+                self._buffer += data
+            else:
+                if self._file is None:
+                    self._file = tempfile.TemporaryFile()
+                if not self._at_end:
+                    self._file.seek(offset)
+                    self._at_end = True
+                self._file.write(data)
+            self.size += len(data)
+        return offset, len(data)
+
+    def append(self, text: str):
+        offset, length = self._write(text)
+        self.offsets.append(offset)
+        self.lengths.append(length)
+
+    def set(self, slot: int, text: str):
+        self.garbage += self.lengths[slot]
+        self.offsets[slot], self.lengths[slot] = self._write(text)
+
+    def discard(self, slot: int):
+        self.garbage += self.lengths[slot]
+
+    def get(self, slot: int) -> str:
+        length = self.lengths[slot]
+        if not length:
+            return ""
+        offset = self.offsets[slot]
+        if self._file is None:
+            return self._buffer[offset:offset + length].decode("utf-8")
+        self._file.seek(offset)
+        self._at_end = False
+        return self._file.read(length).decode("utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the column (spilled text excluded)."""
+        return len(self._buffer) + len(self.offsets) * 8 + len(self.lengths) * 4
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class RecordTable:
+    """
+    Columnar in-memory store of work records keyed by record ID.
+
+    Instead of one WorkRecord object per row, every field is a column:
+    dates are ordinals in an array('i'), project names are dictionary
+    encoded, summaries are packed UTF-8 and details are spilled to a
+    temporary file and only read back when a record is materialized.
+    IDs from new_record_id() are packed to 16 bytes and found through an
+    open-addressing hash table held in an array; any other ID string
+    falls back to a dict. A permutation of the rows sorted by date turns
+    date-range queries into two binary searches and a slice.
+
+    Each row also carries an integer position owned by the caller (e.g.
+    the sheet row it was read from). WorkRecord objects are only created
+    by the accessors, so callers can't mutate the table by accident.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._ids = bytearray() # _ID_BYTES per slot; zeros for IDs kept in _other_ids
+        self._id_table = array("i", [_EMPTY] * 8) # open addressing: slot or _EMPTY/_DELETED
+        self._id_used = 0 # cells that are not _EMPTY
+        self._other_ids: Dict[str, int] = {} # record_id -> slot for IDs that aren't packed hex
+        self._other_slots: Dict[int, str] = {}
+        self._dates = array("i") # date ordinals
+        self._date_order = array("I") # live slots sorted by date, insertion order within a day
+        self._projects = array("I") # index into _project_names
+        self._project_names: List[str] = []
+        self._project_codes: Dict[str, int] = {}
+        self._summaries = _TextColumn()
+        self._details = _TextColumn(spill=True)
+        self._positions = array("q")
+        self._alive = bytearray()
+        self._live = 0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __contains__(self, record_id: str) -> bool:
+        return self._slot(record_id) is not None
+
+    def clear(self):
+        self._summaries.close()
+        self._details.close()
+        self._reset()
+
+    def close(self):
+        """Empties the table and deletes its spill file; it can be refilled afterwards."""
+        self.clear()
+
+    # -- IDs --
+
+    @staticmethod
+    def _pack_id(record_id: str) -> Optional[bytes]:
+        """Packs a lowercase 32-digit hex ID; anything else is stored as a string."""
+        if len(record_id) != 2 * _ID_BYTES:
+            return None
+        try:
+            packed = bytes.fromhex(record_id)
+        except ValueError:
+            return None
+        return packed if packed.hex() == record_id else None
+
+    def _id_bytes(self, slot: int) -> bytes:
+        start = slot * _ID_BYTES
+        return bytes(self._ids[start:start + _ID_BYTES])
+
+    def _probe(self, packed: bytes) -> int:
+        """Returns the hash table cell holding packed, or -1."""
+        table = self._id_table
+        mask = len(table) - 1
+        cell = int.from_bytes(packed[:8], "little") & mask
+        while True:
+            slot = table[cell]
+            if slot == _EMPTY:
+                return -1
+            if slot >= 0 and self._id_bytes(slot) == packed:
+                return cell
+            cell = (cell + 1) & mask
+
+    def _insert_id(self, packed: bytes, slot: int):
+        if (self._id_used + 1) * 2 > len(self._id_table):
+            # Sized from the live IDs, so cells freed by removals are reclaimed too
+            live = self._live - len(self._other_ids) + 1
+            self._resize_id_table(max(8, 1 << (4 * live - 1).bit_length()))
+        table = self._id_table
+        mask = len(table) - 1
+        cell = int.from_bytes(packed[:8], "little") & mask
+        while table[cell] >= 0:
+            cell = (cell + 1) & mask
+        if table[cell] == _EMPTY:
+            self._id_used += 1
+        table[cell] = slot
+
+    def _resize_id_table(self, capacity: int):
+        slots = [slot for slot in self._id_table if slot >= 0]
+        self._id_table = array("i", [_EMPTY]) * capacity
+        self._id_used = 0
+        for slot in slots:
+            self._insert_id(self._id_bytes(slot), slot)
+
+    def _slot(self, record_id: str) -> Optional[int]:
+        packed = self._pack_id(record_id)
+        if packed is None:
+            return self._other_ids.get(record_id)
+        cell = self._probe(packed)
+        return self._id_table[cell] if cell >= 0 else None
+
+    def _require(self, record_id: str) -> int:
+        slot = self._slot(record_id)
+        if slot is None:
+            raise KeyError(record_id)
+        return slot
+
+    def _record_id(self, slot: int) -> str:
+        other = self._other_slots.get(slot)
+        return other if other is not None else self._id_bytes(slot).hex()
+
+    # -- Dates --
+
+    def _date_bounds(self, first: int, last: int) -> tuple[int, int]:
+        key = self._dates.__getitem__
+        return bisect_left(self._date_order, first, key=key), bisect_right(self._date_order, last, key=key)
+
+    def _order_insert(self, slot: int):
+        ordinal = self._dates[slot]
+        self._date_order.insert(bisect_right(self._date_order, ordinal, key=self._dates.__getitem__), slot)
+
+    def _order_remove(self, slot: int):
+        ordinal = self._dates[slot]
+        lo, hi = self._date_bounds(ordinal, ordinal)
+        for i in range(lo, hi):
+            if self._date_order[i] == slot:
+                del self._date_order[i]
+                return
+
+    # -- Mutations --
+
+    def _project_code(self, name: str) -> int:
+        code = self._project_codes.get(name)
+        if code is None:
+            code = self._project_codes[name] = len(self._project_names)
+            self._project_names.append(name)
+        return code
+
+    def _append(self, record: WorkRecord, position: int) -> int:
+        if not record.record_id:
+            raise ValueError("Records need an ID before they are added to the table")
+        slot = len(self._dates)
+        packed = self._pack_id(record.record_id)
+        if packed is None:
+            self._ids += bytes(_ID_BYTES)
+            self._other_ids[record.record_id] = slot
+            self._other_slots[slot] = record.record_id
+        else:
+            self._ids += packed
+            self._insert_id(packed, slot)
+        self._dates.append(record.date.toordinal())
+        self._projects.append(self._project_code(record.project_name))
+        self._summaries.append(record.summary)
+        self._details.append(record.details)
+        self._positions.append(position)
+        self._alive.append(1)
+        self._live += 1
+        return slot
+
+    def append(self, record: WorkRecord, position: int):
+        """Adds a record (its record_id must be set and unique) at a caller-defined position."""
+        self._order_insert(self._append(record, position))
+
+    def extend(self, items: Iterable[tuple[WorkRecord, int]]):
+        """
+        Adds many (record, position) pairs, sorting the date order once at
+        the end rather than inserting into it row by row. IDs are indexed as
+        they arrive, so `in` already sees earlier rows of the same batch.
+        """
+        start = len(self._dates)
+        for record, position in items:
+            self._append(record, position)
+        if len(self._dates) > start:
+            # Stable sort: rows of the same day stay in insertion order
+            slots = list(self._date_order) + list(range(start, len(self._dates)))
+            self._date_order = array("I", sorted(slots, key=self._dates.__getitem__))
+
+    def update(self, record_id: str, record: WorkRecord):
+        """Replaces the fields of a record; its ID and position stay the same."""
+        slot = self._require(record_id)
+        ordinal = record.date.toordinal()
+        if ordinal != self._dates[slot]:
+            self._order_remove(slot)
+            self._dates[slot] = ordinal
+            self._order_insert(slot)
+        self._projects[slot] = self._project_code(record.project_name)
+        self._summaries.set(slot, record.summary)
+        self._details.set(slot, record.details)
+        self._maybe_vacuum()
+
+    def remove(self, record_id: str) -> int:
+        """Removes a record and returns its position. Raises KeyError if it doesn't exist."""
+        slot = self._require(record_id)
+        position = self._positions[slot]
+        self._order_remove(slot)
+        other = self._other_slots.pop(slot, None)
+        if other is not None:
+            del self._other_ids[other]
+        else:
+            self._id_table[self._probe(self._id_bytes(slot))] = _DELETED
+        self._summaries.discard(slot)
+        self._details.discard(slot)
+        self._alive[slot] = 0
+        self._live -= 1
+        self._maybe_vacuum()
+        return position
+
+    def _maybe_vacuum(self):
+        """Rebuilds the columns once removed rows and replaced text make up most of them."""
+        dead = len(self._dates) - self._live
+        garbage = self._summaries.garbage + self._details.garbage
+        text = self._summaries.size + self._details.size
+        if dead > max(1024, self._live) or garbage > max(1 << 20, text // 2):
+            self.vacuum()
+
+    def vacuum(self):
+        """Drops removed rows and replaced text; row order and positions are kept."""
+        fresh = RecordTable()
+        fresh.extend((self._materialize(slot), self._positions[slot]) for slot in self._live_slots())
+        self._summaries.close()
+        self._details.close()
+        self.__dict__.update(fresh.__dict__)
+
+    # -- Positions --
+
+    def position(self, record_id: str) -> int:
+        """Returns the caller-defined position of a record. Raises KeyError if it doesn't exist."""
+        return self._positions[self._require(record_id)]
+
+    def shift_positions(self, removed: List[int]):
+        """Renumbers positions after the (sorted) positions in removed were taken out, e.g. deleted sheet rows."""
+        if not removed:
+            return
+        positions = self._positions
+        for slot in self._live_slots():
+            positions[slot] -= bisect_left(removed, positions[slot])
+
+    # -- Queries --
+
+    def _live_slots(self) -> Iterator[int]:
+        alive = self._alive
+        return (slot for slot in range(len(alive)) if alive[slot])
+
+    def _materialize(self, slot: int) -> WorkRecord:
+        return WorkRecord(
+            date=date.fromordinal(self._dates[slot]),
+            project_name=self._project_names[self._projects[slot]],
+            summary=self._summaries.get(slot),
+            details=self._details.get(slot),
+            record_id=self._record_id(slot)
+        )
+
+    def get(self, record_id: str) -> Optional[WorkRecord]:
+        """Returns a copy of the record with the given ID, or None."""
+        slot = self._slot(record_id)
+        return None if slot is None else self._materialize(slot)
+
+    def items(self) -> Iterator[tuple[str, WorkRecord]]:
+        """Yields (record_id, record) for every record in insertion order."""
+        for slot in self._live_slots():
+            yield self._record_id(slot), self._materialize(slot)
+
+    def items_in_range(self, start: date, end: date) -> List[tuple[str, WorkRecord]]:
+        """Returns (record_id, record) between start and end (inclusive), ordered by date."""
+        lo, hi = self._date_bounds(start.toordinal(), end.toordinal())
+        return [(self._record_id(slot), self._materialize(slot)) for slot in self._date_order[lo:hi]]
+
+    def count_in_range(self, start: date, end: date) -> int:
+        """Counts records between start and end (inclusive) without materializing them."""
+        lo, hi = self._date_bounds(start.toordinal(), end.toordinal())
+        return hi - lo
+
+    def counts_in_range(self, start: date, end: date) -> Dict[date, int]:
+        """Returns the number of records per date between start and end (inclusive)."""
+        lo, hi = self._date_bounds(start.toordinal(), end.toordinal())
+        counts: Dict[int, int] = {}
+        dates = self._dates
+        for slot in self._date_order[lo:hi]:
+            counts[dates[slot]] = counts.get(dates[slot], 0) + 1
+        return {date.fromordinal(ordinal): count for ordinal, count in counts.items()}
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns, excluding the small per-object overhead."""
+        return (len(self._ids) + len(self._id_table) * 4 + len(self._dates) * 4 + len(self._date_order) * 4
+                + len(self._projects) * 4 + len(self._positions) * 8 + len(self._alive)
+                + self._summaries.nbytes + self._details.nbytes
+                + sum(len(name) + 50 for name in self._project_names)
+                + 120 * len(self._other_ids))
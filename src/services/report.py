@@ -0,0 +1,155 @@
+import calendar
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from src.models.record import WorkRecord
+from src.services.backend import StorageBackend
+
+@dataclass
+class ProjectSection:
+    """The records of one project within a report, ordered by date."""
+    project_name: str
+    records: List[WorkRecord] = field(default_factory=list)
+
+    @property
+    def days(self) -> int:
+        """Number of distinct days the project was worked on."""
+        return len({record.date for record in self.records})
+
+@dataclass
+class Report:
+    """Records of a date range grouped by project."""
+    title: str
+    start: date
+    end: date
+    projects: List[ProjectSection]
+
+    @property
+    def total(self) -> int:
+        return sum(len(section.records) for section in self.projects)
+
+    @property
+    def days(self) -> int:
+        """Number of distinct days with at least one record."""
+        return len({record.date for section in self.projects for record in section.records})
+
+def week_range(day: date) -> tuple[date, date]:
+    """The Monday to Sunday week containing day."""
+    monday = day - timedelta(days=day.weekday())
+    return monday, monday + timedelta(days=6)
+
+def month_range(day: date) -> tuple[date, date]:
+    """The calendar month containing day."""
+    last_day = calendar.monthrange(day.year, day.month)[1]
+    return day.replace(day=1), day.replace(day=last_day)
+
+def default_title(start: date, end: date) -> str:
+    """Names whole ISO weeks and calendar months, otherwise the plain range."""
+    if (start, end) == week_range(start):
+        iso_year, iso_week, _ = start.isocalendar()
+        return f"Weekly Report {iso_year}-W{iso_week:02d} ({start.isoformat()} ~ {end.isoformat()})"
+    if (start, end) == month_range(start):
+        return f"Monthly Report {start.strftime('%Y-%m')}"
+    return f"Report {start.isoformat()} ~ {end.isoformat()}"
+
+def build_report(storage: StorageBackend, start: date, end: date, title: Optional[str] = None) -> Report:
+    """
+    Groups the records between start and end (inclusive) by project.
+    The range is fetched with a single storage query and grouped in one
+    pass, so a report costs the same whether it spans a week or a quarter.
+    Projects are listed by record count, busiest first.
+    """
+    if end < start:
+        raise ValueError(f"Report range ends ({end}) before it starts ({start})")
+    sections: Dict[str, ProjectSection] = {}
+    for _, record in storage.get_records_in_range(start, end):
+        section = sections.get(record.project_name)
+        if section is None:
+            section = sections[record.project_name] = ProjectSection(record.project_name)
+        section.records.append(record)
+    projects = sorted(sections.values(), key=lambda s: (-len(s.records), s.project_name))
+    return Report(title or default_title(start, end), start, end, projects)
+
+def _overview(report: Report) -> str:
+    if not report.total:
+        return "No records in this period."
+    return f"{report.total} records across {len(report.projects)} projects on {report.days} days."
+
+def _detail_lines(details: str, indent: str) -> List[str]:
+    return [f"{indent}{line.rstrip()}" for line in details.strip().splitlines() if line.strip()]
+
+def render_markdown(report: Report) -> str:
+    """Renders a report as Markdown: one section per project, one bullet per record."""
+    lines = [f"# {report.title}", "", _overview(report)]
+    for section in report.projects:
+        lines += ["", f"## {section.project_name} ({len(section.records)})", ""]
+        for record in section.records:
+            lines.append(f"- **{record.date.isoformat()}** {record.summary}")
+            lines += _detail_lines(record.details, "  ")
+    return "\n".join(lines) + "\n"
+
+def render_text(report: Report) -> str:
+    """Renders a report as plain text, e.g. for pasting into an email."""
+    lines = [report.title, "=" * len(report.title), _overview(report)]
+    for section in report.projects:
+        heading = f"{section.project_name} ({len(section.records)})"
+        lines += ["", heading, "-" * len(heading)]
+        for record in section.records:
+            lines.append(f"{record.date.isoformat()}  {record.summary}")
+            lines += _detail_lines(record.details, "            ")
+    return "\n".join(lines) + "\n"
+
+RENDERERS: Dict[str, Callable[[Report], str]] = {
+    "markdown": render_markdown,
+    "text": render_text,
+}
+
+def write_xlsx(report: Report, file_path: str, sheet_name: Optional[str] = None) -> str:
+    """
+    Writes a report as a sheet of file_path, creating the workbook if needed
+    and replacing a sheet of the same name. Returns the sheet name.
+    Refuses to touch a work record store, which the app rewrites on save.
+    """
+    import openpyxl
+    from openpyxl.styles import Font
+    from src.services import xlsx_io
+
+    sheet_name = (sheet_name or f"Report {report.start.isoformat()}")[:31] # Excel's limit
+    try:
+        workbook = openpyxl.load_workbook(file_path)
+    except FileNotFoundError:
+        workbook = openpyxl.Workbook()
+        workbook.remove(workbook.active)
+    if xlsx_io.SHEET_NAME in workbook.sheetnames:
+        raise ValueError(f"{file_path} is a work record store; write the report to another file")
+    if sheet_name in workbook.sheetnames:
+        workbook.remove(workbook[sheet_name])
+
+    sheet = workbook.create_sheet(sheet_name)
+    bold = Font(bold=True)
+    sheet.append([report.title])
+    sheet["A1"].font = Font(bold=True, size=14)
+    sheet.append([_overview(report)])
+    sheet.append([])
+    sheet.append(["Project", "Date", "Summary", "Details"])
+    for cell in sheet[sheet.max_row]:
+        cell.font = bold
+    for section in report.projects:
+        for record in section.records:
+            sheet.append([section.project_name, record.date, record.summary, record.details])
+            sheet.cell(row=sheet.max_row, column=2).number_format = "yyyy-mm-dd"
+    for column, width in zip("ABCD", (20, 12, 40, 60)):
+        sheet.column_dimensions[column].width = width
+    workbook.save(file_path)
+    return sheet_name
+
+def save_report(report: Report, file_path: str) -> str:
+    """Writes a report in the format implied by the file extension (.xlsx, .txt, else Markdown)."""
+    suffix = Path(file_path).suffix.lower()
+    if suffix == ".xlsx":
+        write_xlsx(report, file_path)
+    else:
+        renderer = render_text if suffix == ".txt" else render_markdown
+        Path(file_path).write_text(renderer(report), encoding="utf-8")
+    return file_path
@@ -0,0 +1,168 @@
+import json
+import os
+import re
+from bisect import bisect_left, insort
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from src.models.record import WorkRecord
+from src.utils.logger import setup_logger
+
+logger = setup_logger("SearchIndex")
+
+# Runs of CJK ideographs, kana and hangul; everything else is split into latin words/numbers
+_CJK_RUN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+")
+_WORD = re.compile(r"[^\W_]+")
+
+def _cjk_terms(run: str, for_query: bool) -> List[str]:
+    """
+    Documents index every character and every adjacent pair, so a query of
+    one character or of any length >= 2 (as overlapping pairs) can match.
+    """
+    bigrams = [run[i:i + 2] for i in range(len(run) - 1)]
+    if not for_query:
+        return list(run) + bigrams
+    return bigrams or [run]
+
+def tokenize(text: str, for_query: bool = False) -> List[str]:
+    """
+    Splits text into search terms: lowercased latin words/numbers plus
+    CJK unigrams and bigrams (Chinese has no spaces to split words on).
+    """
+    terms: List[str] = []
+    text = text.lower()
+    position = 0
+    for match in _CJK_RUN.finditer(text):
+        terms.extend(_WORD.findall(text[position:match.start()]))
+        terms.extend(_cjk_terms(match.group(), for_query))
+        position = match.end()
+    terms.extend(_WORD.findall(text[position:]))
+    return terms
+
+def record_terms(record: WorkRecord) -> Set[str]:
+    """The distinct terms of the searchable fields of a record."""
+    return set(tokenize(f"{record.project_name}\n{record.summary}\n{record.details}"))
+
+def query_terms(query: str) -> List[tuple[str, bool]]:
+    """
+    Tokenizes a search query into (term, is_prefix) pairs. The last latin
+    term matches as a prefix so results update while the user is typing.
+    """
+    terms = tokenize(query, for_query=True)
+    return [
+        (term, i == len(terms) - 1 and _CJK_RUN.fullmatch(term) is None)
+        for i, term in enumerate(terms)
+    ]
+
+class InvertedIndex:
+    """
+    Incremental term -> record ID index over project, summary and details.
+
+    Records can be added, replaced and removed without a rebuild. Queries
+    match records containing every query term; the last latin term also
+    matches as a prefix so results update while typing.
+    """
+
+    VERSION = 1
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._doc_terms: Dict[str, List[str]] = {}
+        self._vocabulary: List[str] = [] # sorted, for prefix lookups
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def add(self, record_id: str, record: WorkRecord):
+        """Indexes a record, replacing any previous version of it."""
+        self.remove(record_id)
+        terms = sorted(record_terms(record))
+        self._doc_terms[record_id] = terms
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                self._postings[term] = {record_id}
+                insort(self._vocabulary, term)
+            else:
+                postings.add(record_id)
+
+    def remove(self, record_id: str):
+        """Drops a record from the index, if present."""
+        for term in self._doc_terms.pop(record_id, ()):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.discard(record_id)
+            if not postings:
+                del self._postings[term]
+                del self._vocabulary[bisect_left(self._vocabulary, term)]
+
+    def _prefix_matches(self, prefix: str) -> Set[str]:
+        matches: Set[str] = set()
+        i = bisect_left(self._vocabulary, prefix)
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(prefix):
+            matches |= self._postings[self._vocabulary[i]]
+            i += 1
+        return matches
+
+    def search(self, query: str) -> Set[str]:
+        """Returns the IDs of records that contain every term of the query."""
+        terms = query_terms(query)
+        if not terms:
+            return set()
+        result: Optional[Set[str]] = None
+        for term, is_prefix in terms:
+            if is_prefix:
+                matches = self._prefix_matches(term)
+            else:
+                matches = self._postings.get(term, set())
+            result = set(matches) if result is None else result & matches
+            if not result:
+                return set()
+        return result
+
+    def save(self, file_path: Path, source_signature):
+        """
+        Persists the index next to its data file. source_signature identifies
+        the data the index was built from; load() ignores a stale file.
+        """
+        payload = {"version": self.VERSION, "source": source_signature, "docs": self._doc_terms}
+        tmp_path = Path(f"{file_path}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, file_path)
+
+    @classmethod
+    def load(cls, file_path: Path, source_signature) -> Optional["InvertedIndex"]:
+        """Loads a persisted index if it exists and matches source_signature, else None."""
+        try:
+            with open(file_path, encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable search index {file_path}: {e}")
+            return None
+        if payload.get("version") != cls.VERSION or payload.get("source") != _jsonable(source_signature):
+            return None
+
+        # Postings are rebuilt from the stored per-record terms; no re-tokenizing needed
+        return cls._from_doc_terms(payload.get("docs", {}))
+
+    @classmethod
+    def build(cls, items: Iterable[tuple[str, WorkRecord]]) -> "InvertedIndex":
+        """Tokenizes every record from scratch."""
+        return cls._from_doc_terms({record_id: sorted(record_terms(record)) for record_id, record in items})
+
+    @classmethod
+    def _from_doc_terms(cls, doc_terms: Dict[str, List[str]]) -> "InvertedIndex":
+        index = cls()
+        index._doc_terms = dict(doc_terms)
+        for record_id, terms in index._doc_terms.items():
+            for term in terms:
+                index._postings.setdefault(term, set()).add(record_id)
+        index._vocabulary = sorted(index._postings)
+        return index
+
+def _jsonable(value):
+    """Tuples come back from JSON as lists; compare like with like."""
+    return json.loads(json.dumps(value))
@@ -0,0 +1,327 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from src.models.record import WorkRecord, new_record_id
+from src.services.backend import StorageBackend
+from src.services.project_index import ProjectIndex, ProjectUsage
+from src.services.search_index import query_terms, record_terms
+from src.utils.logger import setup_logger
+from src.utils.metrics import timed
+
+logger = setup_logger("SQLiteStorage")
+
+class SQLiteStorage(StorageBackend):
+    """
+    Stores work records in an SQLite database.
+    Rows have an INTEGER PRIMARY KEY plus a unique, stable record ID (uid)
+    that is exposed to callers, and the date column is indexed, so
+    day/range queries and single-record writes stay cheap no matter how
+    much history accumulates. A search_terms table holds the inverted
+    index used by search(), maintained in the same transaction as each write.
+
+    The database uses SQLite's rollback journal rather than WAL: WAL relies
+    on shared memory, which processes on different machines can't share,
+    so it would corrupt a .db kept on a network drive and opened from
+    several computers. Rollback-journal locking works over SMB/NFS as well
+    as the file system's own locks do.
+    """
+
+    FILE_NAME = "work_reports.db"
+    SCHEMA_VERSION = 1
+    COLUMNS = "uid, date, project, summary, details"
+
+    def __init__(self, file_path: str = FILE_NAME):
+        self.file_path = Path(file_path)
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        # The connection is shared with the I/O worker threads; access is serialised by _lock
+        self._conn = sqlite3.connect(str(self.file_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=DELETE") # also converts databases created in WAL mode
+        self._conn.execute("PRAGMA synchronous=FULL") # NORMAL is only crash-safe with WAL
+        self._ensure_schema()
+        self._data_version = self._get_data_version()
+        self._projects: Optional[ProjectIndex] = None # built on first use, see _get_projects()
+        self._projects_version = 0 # data_version the project index was built at
+
+    def _ensure_schema(self):
+        """Creates tables and indexes if the database is new."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS records (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    uid TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    project TEXT NOT NULL DEFAULT '',
+                    summary TEXT NOT NULL DEFAULT '',
+                    details TEXT NOT NULL DEFAULT ''
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_records_date ON records(date)")
+            self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_records_uid ON records(uid)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_terms ("
+                "term TEXT NOT NULL, uid TEXT NOT NULL, PRIMARY KEY (term, uid)) WITHOUT ROWID"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_search_terms_uid ON search_terms(uid)")
+            self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def _index_terms(self, record_id: str, record: Optional[WorkRecord]):
+        """Replaces the search terms of a record (record=None just removes them)."""
+        self._conn.execute("DELETE FROM search_terms WHERE uid = ?", (record_id,))
+        if record is not None:
+            self._conn.executemany(
+                "INSERT INTO search_terms (term, uid) VALUES (?, ?)",
+                [(term, record_id) for term in record_terms(record)]
+            )
+
+    def _commit(self):
+        """Commits unless we are inside a batch()."""
+        if not self._batch_depth:
+            self._conn.commit()
+
+    @staticmethod
+    def _to_record(row: tuple) -> tuple[str, WorkRecord]:
+        return row[0], WorkRecord(
+            date=date.fromisoformat(row[1]),
+            project_name=row[2],
+            summary=row[3],
+            details=row[4],
+            record_id=row[0]
+        )
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+            self._commit()
+
+    @timed()
+    def save_record(self, record: WorkRecord) -> str:
+        """Inserts a new record. Returns its ID."""
+        with self._lock:
+            if not record.record_id or self._exists(record.record_id):
+                record.record_id = new_record_id()
+            self._conn.execute(
+                "INSERT INTO records (uid, date, project, summary, details) VALUES (?, ?, ?, ?, ?)",
+                (record.record_id, record.date.isoformat(), record.project_name, record.summary, record.details)
+            )
+            self._index_terms(record.record_id, record)
+            self._commit()
+            if self._projects is not None:
+                self._projects.add(record)
+        logger.debug("Saved record: %s", record.summary)
+        return record.record_id
+
+    def _exists(self, record_id: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM records WHERE uid = ?", (record_id,)).fetchone() is not None
+
+    @timed()
+    def get_record(self, record_id: str) -> Optional[WorkRecord]:
+        """Returns the record with the given ID, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self.COLUMNS} FROM records WHERE uid = ?", (record_id,)
+            ).fetchone()
+        return self._to_record(row)[1] if row else None
+
+    @timed()
+    def get_records_by_date(self, target_date: date) -> List[tuple[str, WorkRecord]]:
+        """Retrieves records for a specific date as (record_id, WorkRecord) tuples."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self.COLUMNS} FROM records WHERE date = ? ORDER BY id",
+                (target_date.isoformat(),)
+            ).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    @timed()
+    def get_records_in_range(self, start: date, end: date) -> List[tuple[str, WorkRecord]]:
+        """Retrieves records between start and end (both inclusive), ordered by date."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self.COLUMNS} FROM records "
+                "WHERE date BETWEEN ? AND ? ORDER BY date, id",
+                (start.isoformat(), end.isoformat())
+            ).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    @timed(rows=None)
+    def count_records_by_month(self, year: int, month: int) -> int:
+        """Counts the records of a calendar month."""
+        prefix = f"{year:04d}-{month:02d}-"
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM records WHERE date BETWEEN ? AND ?",
+                (prefix + "01", prefix + "31")
+            ).fetchone()
+        return row[0]
+
+    @timed()
+    def month_summary(self, year: int, month: int) -> Dict[int, int]:
+        """Returns {day_of_month: record_count} using the date index."""
+        prefix = f"{year:04d}-{month:02d}-"
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, COUNT(*) FROM records WHERE date BETWEEN ? AND ? GROUP BY date",
+                (prefix + "01", prefix + "31")
+            ).fetchall()
+        return {int(day[-2:]): count for day, count in rows}
+
+    @timed()
+    def search(self, query: str, start: Optional[date] = None, end: Optional[date] = None,
+               project: Optional[str] = None) -> List[tuple[str, WorkRecord]]:
+        """Full-text search over project, summary and details, newest first."""
+        terms = query_terms(query)
+        if not terms:
+            return []
+        subqueries = []
+        params: list = []
+        for term, is_prefix in terms:
+            if is_prefix:
+                # term* as a range scan on the (term, uid) primary key
+                subqueries.append("SELECT uid FROM search_terms WHERE term >= ? AND term < ?")
+                params += [term, term[:-1] + chr(ord(term[-1]) + 1)]
+            else:
+                subqueries.append("SELECT uid FROM search_terms WHERE term = ?")
+                params.append(term)
+
+        sql = f"SELECT {self.COLUMNS} FROM records WHERE uid IN ({' INTERSECT '.join(subqueries)})"
+        if start is not None:
+            sql += " AND date >= ?"
+            params.append(start.isoformat())
+        if end is not None:
+            sql += " AND date <= ?"
+            params.append(end.isoformat())
+        if project is not None:
+            sql += " AND project = ?"
+            params.append(project)
+        sql += " ORDER BY date DESC, id DESC"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    @timed()
+    def update_record(self, record_id: str, record: WorkRecord):
+        """Updates the record with the given ID."""
+        with self._lock:
+            previous = self._project_of(record_id)
+            cursor = self._conn.execute(
+                "UPDATE records SET date = ?, project = ?, summary = ?, details = ? WHERE uid = ?",
+                (record.date.isoformat(), record.project_name, record.summary, record.details, record_id)
+            )
+            if cursor.rowcount == 0:
+                raise KeyError(record_id)
+            record.record_id = record_id
+            self._index_terms(record_id, record)
+            self._commit()
+            if self._projects is not None:
+                self._projects.remove(previous)
+                self._projects.add(record)
+        logger.debug("Updated record %s", record_id)
+
+    @timed()
+    def delete_record(self, record_id: str):
+        """Deletes the record with the given ID."""
+        with self._lock:
+            previous = self._project_of(record_id)
+            cursor = self._conn.execute("DELETE FROM records WHERE uid = ?", (record_id,))
+            if cursor.rowcount == 0:
+                raise KeyError(record_id)
+            self._index_terms(record_id, None)
+            self._commit()
+            if self._projects is not None:
+                self._projects.remove(previous)
+        logger.debug("Deleted record %s", record_id)
+
+    def _project_of(self, record_id: str) -> Optional[WorkRecord]:
+        """The project and date of a stored record, for taking it out of the project index."""
+        if self._projects is None:
+            return None
+        row = self._conn.execute("SELECT date, project FROM records WHERE uid = ?", (record_id,)).fetchone()
+        return WorkRecord(date.fromisoformat(row[0]), row[1], "", "") if row else None
+
+    def _get_projects(self) -> ProjectIndex:
+        """
+        The in-memory ProjectIndex, built with one GROUP BY on first use and
+        then maintained by every write. It is rebuilt when another connection
+        has committed in the meantime.
+        """
+        version = self._get_data_version()
+        if self._projects is None or version != self._projects_version:
+            self._projects = ProjectIndex()
+            rows = self._conn.execute("SELECT project, date, COUNT(*) FROM records GROUP BY project, date")
+            for project, day, count in rows:
+                self._projects.add_count(project, date.fromisoformat(day), count)
+            self._projects_version = version
+        return self._projects
+
+    def project_usages(self) -> List[ProjectUsage]:
+        with self._lock:
+            return self._get_projects().usages()
+
+    @timed()
+    def suggest_projects(self, query: str = "", limit: int = 10) -> List[ProjectUsage]:
+        with self._lock:
+            return self._get_projects().lookup(query, limit)
+
+    @contextmanager
+    def batch(self) -> Iterator["SQLiteStorage"]:
+        """Runs several mutations in a single transaction."""
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            except Exception:
+                if self._batch_depth == 1:
+                    self._conn.rollback()
+                    self._projects = None # it already counted the rolled back writes
+                raise
+            finally:
+                self._batch_depth -= 1
+            if not self._batch_depth:
+                self._conn.commit()
+
+    def _get_data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def poll_external_changes(self) -> bool:
+        """Other connections' commits bump PRAGMA data_version; our own don't."""
+        with self._lock:
+            version = self._get_data_version()
+            changed, self._data_version = version != self._data_version, version
+            return changed
+
+    @timed(rows=None)
+    def flush(self):
+        with self._lock:
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def migrate_from_xlsx(self, xlsx_path: str) -> int:
+        """
+        One-shot import of an existing work_reports.xlsx.
+        Records the migration in the meta table so it never runs twice.
+        Returns the number of imported records.
+        """
+        if self.get_meta("migrated_from_xlsx"):
+            return 0
+        # Same transaction, so a crash can't leave records imported but unmarked
+        with self.batch():
+            count = self.import_xlsx(xlsx_path)
+            self.set_meta("migrated_from_xlsx", str(Path(xlsx_path).resolve()))
+        logger.info(f"Migrated {count} records from {xlsx_path} into {self.file_path}")
+        return count
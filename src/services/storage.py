@@ -1,114 +1,601 @@
+from dataclasses import dataclass
+import atexit
+import calendar
+import threading
+from copy import copy
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import date
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 import openpyxl
 from openpyxl.worksheet.worksheet import Worksheet
-from src.models.record import WorkRecord
+from src.models.record import WorkRecord, new_record_id
+from src.services import xlsx_io
+from src.services.backend import StorageBackend
+from src.services.journal import Journal
+from src.services.project_index import ProjectIndex, ProjectUsage
+from src.services.record_table import RecordTable
+from src.services.search_index import InvertedIndex
+from src.utils.atomic import atomic_replace
+from src.utils.file_lock import FileLock
 from src.utils.logger import setup_logger
+from src.utils.metrics import metrics, timed
 
 logger = setup_logger("Storage")
 
-class ExcelStorage:
-    """Handles persistence of work records to an Excel file."""
+@dataclass
+class CacheStats:
+    """Counters describing how often the in-memory cache was used."""
+    hits: int = 0
+    reloads: int = 0
+    flushes: int = 0
+    merges: int = 0
+
+class ExcelStorage(StorageBackend):
+    """
+    Handles persistence of work records to an Excel file.
+    Records are streamed once with a read-only parse into a compact
+    columnar RecordTable and served from there; the file is only re-read when its mtime/size
+    changes on disk (e.g. edited in Excel). The full read/write workbook
+    is only opened when something is written.
+
+    Every mutation is first appended (and fsynced) to a JSONL journal next
+    to the workbook, so it is durable as soon as the call returns. The
+    workbook itself is rewritten from memory ("compacted") through a temp
+    file and an atomic rename, after which the journal is emptied; entries
+    left behind by a crash are replayed on the next load. With write_behind
+    enabled, compaction waits until flush_interval seconds pass without
+    further changes, or for an explicit flush()/close().
+
+    Several processes may share the workbook (another instance, a CLI
+    script). Journal appends, loads and compactions hold an advisory
+    FileLock, and the version (mtime/size) read at load time is compared
+    again before each compaction: if another process wrote in between, the
+    workbook is re-read and the journal, which holds every change not yet
+    in it, replayed on top, so changes to different records are merged
+    instead of clobbered. Changes to the same record resolve in journal
+    order (last writer wins).
+
+    Records are addressed by a persistent ID stored in the last column.
+    Deleted rows are blanked in place and only removed when the workbook
+    is flushed, so the ID -> row map stays valid across many mutations.
+    """
 
     FILE_NAME = "work_reports.xlsx"
-    SHEET_NAME = "WorkRecords"
-    HEADERS = ["Date", "Project", "Summary", "Details"]
+    SHEET_NAME = xlsx_io.SHEET_NAME
+    HEADERS = xlsx_io.HEADERS
 
-    def __init__(self, file_path: str = FILE_NAME):
+    def __init__(self, file_path: str = FILE_NAME, write_behind: bool = False, flush_interval: float = 2.0):
         self.file_path = Path(file_path)
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.stats = CacheStats()
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._batch_depth = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        self._loaded = False
+        self._workbook: Optional[openpyxl.Workbook] = None # read/write copy, only opened for mutations
+        self._sheet: Optional[Worksheet] = None
+        self._last_row = 0 # last used sheet row; Worksheet.max_row scans every cell
+        self._table = RecordTable() # record_id -> record and its 1-based sheet row
+        self._tombstones: List[int] = [] # rows blanked by delete, removed on flush
+        self._search_index: Optional[InvertedIndex] = None # built or loaded on first search
+        self._search_dirty = False
+        self._projects = ProjectIndex() # kept in step with _table, so suggestions never rescan
+        self._signature: Optional[tuple[int, int]] = None
+        self._journal = Journal(self.journal_path)
+        self._replaying = False
+        self._file_lock = FileLock(self.lock_path)
+        self._external_change = False # set when a reload picks up another process's writes
+        self._exit_hook = False # close() registered with atexit while a deferred flush may be pending
         self._ensure_file_exists()
 
+    @property
+    def search_index_path(self) -> Path:
+        """The search index is persisted next to the workbook, e.g. work_reports.search.json."""
+        return self.file_path.with_suffix(".search.json")
+
+    @property
+    def journal_path(self) -> Path:
+        """Mutations not yet compacted into the workbook, e.g. work_reports.journal.jsonl."""
+        return self.file_path.with_suffix(".journal.jsonl")
+
+    @property
+    def lock_path(self) -> Path:
+        """Advisory lock taken by every process writing the workbook, e.g. work_reports.lock."""
+        return self.file_path.with_suffix(".lock")
+
+    @staticmethod
+    def read_records(file_path: str) -> List[WorkRecord]:
+        """
+        Every record of a workbook with the entries of its journal that were
+        not yet compacted into it applied in memory, the way a load would
+        replay them. Nothing is written back, so imports and migrations see
+        the latest data while leaving the source files as they found them.
+        """
+        path = Path(file_path)
+        records: Dict[str, WorkRecord] = {}
+        on_error = lambda i, e: logger.error(f"Error parsing row {i} of {path}: {e}")
+        # Under the lock, so a compaction can't empty the journal between the two reads
+        with FileLock(path.with_suffix(".lock")):
+            for _, record in xlsx_io.iter_records(path, on_error):
+                if not record.record_id or record.record_id in records:
+                    record.record_id = new_record_id()
+                records[record.record_id] = record
+            for entry in Journal(path.with_suffix(".journal.jsonl")).entries():
+                if entry["op"] == "delete":
+                    records.pop(entry["id"], None)
+                    continue
+                record = WorkRecord.from_dict(entry["record"])
+                record.record_id = entry["id"]
+                records[entry["id"]] = record
+        return list(records.values())
+
     def _ensure_file_exists(self):
         """Creates the Excel file with headers if it doesn't exist."""
-        if not self.file_path.exists():
+        if self.file_path.exists():
+            return
+        with self._file_lock:
+            if self.file_path.exists(): # created by another process in the meantime
+                return
             workbook = openpyxl.Workbook()
             sheet = workbook.active
             sheet.title = self.SHEET_NAME
             sheet.append(self.HEADERS)
-            workbook.save(self.file_path)
+            with atomic_replace(self.file_path) as tmp_path:
+                workbook.save(tmp_path)
             logger.info(f"Created new storage file: {self.file_path}")
 
+    def _file_signature(self) -> Optional[tuple[int, int]]:
+        """Returns (mtime_ns, size) of the file, or None if it is missing."""
+        try:
+            stat = self.file_path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _ensure_loaded(self):
+        """Makes sure the record cache reflects the file, reloading it if the file changed on disk."""
+        # Unflushed changes in memory win over the file until they are written
+        if not self._loaded or (not self._dirty and self._file_signature() != self._signature):
+            self._load()
+        else:
+            self.stats.hits += 1
+
     def _get_workbook_sheet(self):
-        """Opens the workbook and returns the active sheet."""
+        """
+        Returns the workbook and sheet in read/write mode for mutations.
+        Reads never need it, so it is only parsed on the first write.
+        """
+        self._ensure_loaded()
+        if self._workbook is None:
+            with self._file_lock:
+                # Its rows must line up with the cache, so re-read if another process wrote in between
+                if self._file_signature() != self._signature:
+                    self._read_file()
+                if self._workbook is None:
+                    self._open_workbook()
+        return self._workbook, self._sheet
+
+    @timed(name="ExcelStorage.open_workbook")
+    def _open_workbook(self):
         workbook = openpyxl.load_workbook(self.file_path)
         if self.SHEET_NAME in workbook.sheetnames:
             sheet = workbook[self.SHEET_NAME]
         else:
             sheet = workbook.create_sheet(self.SHEET_NAME)
             sheet.append(self.HEADERS)
-        return workbook, sheet
-
-    def save_record(self, record: WorkRecord):
-        """Appends a new record to the Excel file."""
-        workbook, sheet = self._get_workbook_sheet()
-        
-        # Check if updating an existing record logic is needed?
-        # Requirement says "Edit existing record"
-        # To support edit, we need to identify records. 
-        # Since we don't have IDs, we might delete-then-insert or find-and-update.
-        # Given the requirements, I will implement a safe append for now 
-        # and handle "Edit" as "Delete + Add" or row replacement in the GUI logic 
-        # or add a specific update method here.
-        # Let's add an internal ID or just rely on row index for editing.
-        # Ideally, we should use row index for deletion/editing.
-        
-        row_data = [
-            record.date.isoformat(),
-            record.project_name,
-            record.summary,
-            record.details
-        ]
-        sheet.append(row_data)
-        workbook.save(self.file_path)
-        logger.info(f"Saved record: {record.summary}")
-
-    def get_records_by_date(self, target_date: date) -> List[tuple[int, WorkRecord]]:
+        id_column = len(self.HEADERS)
+        if sheet.cell(row=1, column=id_column).value != self.HEADERS[-1]:
+            sheet.cell(row=1, column=id_column, value=self.HEADERS[-1])
+        self._workbook = workbook
+        self._sheet = sheet
+        self._last_row = sheet.max_row
+        metrics.note(rows=self._last_row - 1, bytes=self._signature[1])
+
+    def preload(self):
+        """Parses the workbook and builds the indexes ahead of the first query."""
+        with self._lock:
+            self._ensure_loaded()
+
+    def _load(self):
         """
-        Retrieves records for a specific date.
-        Returns a list of tuples: (row_index, WorkRecord).
-        Row index is 1-based (openpyxl style).
-        """
-        workbook, sheet = self._get_workbook_sheet()
-        records = []
-        
-        # Iterate rows, skipping header
-        for i, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-            if not row or not row[0]: continue
-            
-            try:
-                record_date_str = str(row[0]).split("T")[0] # handle datetime objects or strings
-                if record_date_str == target_date.isoformat():
-                    record = WorkRecord(
-                        date=date.fromisoformat(record_date_str),
-                        project_name=str(row[1]) if row[1] else "",
-                        summary=str(row[2]) if row[2] else "",
-                        details=str(row[3]) if row[3] else ""
-                    )
-                    records.append((i, record))
-            except Exception as e:
-                logger.error(f"Error parsing row {i}: {e}")
+        Streams every record of the file into the cache (read-only parse)
+        and replays the journal, writing back whatever that changed.
+        """
+        with self._file_lock:
+            self._read_file()
+            if self._dirty:
+                self._save()
+
+    @timed(name="ExcelStorage.load")
+    def _read_file(self):
+        """
+        Rebuilds the cache from the workbook plus any journal entries not yet
+        compacted into it, without writing anything (the caller holds the file lock).
+        The read/write workbook from any previous load is dropped as stale.
+        """
+        self._ensure_file_exists()
+        reloaded = self._loaded
+        self._workbook = None
+        self._sheet = None
+        self._table.clear()
+        self._tombstones.clear()
+        self._search_index = None
+        self._search_dirty = False
+        self._projects = ProjectIndex()
+        self._dirty = False
+        signature = self._file_signature()
+        missing_ids = self._parse_rows()
+        self._signature = signature
+        metrics.note(rows=len(self._table), bytes=signature[1])
+        self._loaded = True
+        self.stats.reloads += 1
+        logger.debug("Loaded %d records from %s", len(self._table), self.file_path)
+
+        if missing_ids:
+            # Persist the IDs handed out to legacy rows so they stay stable across reloads
+            workbook, sheet = self._get_workbook_sheet()
+            id_column = len(self.HEADERS)
+            for row_index, record_id in missing_ids:
+                sheet.cell(row=row_index, column=id_column, value=record_id)
+            logger.info(f"Assigned IDs to {len(missing_ids)} records without one")
+            self._dirty = True
+        self._replay_journal()
+        if reloaded:
+            self._external_change = True
+
+    def _replay_journal(self):
+        """
+        Re-applies mutations journaled after the last compaction, e.g. when
+        the app crashed before writing the workbook. Saves and updates are
+        applied as upserts and deletes of unknown IDs are ignored, so
+        entries that did reach the workbook change nothing.
+        """
+        entries = list(self._journal.entries())
+        if not entries:
+            return
+        self._replaying = True
+        try:
+            for entry in entries:
+                record_id = entry["id"]
+                if entry["op"] == "delete":
+                    if record_id in self._table:
+                        self.delete_record(record_id)
+                    continue
+                record = WorkRecord.from_dict(entry["record"])
+                if record_id in self._table:
+                    self.update_record(record_id, record)
+                else:
+                    record.record_id = record_id
+                    self.save_record(record)
+        finally:
+            self._replaying = False
+        logger.info(f"Replayed {len(entries)} journal entries into {self.file_path}")
+        if not self._dirty:
+            self._journal.reset()
+
+    def _log(self, op: str, record_id: str, record: Optional[WorkRecord] = None):
+        """Journals a mutation before it is applied; inside a batch the fsync waits for the batch to end."""
+        if not self._replaying:
+            with self._file_lock:
+                self._journal.append(op, record_id, record, sync=not self._batch_depth)
+
+    def _parse_rows(self) -> List[tuple[int, str]]:
+        """
+        Parses every data row of the file into the cache.
+        Rows without an ID (or with a duplicate one) get a new ID.
+        Returns the (row_index, record_id) pairs that still need writing back.
+        """
+        missing_ids = []
+        on_error = lambda i, e: logger.error(f"Error parsing row {i}: {e}")
+
+        def rows() -> Iterable[tuple[WorkRecord, int]]:
+            for i, record in xlsx_io.iter_records(self.file_path, on_error, fallback_to_active=False):
+                if not record.record_id or record.record_id in self._table:
+                    record.record_id = new_record_id()
+                    missing_ids.append((i, record.record_id))
+                self._projects.add(record)
+                yield record, i
+
+        self._table.extend(rows())
+        return missing_ids
+
+    def _compact(self):
+        """Removes rows blanked by delete_record and shifts the ID -> row map."""
+        if not self._tombstones:
+            return
+        tombstones = sorted(self._tombstones)
+        # One pass shifting the surviving rows up; delete_rows() per tombstone
+        # would move every row below it each time
+        tombstone_set = set(tombstones)
+        columns = max(len(self.HEADERS), self._sheet.max_column) # keep any extra user columns aligned
+        target = tombstones[0]
+        for row in range(tombstones[0], self._last_row + 1):
+            if row in tombstone_set:
                 continue
-                
-        return records
-
-    def delete_record_by_row(self, row_index: int):
-        """Deletes a record specified by its Excel row index."""
-        workbook, sheet = self._get_workbook_sheet()
-        
-        # Openpyxl delete_rows is 1-based? Yes.
-        sheet.delete_rows(row_index)
-        workbook.save(self.file_path)
-        logger.info(f"Deleted record at row {row_index}")
-
-    def update_record_by_row(self, row_index: int, record: WorkRecord):
-        """Updates a record at a specific row."""
-        workbook, sheet = self._get_workbook_sheet()
-        
-        sheet.cell(row=row_index, column=1, value=record.date.isoformat())
-        sheet.cell(row=row_index, column=2, value=record.project_name)
-        sheet.cell(row=row_index, column=3, value=record.summary)
-        sheet.cell(row=row_index, column=4, value=record.details)
-        
-        workbook.save(self.file_path)
-        logger.info(f"Updated record at row {row_index}")
+            for column in range(1, columns + 1):
+                # Formatting moves with the value, as delete_rows() would have moved it
+                source = self._sheet.cell(row=row, column=column)
+                cell = self._sheet.cell(row=target, column=column)
+                cell.value = source.value
+                cell._style = copy(source._style) # font, fill, border, number format...
+                cell.hyperlink = copy(source.hyperlink)
+                cell.comment = source.comment
+            target += 1
+        self._sheet.delete_rows(target, self._last_row - target + 1)
+        self._table.shift_positions(tombstones)
+        self._last_row -= len(tombstones)
+        self._tombstones.clear()
+
+    def _save(self):
+        """Marks the workbook as changed and writes it now or schedules a deferred flush."""
+        self._dirty = True
+        if self._batch_depth or self._replaying:
+            return
+        if self.write_behind:
+            self._schedule_flush()
+        else:
+            self.flush()
+
+    def _schedule_flush(self):
+        """(Re)starts the debounce timer for a deferred flush."""
+        if not self._exit_hook:
+            # Last line of defence if the app exits without calling close()
+            atexit.register(self.close)
+            self._exit_hook = True
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def flush(self):
+        """Writes pending changes to disk in a single workbook save, merging changes made by other processes."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return
+            with self._file_lock:
+                self._write_workbook()
+
+    @timed(name="ExcelStorage.flush")
+    def _write_workbook(self):
+        """Compacts the workbook to disk and empties the journal (the caller holds both locks)."""
+        if self._file_signature() != self._signature or self._journal.changed_elsewhere():
+            # Someone else wrote since we loaded. Everything not yet in their workbook,
+            # our changes included, is in the journal, so re-reading both merges them.
+            self._read_file()
+            self.stats.merges += 1
+            logger.info(f"Merged changes made to {self.file_path} by another process")
+        if not self._dirty or self._workbook is None:
+            return
+        self._compact()
+        with atomic_replace(self.file_path) as tmp_path:
+            self._workbook.save(tmp_path)
+        self._signature = self._file_signature()
+        metrics.note(rows=len(self._table), bytes=self._signature[1])
+        self._journal.reset()
+        self._dirty = False
+        self.stats.flushes += 1
+        if self._search_index is not None and self._search_dirty:
+            self._save_search_index()
+        logger.debug("Flushed workbook to %s", self.file_path)
+
+    def close(self):
+        """
+        Flushes pending changes and releases the cache (and the temporary
+        file its details are spilled to). Call this before the application
+        exits; a later call reloads the file.
+        """
+        with self._lock:
+            if self._exit_hook:
+                # Otherwise atexit keeps every closed instance (e.g. one per partition year) alive
+                atexit.unregister(self.close)
+                self._exit_hook = False
+            self.flush()
+            self._journal.close()
+            self._table.close()
+            self._workbook = None
+            self._sheet = None
+            self._search_index = None
+            self._loaded = False
+
+    @property
+    def has_pending_writes(self) -> bool:
+        return self._dirty
+
+    def poll_external_changes(self) -> bool:
+        """
+        Returns True if records changed by another process were picked up
+        since the last call, reloading the workbook if it changed on disk.
+        """
+        with self._lock:
+            if self._loaded and not self._dirty and self._file_signature() != self._signature:
+                self._load()
+            changed, self._external_change = self._external_change, False
+            return changed
+
+    @contextmanager
+    def batch(self) -> Iterator["ExcelStorage"]:
+        """
+        Groups several mutations into one workbook save:
+
+            with storage.batch():
+                storage.save_record(a)
+                storage.save_record(b)
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._journal.sync()
+                    if self._dirty:
+                        self._save()
+
+    @timed()
+    def save_record(self, record: WorkRecord) -> str:
+        """Appends a new record to the Excel file. Returns its ID."""
+        with self._lock:
+            workbook, sheet = self._get_workbook_sheet()
+
+            if not record.record_id or record.record_id in self._table:
+                record.record_id = new_record_id()
+            self._log("save", record.record_id, record)
+            sheet.append(xlsx_io.record_to_row(record))
+            self._last_row += 1
+            self._table.append(record, self._last_row)
+            self._projects.add(record)
+            self._index_for_search(record.record_id, record)
+            self._save()
+        logger.debug("Saved record: %s", record.summary)
+        return record.record_id
+
+    @timed()
+    def get_record(self, record_id: str) -> Optional[WorkRecord]:
+        """Returns the record with the given ID, or None."""
+        with self._lock:
+            self._ensure_loaded()
+            return self._table.get(record_id)
+
+    @timed()
+    def get_records_by_date(self, target_date: date) -> List[tuple[str, WorkRecord]]:
+        """
+        Retrieves records for a specific date.
+        Returns a list of tuples: (record_id, WorkRecord).
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return self._table.items_in_range(target_date, target_date)
+
+    @timed()
+    def get_records_in_range(self, start: date, end: date) -> List[tuple[str, WorkRecord]]:
+        """
+        Retrieves records between start and end (both inclusive), ordered by date.
+        Returns a list of tuples: (record_id, WorkRecord).
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return self._table.items_in_range(start, end)
+
+    @timed(rows=None)
+    def count_records_by_month(self, year: int, month: int) -> int:
+        """Counts the records of a calendar month."""
+        last_day = calendar.monthrange(year, month)[1]
+        with self._lock:
+            self._ensure_loaded()
+            return self._table.count_in_range(date(year, month, 1), date(year, month, last_day))
+
+    @timed()
+    def month_summary(self, year: int, month: int) -> Dict[int, int]:
+        """Returns {day_of_month: record_count} straight from the date index."""
+        last_day = calendar.monthrange(year, month)[1]
+        with self._lock:
+            self._ensure_loaded()
+            counts = self._table.counts_in_range(date(year, month, 1), date(year, month, last_day))
+        return {day.day: count for day, count in counts.items()}
+
+    def _get_search_index(self) -> InvertedIndex:
+        """Returns the search index, loading the persisted copy or building it on first use."""
+        if self._search_index is None:
+            if not self._dirty:
+                self._search_index = InvertedIndex.load(self.search_index_path, self._signature)
+            if self._search_index is None:
+                self._search_index = InvertedIndex.build(self._table.items())
+                logger.info(f"Built search index for {len(self._table)} records")
+                self._search_dirty = True
+                if not self._dirty:
+                    self._save_search_index()
+        return self._search_index
+
+    def _save_search_index(self):
+        try:
+            self._search_index.save(self.search_index_path, self._signature)
+            self._search_dirty = False
+        except OSError as e:
+            # Only a cache; it will be rebuilt next time
+            logger.warning(f"Failed to save search index: {e}")
+
+    def _index_for_search(self, record_id: str, record: Optional[WorkRecord]):
+        """Keeps the search index (if it has been built) in step with a mutation."""
+        if self._search_index is None:
+            return
+        if record is None:
+            self._search_index.remove(record_id)
+        else:
+            self._search_index.add(record_id, record)
+        self._search_dirty = True
+
+    @timed()
+    def search(self, query: str, start: Optional[date] = None, end: Optional[date] = None,
+               project: Optional[str] = None) -> List[tuple[str, WorkRecord]]:
+        """Full-text search over project, summary and details, newest first."""
+        with self._lock:
+            self._ensure_loaded()
+            results = []
+            for record_id in self._get_search_index().search(query):
+                record = self._table.get(record_id)
+                if start is not None and record.date < start:
+                    continue
+                if end is not None and record.date > end:
+                    continue
+                if project is not None and record.project_name != project:
+                    continue
+                results.append((record_id, record))
+        results.sort(key=lambda item: item[1].date, reverse=True)
+        return results
+
+    def project_usages(self) -> List[ProjectUsage]:
+        with self._lock:
+            self._ensure_loaded()
+            return self._projects.usages()
+
+    @timed()
+    def suggest_projects(self, query: str = "", limit: int = 10) -> List[ProjectUsage]:
+        """Project names for autocomplete from the in-memory ProjectIndex; see StorageBackend."""
+        with self._lock:
+            self._ensure_loaded()
+            return self._projects.lookup(query, limit)
+
+    @timed()
+    def delete_record(self, record_id: str):
+        """Deletes the record with the given ID."""
+        with self._lock:
+            workbook, sheet = self._get_workbook_sheet()
+            # Blank the row instead of shifting everything below it; _compact() removes it on flush
+            if record_id not in self._table:
+                raise KeyError(record_id)
+            self._log("delete", record_id)
+            self._projects.remove(self._table.get(record_id))
+            row_index = self._table.remove(record_id)
+            for column in range(1, len(self.HEADERS) + 1):
+                sheet.cell(row=row_index, column=column, value=None)
+            self._tombstones.append(row_index)
+            self._index_for_search(record_id, None)
+            self._save()
+        logger.debug("Deleted record %s", record_id)
+
+    @timed()
+    def update_record(self, record_id: str, record: WorkRecord):
+        """Updates the record with the given ID in place."""
+        with self._lock:
+            workbook, sheet = self._get_workbook_sheet()
+            row_index = self._table.position(record_id) # KeyError if missing
+
+            record.record_id = record_id
+            self._log("update", record_id, record)
+            self._projects.remove(self._table.get(record_id))
+            self._projects.add(record)
+            for column, value in enumerate(xlsx_io.record_to_row(record), start=1):
+                sheet.cell(row=row_index, column=column, value=value)
+            self._table.update(record_id, record)
+            self._index_for_search(record_id, record)
+            self._save()
+        logger.debug("Updated record %s", record_id)
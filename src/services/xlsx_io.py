@@ -0,0 +1,243 @@
+import zipfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from xml.etree import ElementTree
+from typing import Iterable, Iterator, List, Optional
+import openpyxl
+from src.models.record import WorkRecord
+
+SHEET_NAME = "WorkRecords"
+# ID is the last column so workbooks written before it existed still line up
+HEADERS = ["Date", "Project", "Summary", "Details", "ID"]
+
+def _parse_date(value) -> date:
+    """Accepts ISO strings, date/datetime objects and raw Excel serial numbers."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # A date cell that was retyped in Excel and read without its number format
+        return _EXCEL_EPOCH + timedelta(days=int(value))
+    return date.fromisoformat(str(value).split("T")[0].split(" ")[0])
+
+def parse_row(row: tuple) -> Optional[WorkRecord]:
+    """
+    Converts a sheet row (values only) into a WorkRecord.
+    Returns None for empty rows; raises ValueError for malformed dates.
+    """
+    if not row or not row[0]:
+        return None
+    return WorkRecord(
+        date=_parse_date(row[0]),
+        project_name=str(row[1]) if len(row) > 1 and row[1] else "",
+        summary=str(row[2]) if len(row) > 2 and row[2] else "",
+        details=str(row[3]) if len(row) > 3 and row[3] else "",
+        record_id=str(row[4]) if len(row) > 4 and row[4] else ""
+    )
+
+def record_to_row(record: WorkRecord) -> list:
+    """Converts a WorkRecord into a sheet row."""
+    return [
+        record.date.isoformat(),
+        record.project_name,
+        record.summary,
+        record.details,
+        record.record_id
+    ]
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_EXCEL_EPOCH = date(1899, 12, 30)
+
+def _column_index(cell_ref: str) -> int:
+    """Converts the letters of a cell reference ("C12") to a 0-based column index."""
+    index = 0
+    for ch in cell_ref:
+        if not ch.isalpha():
+            break
+        index = index * 26 + (ord(ch.upper()) - 64)
+    return index - 1
+
+def _find_sheet_part(archive: zipfile.ZipFile, sheet_name: Optional[str]) -> Optional[str]:
+    """Resolves a sheet name (or the first sheet when None) to its XML part inside the zip."""
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    sheets = workbook.findall(f"{_NS}sheets/{_NS}sheet")
+    if sheet_name is not None:
+        sheets = [sheet for sheet in sheets if sheet.get("name") == sheet_name]
+    if not sheets:
+        return None
+    rel_id = sheets[0].get(f"{_REL_NS}id")
+    rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels.iter(f"{_PKG_REL_NS}Relationship"):
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            return target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+    return None
+
+def _string_text(element) -> str:
+    """
+    Text of a shared (<si>) or inline (<is>) string: its own <t>, or the <t>
+    of each rich-text run. Phonetic runs (<rPh>, furigana/pinyin) are skipped.
+    """
+    parts = []
+    for child in element:
+        if child.tag == f"{_NS}t":
+            parts.append(child.text or "")
+        elif child.tag == f"{_NS}r":
+            text = child.find(f"{_NS}t")
+            if text is not None:
+                parts.append(text.text or "")
+    return "".join(parts)
+
+def _read_shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    try:
+        stream = archive.open("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+    strings = []
+    root = None
+    with stream:
+        for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = element
+            elif element.tag == f"{_NS}si":
+                strings.append(_string_text(element))
+                root.remove(element)
+    return strings
+
+def _cell_value(cell, shared_strings: List[str]):
+    cell_type = cell.get("t")
+    if cell_type == "inlineStr":
+        inline = cell.find(f"{_NS}is")
+        return _string_text(inline) if inline is not None else ""
+    value = cell.find(f"{_NS}v")
+    if value is None or value.text is None:
+        return None
+    text = value.text
+    if cell_type == "s":
+        return shared_strings[int(text)]
+    if cell_type in ("str", "d"):
+        return text
+    if cell_type == "b":
+        return text == "1"
+    if cell_type == "e":
+        return None
+    number = float(text)
+    return int(number) if number.is_integer() else number
+
+def _iter_rows_xml(path: Path, sheet_name: Optional[str]) -> Iterator[tuple[int, tuple]]:
+    """
+    Parses the sheet XML directly with iterparse, detaching each row from
+    <sheetData> after use so the parsed tree doesn't grow with the sheet.
+    Only the shared-string table (unique strings) is held in memory.
+    """
+    with zipfile.ZipFile(path) as archive:
+        part = _find_sheet_part(archive, sheet_name)
+        if part is None:
+            return
+        shared_strings = _read_shared_strings(archive)
+        expected = 1
+        sheet_data = None
+        with archive.open(part) as stream:
+            for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+                if event == "start":
+                    if element.tag == f"{_NS}sheetData":
+                        sheet_data = element
+                    continue
+                if element.tag != f"{_NS}row":
+                    continue
+                row_index = int(element.get("r", expected))
+                values: list = []
+                for cell in element.iter(f"{_NS}c"):
+                    ref = cell.get("r")
+                    column = _column_index(ref) if ref else len(values)
+                    if column >= len(values):
+                        values.extend([None] * (column - len(values) + 1))
+                    values[column] = _cell_value(cell, shared_strings)
+                sheet_data.remove(element)
+                # Rows missing from the XML are empty; keep indexes aligned with the sheet
+                for gap in range(expected, row_index):
+                    if gap > 1:
+                        yield gap, ()
+                if row_index > 1:
+                    yield row_index, tuple(values)
+                expected = row_index + 1
+
+def _iter_rows_openpyxl(path: Path, fallback_to_active: bool) -> Iterator[tuple[int, tuple]]:
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    try:
+        if SHEET_NAME in workbook.sheetnames:
+            sheet = workbook[SHEET_NAME]
+        elif fallback_to_active:
+            sheet = workbook.active
+        else:
+            return
+        # Skip the header row
+        yield from enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2)
+    finally:
+        workbook.close()
+
+def iter_rows(file_path: str, fallback_to_active: bool = True, engine: str = "xml") -> Iterator[tuple[int, tuple]]:
+    """
+    Streams (row_index, values) for every data row of the records sheet,
+    without building the cell objects of a full openpyxl load, so memory
+    stays flat regardless of the number of rows.
+
+    engine="xml" parses the sheet XML inside the zip directly (fastest);
+    engine="openpyxl" uses openpyxl's read-only mode, and is also used when
+    the XML layout can't be resolved. If the workbook has no records sheet,
+    the first sheet is read instead, or nothing when fallback_to_active is False.
+    """
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(path)
+
+    if engine == "xml":
+        try:
+            with zipfile.ZipFile(path) as archive:
+                has_sheet = _find_sheet_part(archive, SHEET_NAME) is not None
+        except (KeyError, zipfile.BadZipFile, ElementTree.ParseError):
+            pass # unusual layout; let openpyxl deal with it
+        else:
+            if has_sheet:
+                yield from _iter_rows_xml(path, SHEET_NAME)
+            elif fallback_to_active:
+                yield from _iter_rows_xml(path, None)
+            return
+
+    yield from _iter_rows_openpyxl(path, fallback_to_active)
+
+def iter_records(file_path: str, on_error=None, fallback_to_active: bool = True,
+                 engine: str = "xml") -> Iterator[tuple[int, WorkRecord]]:
+    """
+    Streams (row_index, WorkRecord) from a work report workbook.
+    Malformed rows are skipped; on_error(row_index, exception) is called for each.
+    """
+    for i, row in iter_rows(file_path, fallback_to_active, engine):
+        try:
+            record = parse_row(row)
+        except Exception as e:
+            if on_error is not None:
+                on_error(i, e)
+            continue
+        if record is not None:
+            yield i, record
+
+def read_records(file_path: str) -> List[WorkRecord]:
+    """Reads every record from an exported/legacy work report workbook."""
+    return [record for _, record in iter_records(file_path)]
+
+def write_records(records: Iterable[WorkRecord], file_path: str) -> int:
+    """Writes records to a new workbook in the standard layout. Returns the row count."""
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(SHEET_NAME)
+    sheet.append(HEADERS)
+    count = 0
+    for record in records:
+        sheet.append(record_to_row(record))
+        count += 1
+    workbook.save(file_path)
+    return count
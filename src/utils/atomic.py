@@ -0,0 +1,37 @@
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+def fsync_dir(directory: Path):
+    """Makes a rename inside directory durable. Not supported (or needed) on Windows."""
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+@contextmanager
+def atomic_replace(path: Path) -> Iterator[Path]:
+    """
+    Yields a temporary path next to path to write the new content to.
+    When the block succeeds the temporary file is fsynced and renamed over
+    path, so readers (and a crash at any point) see either the old or the
+    new file, never a half-written one. On error it is removed instead.
+
+        with atomic_replace(Path("data.xlsx")) as tmp:
+            workbook.save(tmp)
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        yield tmp_path
+        with open(tmp_path, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    fsync_dir(path.parent)
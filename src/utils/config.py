@@ -0,0 +1,50 @@
+import json
+import os
+from dataclasses import dataclass, fields
+from pathlib import Path
+from src.utils.logger import setup_logger
+
+logger = setup_logger("Config")
+
+CONFIG_FILE = "config.json"
+
+@dataclass
+class AppConfig:
+    """Application settings, read from config.json next to the data files."""
+    backend: str = "excel" # "excel", "sqlite" or "partitioned"
+    excel_path: str = "work_reports.xlsx"
+    sqlite_path: str = "work_reports.db"
+    partition_dir: str = "work_reports" # one workbook per year, for the "partitioned" backend
+    write_behind: bool = True
+    flush_interval: float = 2.0
+    metrics: bool = False # log operation timings to metrics.jsonl
+    log_level: str = "INFO" # DEBUG, INFO, WARNING or ERROR
+
+def load_config(path: str = CONFIG_FILE) -> AppConfig:
+    """
+    Loads settings from a JSON file, falling back to defaults.
+    The WEEKLY_REPORT_BACKEND and WEEKLY_REPORT_LOG_LEVEL environment
+    variables override the backend and the log level.
+    """
+    config = AppConfig()
+    config_path = Path(path)
+    if config_path.exists():
+        try:
+            data = json.loads(config_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to read {config_path}, using defaults: {e}")
+            data = {}
+        known = {f.name for f in fields(AppConfig)}
+        for key, value in data.items():
+            if key in known:
+                setattr(config, key, value)
+            else:
+                logger.warning(f"Ignoring unknown config key: {key}")
+
+    backend = os.environ.get("WEEKLY_REPORT_BACKEND")
+    if backend:
+        config.backend = backend
+    log_level = os.environ.get("WEEKLY_REPORT_LOG_LEVEL")
+    if log_level:
+        config.log_level = log_level
+    return config
@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+class FileLock:
+    """
+    Advisory exclusive lock shared by every process that opens the same
+    lock file, e.g. two app instances or the app and a CLI script using
+    one workbook on a shared drive. It only protects against writers that
+    also take it.
+
+    Reentrant within a process, so nested storage calls don't deadlock:
+
+        lock = FileLock(Path("work_reports.lock"))
+        with lock:
+            ...
+    """
+
+    def __init__(self, path: Path, timeout: float = 10.0, poll_interval: float = 0.05):
+        self.path = Path(path)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file: Optional[BinaryIO] = None
+
+    def acquire(self):
+        """Blocks until the lock is held. Raises TimeoutError after timeout seconds."""
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._acquire_os_lock()
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            self._release_os_lock()
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def _acquire_os_lock(self):
+        # The lock file is left in place; deleting it would race with the next locker
+        self._file = open(self.path, "a+b")
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                if os.name == "nt":
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except OSError:
+                if time.monotonic() >= deadline:
+                    self._file.close()
+                    self._file = None
+                    raise TimeoutError(f"Timed out waiting for {self.path}; is another instance writing?")
+                time.sleep(self.poll_interval)
+
+    def _release_os_lock(self):
+        try:
+            if os.name == "nt":
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
@@ -1,25 +1,143 @@
+import atexit
+import copy
+import gzip
 import logging
+import os
+import queue
+import shutil
 import sys
-from pathlib import Path
+from datetime import date
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional, Union
 
-def setup_logger(name: str = "WeeklyReport") -> logging.Logger:
-    """Configures and returns a logger instance."""
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
+LOG_FILE = "app_log.txt"
+STDERR_FILE = "app_stderr.txt"
+LEVEL_ENV = "WEEKLY_REPORT_LOG_LEVEL"
+FILE_ENV = "WEEKLY_REPORT_LOG_FILE"
+DEFAULT_LEVEL = "INFO"
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 5
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+class CompressingRotatingFileHandler(RotatingFileHandler):
+    """
+    Rolls the log over when it would grow past max_bytes or, with daily
+    set, on the first record of a new day (also across restarts, going by
+    the file's mtime). Rotated files are gzipped: app_log.txt.1.gz, ...
+    """
+
+    def __init__(self, filename: str, max_bytes: int = MAX_BYTES, backup_count: int = BACKUP_COUNT,
+                 daily: bool = True):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        self.daily = daily
+        self.namer = lambda name: name + ".gz"
+        self.rotator = self._compress
+        try:
+            self._day = date.fromtimestamp(os.path.getmtime(self.baseFilename))
+        except OSError:
+            self._day = date.today()
+
+    @staticmethod
+    def _compress(source: str, dest: str):
+        with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.daily and date.today() != self._day:
+            self._day = date.today()
+            return os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0
+        return bool(super().shouldRollover(record))
+
+class _SnapshotQueueHandler(QueueHandler):
+    """
+    Only merges the message arguments (they may be mutated later) on the
+    calling thread; timestamps, layout and tracebacks are formatted by the
+    writer thread. The queue never leaves the process, so nothing needs
+    to be picklable.
+    """
 
-    if not logger.handlers:
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_queue_handler = _SnapshotQueueHandler(_queue)
+_listener: Optional[QueueListener] = None
+_loggers: Dict[str, logging.Logger] = {}
 
-        # File Handler
+def _parse_level(level: Union[str, int]) -> int:
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(level.upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Unknown log level '{level}'")
+    return value
+
+try:
+    _level = _parse_level(os.environ.get(LEVEL_ENV, DEFAULT_LEVEL))
+except ValueError:
+    _level = _parse_level(DEFAULT_LEVEL)
+_path = os.environ.get(FILE_ENV, LOG_FILE)
+
+def configure_logging(level: Union[str, int, None] = None, path: Optional[str] = None,
+                      max_bytes: int = MAX_BYTES, backup_count: int = BACKUP_COUNT, daily: bool = True):
+    """
+    (Re)starts the background log writer and applies level to every logger.
+    Records are put on a queue by the logging call and written, rotated
+    and compressed by a QueueListener thread, so callers never block on
+    file I/O. Messages below level are dropped before any formatting.
+    Like level, path=None keeps the current file (initially $WEEKLY_REPORT_LOG_FILE
+    or app_log.txt in the working directory); an empty path turns file logging off.
+    """
+    global _listener, _level, _path
+    if level is not None:
+        _level = _parse_level(level)
+    if path is not None:
+        _path = path
+    for logger in _loggers.values():
+        logger.setLevel(_level)
+
+    shutdown_logging()
+    handler: logging.Handler = logging.NullHandler()
+    if _path:
         try:
-            file_handler = logging.FileHandler("app_log.txt", encoding="utf-8")
-            file_handler.setLevel(logging.DEBUG)
-            file_formatter = logging.Formatter(
-                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-            )
-            file_handler.setFormatter(file_formatter)
-            logger.addHandler(file_handler)
+            handler = CompressingRotatingFileHandler(_path, max_bytes, backup_count, daily)
         except Exception as e:
             print(f"Failed to setup file logging: {e}")
+    handler.setFormatter(logging.Formatter(FORMAT))
+    _listener = QueueListener(_queue, handler)
+    _listener.start()
+
+def shutdown_logging():
+    """Writes out queued records and stops the writer thread. Runs at exit."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+atexit.register(shutdown_logging)
 
+def setup_logger(name: str = "WeeklyReport") -> logging.Logger:
+    """Configures and returns a logger instance."""
+    logger = logging.getLogger(name)
+    if name not in _loggers:
+        if _listener is None:
+            configure_logging()
+        logger.setLevel(_level)
+        logger.addHandler(_queue_handler)
+        _loggers[name] = logger
     return logger
+
+def redirect_stderr(path: str = STDERR_FILE):
+    """
+    Points the process-level stderr (C libraries, Tk) at its own file.
+    It is kept apart from the log, which is rotated under the writer's feet.
+    """
+    log_file = open(path, "a")
+    os.dup2(log_file.fileno(), sys.stderr.fileno())
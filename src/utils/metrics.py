@@ -0,0 +1,202 @@
+import atexit
+import functools
+import json
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+
+METRICS_FILE = "metrics.jsonl"
+PERCENTILES = (50, 90, 99)
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    rank = max(1, round(pct / 100 * len(sorted_samples)))
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+class Metrics:
+    """
+    Timing log for storage operations and GUI refreshes, written as JSON
+    lines so a slow click on a user's machine can be diagnosed from the
+    file alone:
+
+        {"ts": "...", "event": "timing", "name": "ExcelStorage.get_records_by_date",
+         "ms": 1.93, "thread": "io-read_0", "rows": 12}
+
+    Every summary_interval seconds (and on disable/exit) a "summary" line
+    per name gives the count and p50/p90/p99/max since the previous one.
+
+    Disabled instances do nothing beyond one attribute check, so call
+    sites don't need to check; enable()/disable() switch it at runtime.
+    Lines are queued and written by a background thread, so timing a UI
+    callback never adds file I/O to the latency being measured.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.path: Optional[Path] = None
+        self.summary_interval = 60.0
+        self._lock = threading.Lock()
+        self._file: Optional[TextIO] = None
+        self._queue: "queue.SimpleQueue[Optional[dict]]" = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        self._samples: Dict[str, List[float]] = {} # name -> durations since the last summary
+        self._last_summary = 0.0
+        self._local = threading.local() # stack of the fields of in-progress measurements
+        atexit.register(self.disable)
+
+    def enable(self, path: str = METRICS_FILE, summary_interval: float = 60.0):
+        """Starts appending timings to path."""
+        with self._lock:
+            self._stop_writer()
+            self.path = Path(path)
+            self.summary_interval = summary_interval
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._queue = queue.SimpleQueue()
+            self._writer = threading.Thread(target=self._drain, args=(self._queue, self._file),
+                                            name="metrics-writer", daemon=True)
+            self._writer.start()
+            self._last_summary = time.monotonic()
+            self.enabled = True
+
+    def disable(self):
+        """Writes a final summary and stops recording."""
+        with self._lock:
+            if not self.enabled:
+                return
+            self.enabled = False
+            self._write_summaries()
+            self._stop_writer()
+
+    def toggle(self, path: str = METRICS_FILE) -> bool:
+        """Switches recording on or off. Returns the new state."""
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable(path, self.summary_interval)
+        return self.enabled
+
+    def record(self, name: str, seconds: float, **fields: Any):
+        """Logs one timed operation, plus any extra fields such as rows or bytes."""
+        if not self.enabled:
+            return
+        entry = {"ts": datetime.now().isoformat(timespec="milliseconds"), "event": "timing", "name": name,
+                 "ms": round(seconds * 1000, 3), "thread": threading.current_thread().name}
+        entry.update(fields)
+        with self._lock:
+            if self._file is None:
+                return
+            self._write(entry)
+            self._samples.setdefault(name, []).append(seconds)
+            if time.monotonic() - self._last_summary >= self.summary_interval:
+                self._write_summaries()
+
+    @contextmanager
+    def measure(self, name: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Times a block. Fields set on the yielded dict, or via note() from
+        code running inside the block, end up in the logged line:
+
+            with metrics.measure("xlsx.save") as fields:
+                fields["bytes"] = path.stat().st_size
+        """
+        if not self.enabled:
+            yield fields
+            return
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(fields)
+        start = time.perf_counter()
+        try:
+            yield fields
+        except BaseException as e:
+            fields["error"] = type(e).__name__
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            self.record(name, elapsed, **fields)
+
+    def note(self, **fields: Any):
+        """Adds fields (e.g. rows=, bytes=) to the innermost measurement running on this thread."""
+        if self.enabled:
+            stack = getattr(self._local, "stack", None)
+            if stack:
+                stack[-1].update(fields)
+
+    def summarize(self):
+        """Writes the percentile summaries now instead of waiting for the interval."""
+        with self._lock:
+            if self._file is not None:
+                self._write_summaries()
+
+    def _write_summaries(self):
+        now = datetime.now().isoformat(timespec="milliseconds")
+        for name, samples in sorted(self._samples.items()):
+            ordered = sorted(samples)
+            entry = {"ts": now, "event": "summary", "name": name, "count": len(ordered)}
+            for pct in PERCENTILES:
+                entry[f"p{pct}_ms"] = round(percentile(ordered, pct) * 1000, 3)
+            entry["max_ms"] = round(ordered[-1] * 1000, 3)
+            self._write(entry)
+        self._samples.clear()
+        self._last_summary = time.monotonic()
+
+    def _write(self, entry: dict):
+        self._queue.put(entry)
+
+    def _stop_writer(self):
+        """Lets the writer thread drain the queue, then closes the file (caller holds _lock)."""
+        if self._file is None:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._file.close()
+        self._file = None
+        self._writer = None
+
+    @staticmethod
+    def _drain(entries: "queue.SimpleQueue[Optional[dict]]", file: TextIO):
+        """Writer thread: writes whatever is queued, flushing once per batch, until a None arrives."""
+        while True:
+            lines = []
+            entry = entries.get()
+            while entry is not None:
+                lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+                try:
+                    entry = entries.get_nowait()
+                except queue.Empty:
+                    break
+            file.write("".join(lines))
+            file.flush()
+            if entry is None:
+                return
+
+metrics = Metrics()
+
+def timed(name: Optional[str] = None, rows: Optional[Callable[[Any], int]] = len) -> Callable:
+    """
+    Decorator logging every call of a function to metrics, named after its
+    qualified name (e.g. ExcelStorage.save_record) unless name is given.
+    rows(result) is logged as the row count; the default len is skipped
+    for results without a length.
+    """
+    def decorator(fn: Callable) -> Callable:
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return fn(*args, **kwargs)
+            with metrics.measure(label) as fields:
+                result = fn(*args, **kwargs)
+                if rows is not None and "rows" not in fields:
+                    try:
+                        fields["rows"] = rows(result)
+                    except TypeError:
+                        pass
+            return result
+        return wrapper
+    return decorator
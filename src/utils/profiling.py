@@ -0,0 +1,94 @@
+import builtins
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+class StartupProfiler:
+    """
+    Collects phase and import timings during startup.
+    Disabled instances do nothing, so call sites don't need to check.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._start = time.perf_counter()
+        self.phases: List[tuple[str, float]] = [] # (phase, duration in seconds)
+        self.marks: List[tuple[str, float]] = [] # (event, seconds since start)
+        self.imports: Dict[str, float] = {} # top-level module -> cumulative import time
+        self._local = threading.local() # import nesting depth, per thread
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Times a block of startup work."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def mark(self, name: str):
+        """Records a point in time relative to process start (e.g. first paint)."""
+        if self.enabled:
+            self.marks.append((name, time.perf_counter() - self._start))
+
+    @contextmanager
+    def track_imports(self) -> Iterator[None]:
+        """
+        Attributes time spent importing new modules to the outermost import
+        statement that triggered them, e.g. 'customtkinter' includes tkinter.
+        The patched __import__ is process-wide, but only imports made by the
+        thread that entered the block are timed; the storage opening on the
+        I/O thread imports at the same time and would skew the numbers.
+        """
+        if not self.enabled:
+            yield
+            return
+        original_import = builtins.__import__
+        tracked_thread = threading.get_ident()
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if threading.get_ident() != tracked_thread:
+                return original_import(name, globals, locals, fromlist, level)
+            depth = getattr(self._local, "depth", 0)
+            timed = not (depth or level or name in sys.modules)
+            self._local.depth = depth + 1
+            start = time.perf_counter()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                self._local.depth = depth
+                if timed:
+                    self.imports[name] = self.imports.get(name, 0.0) + time.perf_counter() - start
+
+        builtins.__import__ = timed_import
+        try:
+            yield
+        finally:
+            builtins.__import__ = original_import
+
+    def report(self) -> str:
+        """Formats the collected timings as a human-readable breakdown."""
+        lines = ["Startup profile:"]
+        if self.imports:
+            lines.append("  Imports:")
+            for name, seconds in sorted(self.imports.items(), key=lambda item: item[1], reverse=True):
+                lines.append(f"    {name:<40} {seconds * 1000:8.1f} ms")
+        if self.phases:
+            lines.append("  Phases:")
+            for name, seconds in self.phases:
+                lines.append(f"    {name:<40} {seconds * 1000:8.1f} ms")
+        if self.marks:
+            lines.append("  Milestones (since start):")
+            for name, seconds in self.marks:
+                lines.append(f"    {name:<40} {seconds * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+    def log(self, logger: logging.Logger):
+        if self.enabled:
+            logger.info(self.report())
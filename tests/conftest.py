@@ -0,0 +1,9 @@
+import pytest
+from src.utils.logger import configure_logging, shutdown_logging
+
+@pytest.fixture(autouse=True, scope="session")
+def _log_to_tmp(tmp_path_factory):
+    """Keeps the app log of the test run out of the working directory."""
+    configure_logging(path=str(tmp_path_factory.mktemp("logs") / "app_log.txt"))
+    yield
+    shutdown_logging()
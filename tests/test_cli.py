@@ -0,0 +1,65 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from src.cli import main
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+def _run(tmp_path, *argv) -> int:
+    return main(["--config", str(tmp_path / "config.json"), *argv])
+
+def test_cli_import_export_query(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("WEEKLY_REPORT_BACKEND", raising=False)
+    (tmp_path / "config.json").write_text('{"excel_path": "store.xlsx", "sqlite_path": "store.db"}')
+    (tmp_path / "in.csv").write_text(
+        "date,project,summary,details\n"
+        "2024-03-04,Alpha,Kickoff,Agenda\n"
+        "2024-03-05,Beta,Review,\n"
+        "not-a-date,Beta,Broken,\n",
+        encoding="utf-8"
+    )
+
+    assert _run(tmp_path, "import", "in.csv") == 0
+    out, err = capsys.readouterr()
+    assert "Imported 2 records" in out and "records/s" in out
+    assert "Skipped 1 malformed rows" in err
+
+    assert _run(tmp_path, "query", "--project", "Beta", "--format", "jsonl") == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [row["Summary"] for row in rows] == ["Review"]
+
+    assert _run(tmp_path, "export", "out.jsonl", "--from", "2024-03-05") == 0
+    capsys.readouterr()
+    exported = (tmp_path / "out.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(exported) == 1 and json.loads(exported[0])["Project"] == "Beta"
+
+    # Into the SQLite backend (which also migrates the Excel history on first open)
+    assert _run(tmp_path, "--backend", "sqlite", "import", "out.jsonl") == 0
+    assert _run(tmp_path, "--backend", "sqlite", "query", "--search", "review", "--format", "csv") == 0
+    out = capsys.readouterr().out
+    assert json.loads(exported[0])["ID"] in out
+
+    assert _run(tmp_path, "stats") == 0
+    out = capsys.readouterr().out
+    assert "Records: 2" in out and out.splitlines()[-1].split() == ["2024-03", "2"]
+
+    assert _run(tmp_path, "import", "in.txt") == 1
+
+def test_cli_does_not_import_gui():
+    code = "import sys, src.cli; sys.exit('customtkinter' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT).returncode == 0
+
+def test_cli_archive(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("WEEKLY_REPORT_BACKEND", raising=False)
+    (tmp_path / "config.json").write_text('{"partition_dir": "parts"}')
+    (tmp_path / "in.jsonl").write_text('{"date": "2020-02-03", "project": "P", "summary": "Old"}\n')
+
+    assert _run(tmp_path, "archive", "2020") == 2
+    assert "partitioned backend" in capsys.readouterr().err
+    assert _run(tmp_path, "--backend", "partitioned", "import", "in.jsonl") == 0
+    assert _run(tmp_path, "--backend", "partitioned", "archive", "2020") == 0
+    assert "Archived 1 records of 2020" in capsys.readouterr().out
+    assert (tmp_path / "parts" / "2020.jsonl.gz").exists()
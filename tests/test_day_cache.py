@@ -0,0 +1,55 @@
+from datetime import date
+from src.models.record import WorkRecord
+from src.services.day_cache import DayCache, week_of
+
+def _items(*days):
+    return [(f"id-{i}", WorkRecord(day, "P", f"s{i}", "")) for i, day in enumerate(days)]
+
+def test_store_range_caches_every_day_and_counts_hits():
+    cache = DayCache()
+    records = _items(date(2024, 5, 6), date(2024, 5, 6), date(2024, 5, 8))
+    assert cache.store_range(*week_of(date(2024, 5, 8)), records, cache.token()) == 7
+
+    assert [r.summary for _, r in cache.get(date(2024, 5, 6))] == ["s0", "s1"]
+    assert cache.get(date(2024, 5, 12)) == [] # empty days are cached too
+    assert cache.get(date(2024, 5, 13)) is None
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.prefetched) == (2, 1, 7)
+    assert cache.stats.hit_rate == 2 / 3
+    assert cache.missing(date(2024, 5, 11), date(2024, 5, 14)) == [date(2024, 5, 13), date(2024, 5, 14)]
+
+def test_lru_evicts_least_recently_used_day():
+    cache = DayCache(capacity=3)
+    cache.store_range(date(2024, 1, 1), date(2024, 1, 3), [], cache.token())
+    cache.get(date(2024, 1, 1))
+    cache.store_range(date(2024, 1, 4), date(2024, 1, 4), [], cache.token())
+    assert date(2024, 1, 2) not in cache
+    assert date(2024, 1, 1) in cache and len(cache) == 3
+    assert cache.stats.evictions == 1
+
+def test_invalidation_is_per_day_and_beats_loads_in_flight():
+    cache = DayCache()
+    cache.store_range(date(2024, 1, 1), date(2024, 1, 3), [], cache.token())
+    cache.invalidate([date(2024, 1, 2)])
+    assert cache.missing(date(2024, 1, 1), date(2024, 1, 3)) == [date(2024, 1, 2)]
+
+    # A load that started before a write finishes after it: the written day is not cached
+    token = cache.token()
+    cache.invalidate([date(2024, 1, 5)])
+    assert cache.store_range(date(2024, 1, 4), date(2024, 1, 6), _items(date(2024, 1, 5)), token) == 2
+    assert date(2024, 1, 5) not in cache and cache.stats.stale_drops == 1
+    assert cache.store_range(date(2024, 1, 5), date(2024, 1, 5), [], cache.token()) == 1
+
+    token = cache.token()
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.store_range(date(2024, 1, 1), date(2024, 1, 1), [], token) == 0
+
+def test_invalidation_bookkeeping_is_bounded():
+    cache = DayCache()
+    token = cache.token()
+    for day in range(1, DayCache.MAX_INVALIDATED + 50):
+        cache.invalidate([date.fromordinal(day)])
+    assert len(cache._invalidated) == DayCache.MAX_INVALIDATED
+    # The first days were forgotten, so a load from before them must not be cached
+    assert cache.store_range(date.fromordinal(1), date.fromordinal(1), [], token) == 0
+    assert cache.store_range(date.fromordinal(1), date.fromordinal(1), [], cache.token()) == 1
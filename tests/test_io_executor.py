@@ -0,0 +1,58 @@
+import threading
+import time
+from src.services.io_executor import IOExecutor
+
+def _drain(executor: IOExecutor, expected: int, timeout: float = 5.0):
+    delivered = 0
+    deadline = time.monotonic() + timeout
+    while delivered < expected and time.monotonic() < deadline:
+        delivered += executor.poll()
+        time.sleep(0.01)
+    return delivered
+
+def test_reads_see_earlier_writes():
+    executor = IOExecutor()
+    store = []
+    results = []
+
+    def slow_append(value):
+        time.sleep(0.05)
+        store.append(value)
+
+    executor.submit_write(slow_append, 1)
+    executor.submit_write(slow_append, 2)
+    executor.submit_read(lambda: list(store), on_done=results.append)
+
+    _drain(executor, 3)
+    assert results == [[1, 2]]
+    executor.shutdown()
+
+def test_superseded_reads_are_dropped():
+    executor = IOExecutor(read_workers=1)
+    gate = threading.Event()
+    results = []
+
+    executor.submit_read(lambda: gate.wait() and "first", key="records", on_done=results.append)
+    executor.submit_read(lambda: "second", key="records", on_done=results.append)
+    gate.set()
+
+    _drain(executor, 1)
+    time.sleep(0.05)
+    executor.poll()
+    assert results == ["second"]
+    executor.shutdown()
+
+def test_callbacks_run_on_polling_thread():
+    executor = IOExecutor()
+    threads = []
+    errors = []
+
+    executor.submit_read(lambda: None, on_done=lambda _: threads.append(threading.current_thread()))
+    executor.submit_write(lambda: 1 / 0, on_error=errors.append)
+
+    _drain(executor, 1)
+    time.sleep(0.05)
+    executor.poll()
+    assert threads == [threading.current_thread()]
+    assert isinstance(errors[0], ZeroDivisionError)
+    executor.shutdown()
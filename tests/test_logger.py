@@ -0,0 +1,49 @@
+import gzip
+import logging
+from datetime import date, timedelta
+import pytest
+from src.utils import logger as log_module
+from src.utils.logger import CompressingRotatingFileHandler, configure_logging, setup_logger, shutdown_logging
+
+def _emit(handler: logging.Handler, message: str):
+    handler.handle(logging.makeLogRecord({"msg": message, "levelno": logging.INFO, "levelname": "INFO"}))
+
+def test_handler_rotates_by_size_and_compresses(tmp_path):
+    path = tmp_path / "app.log"
+    handler = CompressingRotatingFileHandler(str(path), max_bytes=100, backup_count=2, daily=False)
+    for i in range(12):
+        _emit(handler, f"line {i:02d} " + "x" * 30)
+    handler.close()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["app.log", "app.log.1.gz", "app.log.2.gz"]
+    assert path.stat().st_size <= 100
+    assert gzip.decompress((tmp_path / "app.log.1.gz").read_bytes()).decode().startswith("line")
+
+def test_handler_rotates_daily(tmp_path):
+    path = tmp_path / "app.log"
+    handler = CompressingRotatingFileHandler(str(path), daily=True)
+    _emit(handler, "yesterday")
+    handler._day = date.today() - timedelta(days=1)
+    _emit(handler, "today")
+    handler.close()
+
+    assert path.read_text().strip() == "today"
+    assert gzip.decompress((tmp_path / "app.log.1.gz").read_bytes()).decode().strip() == "yesterday"
+
+def test_configure_logging_level_and_queue(tmp_path):
+    path = tmp_path / "app.log"
+    previous, previous_path = log_module._level, log_module._path
+    logger = setup_logger("LoggerTest")
+    try:
+        configure_logging("WARNING", path=str(path))
+        assert not logger.isEnabledFor(logging.INFO)
+        logger.info("dropped")
+        logger.warning("kept %s", "here")
+        shutdown_logging() # drains the queue
+        assert path.read_text(encoding="utf-8").splitlines()[-1].endswith("LoggerTest - WARNING - kept here")
+        assert "dropped" not in path.read_text(encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            configure_logging("LOUD", path=str(path))
+    finally:
+        configure_logging(previous, path=previous_path)
@@ -0,0 +1,68 @@
+import json
+from datetime import date
+import pytest
+from src.models.record import WorkRecord
+from src.services.storage import ExcelStorage
+from src.utils.metrics import Metrics, metrics, percentile
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+def test_metrics_measure_and_summary(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    recorder = Metrics()
+    with recorder.measure("ignored"):
+        pass
+    assert not path.exists()
+
+    recorder.enable(str(path), summary_interval=3600)
+    for rows in range(1, 11):
+        with recorder.measure("op", rows=rows):
+            recorder.note(bytes=rows * 100)
+    with pytest.raises(ValueError):
+        with recorder.measure("failing"):
+            raise ValueError("boom")
+    recorder.disable()
+    recorder.record("after disable", 1.0)
+
+    lines = _lines(path)
+    timings = [line for line in lines if line["event"] == "timing"]
+    assert [(t["name"], t.get("rows"), t.get("bytes")) for t in timings[:2]] == [("op", 1, 100), ("op", 2, 200)]
+    assert timings[-1]["name"] == "failing" and timings[-1]["error"] == "ValueError"
+    summaries = {line["name"]: line for line in lines if line["event"] == "summary"}
+    assert summaries["op"]["count"] == 10
+    assert summaries["op"]["p50_ms"] <= summaries["op"]["p99_ms"] <= summaries["op"]["max_ms"]
+    assert "after disable" not in {line["name"] for line in lines}
+
+def test_metrics_periodic_summary(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    recorder = Metrics()
+    recorder.enable(str(path), summary_interval=0)
+    recorder.record("op", 0.002)
+    recorder.record("op", 0.004)
+    recorder.disable()
+    assert [(line["event"], line.get("count")) for line in _lines(path)] == [
+        ("timing", None), ("summary", 1), ("timing", None), ("summary", 1)
+    ]
+
+def test_percentile():
+    samples = [float(i) for i in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 99) == 99.0
+    assert percentile([3.0], 90) == 3.0
+
+def test_storage_operations_are_timed(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    storage = ExcelStorage(str(tmp_path / "timed.xlsx"))
+    metrics.enable(str(path))
+    try:
+        storage.save_record(WorkRecord(date(2024, 5, 1), "P", "one", ""))
+        storage.get_records_by_date(date(2024, 5, 1))
+    finally:
+        metrics.disable()
+
+    timings = {line["name"]: line for line in _lines(path) if line["event"] == "timing"}
+    assert timings["ExcelStorage.get_records_by_date"]["rows"] == 1
+    assert timings["ExcelStorage.load"]["bytes"] > 0
+    assert timings["ExcelStorage.flush"]["rows"] == 1
+    assert "ExcelStorage.save_record" in timings
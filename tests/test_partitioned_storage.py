@@ -0,0 +1,103 @@
+from datetime import date
+import pytest
+from src.models.record import WorkRecord
+from src.services import xlsx_io
+from src.services.factory import create_storage
+from src.services.partitioned_storage import PartitionedStorage, read_archive
+from src.services.storage import ExcelStorage
+from src.utils.config import AppConfig
+
+def test_partitioned_storage_routes_by_year(tmp_path):
+    storage = PartitionedStorage(str(tmp_path / "parts"))
+    old_id = storage.save_record(WorkRecord(date(2022, 12, 31), "P", "old", ""))
+    new_id = storage.save_record(WorkRecord(date(2023, 1, 2), "P", "new", ""))
+    storage.save_record(WorkRecord(date(2023, 3, 1), "Q", "later", ""))
+    storage.close()
+
+    assert [(p.year, p.file, p.archived) for p in storage.partitions] == [(2022, "2022.xlsx", False),
+                                                                        (2023, "2023.xlsx", False)]
+    # A fresh instance only opens the year a query touches
+    storage = PartitionedStorage(str(tmp_path / "parts"))
+    assert [r.summary for _, r in storage.get_records_by_date(date(2023, 1, 2))] == ["new"]
+    assert storage.month_summary(2023, 3) == {1: 1}
+    assert list(storage._open) == [2023]
+    assert storage.get_records_by_date(date(2021, 5, 5)) == []
+
+    assert [r.summary for _, r in storage.get_records_in_range(date(2022, 1, 1), date(2023, 12, 31))] == [
+        "old", "new", "later"]
+    assert [r.summary for _, r in storage.search("new")] == ["new"]
+
+    # Changing the year moves the record to the other partition, keeping its ID
+    storage.update_record(old_id, WorkRecord(date(2023, 2, 1), "P", "moved", ""))
+    assert storage.get_records_in_range(date(2022, 1, 1), date(2022, 12, 31)) == []
+    assert storage.get_record(old_id).date == date(2023, 2, 1)
+    storage.delete_record(new_id)
+    with pytest.raises(KeyError):
+        storage.delete_record(new_id)
+    assert storage.count_records_by_month(2023, 1) == 0
+    storage.close()
+
+def test_partitioned_storage_archive(tmp_path):
+    storage = PartitionedStorage(str(tmp_path / "parts"))
+    record_id = storage.save_record(WorkRecord(date(2020, 6, 1), "P", "closed year", ""))
+    storage.save_record(WorkRecord(date(2021, 6, 1), "P", "kept", ""))
+    with pytest.raises(ValueError):
+        storage.archive_year(date.today().year)
+
+    assert storage.archive_year(2020) == 1
+    assert not (tmp_path / "parts" / "2020.xlsx").exists()
+    assert [r.summary for r in read_archive(tmp_path / "parts" / "2020.jsonl.gz")] == ["closed year"]
+
+    reopened = PartitionedStorage(str(tmp_path / "parts"))
+    assert reopened.partitions[0].archived
+    assert reopened.get_record(record_id).summary == "closed year"
+    assert len(reopened.get_records_in_range(date(2020, 1, 1), date(2021, 12, 31))) == 2
+    with pytest.raises(PermissionError):
+        reopened.save_record(WorkRecord(date(2020, 7, 1), "P", "too late", ""))
+    with pytest.raises(PermissionError):
+        reopened.delete_record(record_id)
+    # Moving a record out of an archived year fails before anything is written
+    with pytest.raises(PermissionError):
+        reopened.update_record(record_id, WorkRecord(date(2021, 1, 1), "P", "moved", ""))
+    assert [r.summary for _, r in reopened.get_records_in_range(date(2020, 1, 1), date(2021, 12, 31))] == [
+        "closed year", "kept"]
+    storage.close()
+    reopened.close()
+
+def test_partitioned_storage_migrates_monolithic_workbook(tmp_path):
+    xlsx_path = tmp_path / "work_reports.xlsx"
+    records = [WorkRecord(date(2021 + i % 3, 1 + i % 12, 1), "P", f"Task {i}", "", f"id{i}") for i in range(30)]
+    records.append(WorkRecord(date(2022, 5, 5), "P", "no id", ""))
+    xlsx_io.write_records(records, str(xlsx_path))
+    original = xlsx_path.read_bytes()
+
+    config = AppConfig(backend="partitioned", excel_path=str(xlsx_path), partition_dir=str(tmp_path / "parts"))
+    storage = create_storage(config)
+    assert [p.year for p in storage.partitions] == [2021, 2022, 2023]
+    assert storage.migrated_from == str(xlsx_path)
+    assert len(storage.get_records_in_range(date.min, date.max)) == 31
+    assert storage.get_record("id4").summary == "Task 4"
+    storage.close()
+
+    # The original is left untouched (no IDs written into legacy rows) and the split never runs twice
+    assert xlsx_path.read_bytes() == original
+    storage = create_storage(config)
+    assert storage.migrate_from_xlsx(str(xlsx_path)) == 0
+    assert len(storage.get_records_in_range(date.min, date.max)) == 31
+    storage.close()
+
+def test_partitioned_storage_migration_replays_pending_journal(tmp_path):
+    xlsx_path = tmp_path / "work_reports.xlsx"
+    xlsx_io.write_records([WorkRecord(date(2022, 1, 1), "P", "flushed", "", "id1")], str(xlsx_path))
+    # An app that exited before its write-behind flush: the record is only in the journal
+    crashed = ExcelStorage(str(xlsx_path), write_behind=True, flush_interval=3600)
+    crashed.save_record(WorkRecord(date(2023, 2, 2), "P", "journal only", ""))
+    crashed._flush_timer.cancel()
+    assert len(xlsx_io.read_records(str(xlsx_path))) == 1
+    original = xlsx_path.read_bytes(), crashed.journal_path.read_bytes()
+
+    storage = PartitionedStorage(str(tmp_path / "parts"))
+    assert storage.migrate_from_xlsx(str(xlsx_path)) == 2
+    assert [r.summary for _, r in storage.get_records_in_range(date.min, date.max)] == ["flushed", "journal only"]
+    assert (xlsx_path.read_bytes(), crashed.journal_path.read_bytes()) == original
+    storage.close()
@@ -0,0 +1,107 @@
+from datetime import date, timedelta
+import pytest
+from src.models.record import WorkRecord
+from src.services import project_index
+from src.services.partitioned_storage import PartitionedStorage
+from src.services.project_index import ProjectIndex, ProjectUsage, rank
+from src.services.sqlite_storage import SQLiteStorage
+from src.services.storage import ExcelStorage
+
+def _names(usages):
+    return [usage.name for usage in usages]
+
+def test_rank_orders_by_match_then_usage():
+    index = ProjectIndex.build([
+        WorkRecord(date(2024, 1, 1), "Portal", "", ""),
+        WorkRecord(date(2024, 1, 2), "Portal", "", ""),
+        WorkRecord(date(2024, 1, 3), "Project Alpha", "", ""),
+        WorkRecord(date(2024, 1, 4), "Support Portal", "", ""),
+        WorkRecord(date(2024, 1, 5), "Import", "", ""),
+        WorkRecord(date(2024, 1, 6), "Billing", "", ""),
+    ])
+    assert _names(index.lookup("")) == ["Portal", "Billing", "Import", "Support Portal", "Project Alpha"]
+    assert _names(index.lookup("portal")) == ["Portal", "Support Portal"]
+    assert _names(index.lookup("po")) == ["Portal", "Support Portal", "Import", "Project Alpha"]
+    assert _names(index.lookup("porject")) == ["Project Alpha"] # swapped letters
+    assert _names(index.lookup("prj alp")) == ["Project Alpha"] # abbreviation
+    assert _names(index.lookup("blling")) == ["Billing"] # missing letter
+    assert index.lookup("xyz") == []
+    assert _names(index.lookup("", limit=2)) == ["Portal", "Billing"]
+
+def test_remove_keeps_counts_and_last_used_exact():
+    first = WorkRecord(date(2024, 1, 1), "P", "", "")
+    latest = WorkRecord(date(2024, 3, 1), "P", "", "")
+    index = ProjectIndex.build([first, latest, WorkRecord(date(2024, 3, 1), "P", "", "")])
+    assert index.usage("P") == ProjectUsage("P", 3, date(2024, 3, 1))
+
+    index.remove(latest)
+    assert index.usage("P") == ProjectUsage("P", 2, date(2024, 3, 1))
+    index.remove(latest)
+    assert index.usage("P") == ProjectUsage("P", 1, date(2024, 1, 1))
+    index.remove(first)
+    assert index.usage("P") is None and len(index) == 0
+    assert index.lookup("p") == []
+
+def test_rank_merges_like_lookup():
+    usages = [ProjectUsage("Alpha", 1, date(2024, 1, 1)), ProjectUsage("Alpine", 5, date(2023, 1, 1)),
+              ProjectUsage("Beta", 9, date(2024, 1, 1))]
+    assert _names(rank("al", usages)) == ["Alpine", "Alpha"]
+    assert _names(rank("", usages, limit=1)) == ["Beta"]
+
+def test_lookup_prunes_names_instead_of_testing_every_tier(monkeypatch):
+    tested = []
+
+    def counted(match):
+        def test(query, name):
+            tested.append(name)
+            return match(query, name)
+        return test
+
+    typo = counted(project_index._is_typo_of_prefix)
+    tiers = tuple(typo if match is project_index._is_typo_of_prefix else counted(match)
+                  for match in project_index._TIERS)
+    monkeypatch.setattr(project_index, "_is_typo_of_prefix", typo)
+    monkeypatch.setattr(project_index, "_TIERS", tiers)
+
+    words = ["alpha", "beta", "gamma", "delta", "client", "portal", "mobile", "infra", "billing", "report"]
+    index = ProjectIndex()
+    for i in range(1000):
+        name = f"{words[i % 10]} {words[i // 10 % 10]} {i // 100}"
+        index.add_count(name, date(2020, 1, 1) + timedelta(days=i), i % 7 + 1)
+
+    # Trying every tier on every name would be 6000 tests per query
+    for query in ["al", "alpha be", "porta", "bilgin"]:
+        tested.clear()
+        assert len(index.lookup(query)) == 10
+        assert len(tested) <= len(index)
+    tested.clear()
+    assert index.lookup("zzzz") == [] and tested == [] # ruled out by the character sets alone
+    index.lookup("alpha beta 3")
+    assert len(tested) < 100 # stops once the exact and prefix matches fill the limit
+
+@pytest.mark.parametrize("make_storage", [
+    lambda tmp_path: ExcelStorage(str(tmp_path / "reports.xlsx")),
+    lambda tmp_path: SQLiteStorage(str(tmp_path / "reports.db")),
+    lambda tmp_path: PartitionedStorage(str(tmp_path / "parts")),
+])
+def test_storage_suggestions_follow_writes(tmp_path, make_storage):
+    storage = make_storage(tmp_path)
+    today = date.today()
+    storage.save_record(WorkRecord(today, "Website", "a", ""))
+    assert _names(storage.suggest_projects("web")) == ["Website"]
+
+    web_id = storage.save_record(WorkRecord(today, "Website", "b", ""))
+    app_id = storage.save_record(WorkRecord(today - timedelta(days=1), "App", "c", ""))
+    assert storage.suggest_projects("") == [ProjectUsage("Website", 2, today),
+                                            ProjectUsage("App", 1, today - timedelta(days=1))]
+
+    storage.update_record(app_id, WorkRecord(today, "Mobile App", "c", ""))
+    storage.delete_record(web_id)
+    assert storage.suggest_projects("") == [ProjectUsage("Mobile App", 1, today), ProjectUsage("Website", 1, today)]
+    assert _names(storage.suggest_projects("app")) == ["Mobile App"]
+    storage.close()
+
+    # A fresh instance rebuilds the same index from what was written
+    reopened = make_storage(tmp_path)
+    assert reopened.suggest_projects("") == [ProjectUsage("Mobile App", 1, today), ProjectUsage("Website", 1, today)]
+    reopened.close()
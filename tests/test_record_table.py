@@ -0,0 +1,87 @@
+import tracemalloc
+from datetime import date, timedelta
+from src.models.record import WorkRecord, new_record_id
+from src.services.record_table import RecordTable
+
+def _record(day: int, summary: str, record_id: str = "", project: str = "P", details: str = "") -> WorkRecord:
+    return WorkRecord(date(2024, 1, 1) + timedelta(days=day), project, summary, details, record_id or new_record_id())
+
+def test_record_table_crud():
+    table = RecordTable()
+    a, b, c = _record(3, "a", details="long details " * 20), _record(1, "b", "legacy-7"), _record(3, "c")
+    table.extend([(a, 2), (b, 3), (c, 4)])
+
+    assert len(table) == 3 and "legacy-7" in table and "missing" not in table
+    assert table.get(a.record_id) == a
+    assert table.get(a.record_id) is not a # copies, never the stored row
+    assert [r.summary for _, r in table.items_in_range(date(2024, 1, 1), date(2024, 1, 31))] == ["b", "a", "c"]
+    assert table.counts_in_range(date(2024, 1, 1), date(2024, 1, 31)) == {date(2024, 1, 2): 1, date(2024, 1, 4): 2}
+
+    table.update(c.record_id, _record(0, "c moved", project="Q"))
+    assert [r.summary for _, r in table.items_in_range(date.min, date.max)] == ["c moved", "b", "a"]
+    assert table.get(c.record_id).project_name == "Q" and table.position(c.record_id) == 4
+
+    assert table.remove(a.record_id) == 2
+    assert a.record_id not in table and len(table) == 2
+    table.append(_record(2, "d", "legacy-8"), 5)
+    table.shift_positions([2])
+    assert [table.position(i) for i in (c.record_id, "legacy-7", "legacy-8")] == [3, 2, 4]
+    try:
+        table.remove(a.record_id)
+        assert False, "expected KeyError"
+    except KeyError:
+        pass
+
+def test_record_table_vacuum_and_churn():
+    table = RecordTable()
+    records = [_record(i % 40, f"s{i}") for i in range(5000)]
+    table.extend((r, i) for i, r in enumerate(records))
+    remaining = records[2::3]
+    for i, r in enumerate(records):
+        if i % 3 != 2:
+            table.remove(r.record_id) # crosses the vacuum threshold
+    for i, r in enumerate(remaining[:100]):
+        table.update(r.record_id, _record(r.date.toordinal() - date(2024, 1, 1).toordinal(), f"u{i}"))
+
+    assert len(table) == len(remaining)
+    assert len(table._dates) < len(records) # removed rows were dropped
+    assert table.get(remaining[0].record_id).summary == "u0"
+    assert table.get(remaining[-1].record_id) == remaining[-1]
+    assert table.position(remaining[-1].record_id) == records.index(remaining[-1])
+    assert table.count_in_range(date.min, date.max) == len(remaining)
+
+def test_record_table_is_compact():
+    records = [_record(i // 5, f"Fix login flow #{i}", project=f"Project {i % 20}", details="Details " * 10)
+               for i in range(50_000)]
+    tracemalloc.start()
+    table = RecordTable()
+    table.extend((r, i) for i, r in enumerate(records))
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # ~110 bytes per row; a dict of WorkRecord objects needs several times that
+    assert used < 50_000 * 150
+    assert len(table.items_in_range(date(2024, 1, 1), date(2024, 1, 10))) == 50
+
+def test_record_table_close_releases_spill_file():
+    table = RecordTable()
+    assert table._details._file is None # created on the first details written
+    record = _record(0, "a", details="spilled")
+    table.append(record, 2)
+    spill = table._details._file
+    assert spill is not None
+
+    table.close()
+    assert spill.closed and len(table) == 0
+    table.append(record, 2) # still usable, e.g. when the storage reloads
+    assert table.get(record.record_id).details == "spilled"
+    table.close()
+
+def test_excel_storage_close_releases_table(tmp_path):
+    from src.services.storage import ExcelStorage
+    storage = ExcelStorage(str(tmp_path / "reports.xlsx"))
+    record_id = storage.save_record(_record(0, "a", details="spilled"))
+    spill = storage._table._details._file
+    storage.close()
+    assert spill.closed
+    assert storage.get_record(record_id).details == "spilled" # reloads from the file
+    storage.close()
@@ -0,0 +1,80 @@
+import openpyxl
+import time
+from datetime import date, timedelta
+from src.models.record import WorkRecord
+from src.services.report import build_report, month_range, render_markdown, render_text, week_range, write_xlsx
+from src.services import xlsx_io
+from src.services.storage import ExcelStorage
+from src.report_cli import main as report_main
+
+def _storage(tmp_path) -> ExcelStorage:
+    storage = ExcelStorage(str(tmp_path / "reports.xlsx"))
+    with storage.batch():
+        storage.save_record(WorkRecord(date(2024, 3, 4), "Alpha", "Kickoff", "Agenda\nNotes"))
+        storage.save_record(WorkRecord(date(2024, 3, 5), "Beta", "Review", ""))
+        storage.save_record(WorkRecord(date(2024, 3, 6), "Alpha", "Design", ""))
+        storage.save_record(WorkRecord(date(2024, 3, 11), "Alpha", "Next week", ""))
+    return storage
+
+def test_ranges():
+    assert week_range(date(2024, 3, 6)) == (date(2024, 3, 4), date(2024, 3, 10))
+    assert month_range(date(2024, 2, 10)) == (date(2024, 2, 1), date(2024, 2, 29))
+
+def test_build_and_render_report(tmp_path):
+    storage = _storage(tmp_path)
+    report = build_report(storage, *week_range(date(2024, 3, 6)))
+
+    assert report.title.startswith("Weekly Report 2024-W10")
+    assert [s.project_name for s in report.projects] == ["Alpha", "Beta"]
+    assert [r.summary for r in report.projects[0].records] == ["Kickoff", "Design"]
+    assert (report.total, report.days) == (3, 3)
+
+    markdown = render_markdown(report)
+    assert "## Alpha (2)" in markdown
+    assert "- **2024-03-04** Kickoff\n  Agenda\n  Notes" in markdown
+    assert "Next week" not in markdown
+    assert "Beta (1)\n--------" in render_text(report)
+
+    month = build_report(storage, *month_range(date(2024, 3, 1)))
+    assert month.title == "Monthly Report 2024-03" and month.total == 4
+
+def test_report_xlsx_sheet(tmp_path):
+    storage = _storage(tmp_path)
+    report = build_report(storage, *week_range(date(2024, 3, 4)))
+    out = tmp_path / "out.xlsx"
+    write_xlsx(report, str(out), "W10")
+    write_xlsx(report, str(out), "W10 again")
+    workbook = openpyxl.load_workbook(out)
+    assert workbook.sheetnames == ["W10", "W10 again"]
+    assert workbook["W10"]["C5"].value == "Kickoff"
+
+    # The record store itself is never used as a report target
+    storage.flush()
+    try:
+        write_xlsx(report, str(storage.file_path))
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+def test_report_cli(tmp_path, monkeypatch, capsys):
+    _storage(tmp_path).close()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("WEEKLY_REPORT_BACKEND", "excel")
+    (tmp_path / "config.json").write_text('{"excel_path": "reports.xlsx"}')
+
+    assert report_main(["--week", "2024-03-05", "--format", "text"]) == 0
+    assert "Kickoff" in capsys.readouterr().out
+    assert report_main(["--format", "xlsx"]) == 2
+
+def test_quarterly_report_is_single_pass(tmp_path):
+    path = tmp_path / "big.xlsx"
+    start = date(2024, 1, 1)
+    xlsx_io.write_records((WorkRecord(start + timedelta(days=i % 366), f"P{i % 12}", f"Task {i}", "", f"id{i}")
+                           for i in range(20000)), str(path))
+    storage = ExcelStorage(str(path))
+    storage.preload()
+
+    began = time.perf_counter()
+    report = build_report(storage, date(2024, 1, 1), date(2024, 3, 31))
+    assert time.perf_counter() - began < 1.0
+    assert report.total == sum(1 for i in range(20000) if i % 366 < 91)
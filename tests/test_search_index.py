@@ -0,0 +1,48 @@
+from datetime import date
+from src.models.record import WorkRecord
+from src.services.search_index import InvertedIndex
+from src.services.sqlite_storage import SQLiteStorage
+from src.services.storage import ExcelStorage
+
+RECORDS = [
+    WorkRecord(date=date(2024, 3, 1), project_name="登入系統", summary="修復登入錯誤", details="API timeout fix"),
+    WorkRecord(date=date(2024, 3, 4), project_name="Reporting", summary="Weekly report export", details="匯出 Excel 報表"),
+    WorkRecord(date=date(2024, 3, 5), project_name="登入系統", summary="新增單元測試", details="covers the login API"),
+]
+
+def _check_search(storage):
+    ids = [storage.save_record(WorkRecord(r.date, r.project_name, r.summary, r.details)) for r in RECORDS]
+
+    assert [i for i, _ in storage.search("登入")] == [ids[2], ids[0]]
+    assert [i for i, _ in storage.search("錯誤")] == [ids[0]]
+    assert [i for i, _ in storage.search("api")] == [ids[2], ids[0]]
+    assert [i for i, _ in storage.search("rep")] == [ids[1]] # prefix of the last term
+    assert [i for i, _ in storage.search("報表 export")] == [ids[1]]
+    assert storage.search("api", start=date(2024, 3, 2)) == [(ids[2], storage.get_record(ids[2]))]
+    assert [i for i, _ in storage.search("api", project="Reporting")] == []
+    assert storage.search("nothing-matches") == []
+
+    # Incremental updates
+    storage.update_record(ids[1], WorkRecord(date(2024, 3, 4), "Reporting", "Monthly summary", "PDF 報表"))
+    assert storage.search("weekly") == []
+    assert [i for i, _ in storage.search("monthly")] == [ids[1]]
+    storage.delete_record(ids[0])
+    assert [i for i, _ in storage.search("登入")] == [ids[2]]
+    return ids
+
+def test_excel_search_index_persists(tmp_path):
+    path = tmp_path / "reports.xlsx"
+    storage = ExcelStorage(str(path))
+    ids = _check_search(storage)
+    assert storage.search_index_path.exists()
+
+    # A fresh instance reuses the persisted index instead of re-tokenizing
+    reopened = ExcelStorage(str(path))
+    reopened.preload()
+    assert InvertedIndex.load(reopened.search_index_path, reopened._signature) is not None
+    assert [i for i, _ in reopened.search("monthly")] == [ids[1]]
+
+def test_sqlite_search(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "reports.db"))
+    _check_search(storage)
+    storage.close()
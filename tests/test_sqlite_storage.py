@@ -0,0 +1,91 @@
+import sqlite3
+from datetime import date
+from src.models.record import WorkRecord
+from src.services.factory import create_storage
+from src.services.sqlite_storage import SQLiteStorage
+from src.services.storage import ExcelStorage
+from src.utils.config import AppConfig
+
+def test_sqlite_storage(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "reports.db"))
+
+    with storage.batch():
+        storage.save_record(WorkRecord(date=date(2024, 1, 1), project_name="ProjA", summary="S1", details="D1"))
+        storage.save_record(WorkRecord(date=date(2024, 1, 8), project_name="ProjB", summary="S2", details="D2"))
+
+    records = storage.get_records_by_date(date(2024, 1, 1))
+    assert len(records) == 1
+    key, record = records[0]
+    assert record.project_name == "ProjA"
+
+    storage.update_record(key, WorkRecord(date=date(2024, 1, 2), project_name="ProjA-Updated", summary="S1", details="D1"))
+    assert storage.get_records_by_date(date(2024, 1, 1)) == []
+    assert [r.project_name for _, r in storage.get_records_for_week(2024, 1)] == ["ProjA-Updated"]
+    assert storage.count_records_by_month(2024, 1) == 2
+    assert storage.month_summary(2024, 1) == {2: 1, 8: 1}
+
+    storage.delete_record(key)
+    assert storage.count_records_by_month(2024, 1) == 1
+    storage.close()
+
+def test_sqlite_migration_and_export(tmp_path):
+    xlsx_path = tmp_path / "work_reports.xlsx"
+    excel = ExcelStorage(str(xlsx_path))
+    excel.save_record(WorkRecord(date=date(2023, 10, 27), project_name="ProjA", summary="S1", details="D1"))
+    excel.save_record(WorkRecord(date=date(2023, 10, 28), project_name="ProjB", summary="S2", details="D2"))
+
+    config = AppConfig(backend="sqlite", excel_path=str(xlsx_path), sqlite_path=str(tmp_path / "reports.db"))
+    storage = create_storage(config)
+    assert storage.count_records_by_month(2023, 10) == 2
+    storage.close()
+
+    # Migration only runs once
+    storage = create_storage(config)
+    assert storage.count_records_by_month(2023, 10) == 2
+
+    export_path = tmp_path / "export.xlsx"
+    assert storage.export_xlsx(str(export_path)) == 2
+    exported = ExcelStorage(str(export_path)).get_records_in_range(date(2023, 1, 1), date(2023, 12, 31))
+    assert [r.project_name for _, r in exported] == ["ProjA", "ProjB"]
+    storage.close()
+
+def test_sqlite_migration_replays_pending_journal(tmp_path):
+    xlsx_path = tmp_path / "work_reports.xlsx"
+    excel = ExcelStorage(str(xlsx_path), write_behind=True, flush_interval=3600)
+    excel.save_record(WorkRecord(date(2023, 10, 27), "P", "a", ""))
+    excel.flush()
+    # The app exits before its next write-behind flush: these changes are only in the journal
+    excel.save_record(WorkRecord(date(2023, 10, 28), "P", "journal-only", ""))
+    excel.update_record(excel.get_records_by_date(date(2023, 10, 27))[0][0],
+                        WorkRecord(date(2023, 10, 27), "P", "a edited", ""))
+    excel._flush_timer.cancel()
+    workbook_bytes = xlsx_path.read_bytes()
+
+    storage = SQLiteStorage(str(tmp_path / "reports.db"))
+    assert storage.migrate_from_xlsx(str(xlsx_path)) == 2
+    assert [r.summary for _, r in storage.get_records_in_range(date.min, date.max)] == ["a edited", "journal-only"]
+    assert xlsx_path.read_bytes() == workbook_bytes # the source is only read
+    storage.close()
+
+def test_sqlite_poll_external_changes(tmp_path):
+    writer = SQLiteStorage(str(tmp_path / "reports.db"))
+    viewer = SQLiteStorage(str(tmp_path / "reports.db"))
+    assert not viewer.poll_external_changes()
+
+    viewer.save_record(WorkRecord(date(2024, 8, 1), "P", "own write", ""))
+    assert not viewer.poll_external_changes()
+    writer.save_record(WorkRecord(date(2024, 8, 2), "P", "elsewhere", ""))
+    assert viewer.poll_external_changes()
+    assert not viewer.poll_external_changes()
+    viewer.close()
+    writer.close()
+
+def test_sqlite_uses_rollback_journal_for_shared_drives(tmp_path):
+    path = tmp_path / "reports.db"
+    legacy = sqlite3.connect(str(path))
+    assert legacy.execute("PRAGMA journal_mode=WAL").fetchone()[0] == "wal"
+    legacy.close()
+
+    storage = SQLiteStorage(str(path))
+    assert storage._conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    storage.close()
@@ -1,13 +1,21 @@
-from datetime import date
+import atexit
+from datetime import date, datetime
+import openpyxl
+from openpyxl.comments import Comment
+from src.services import xlsx_io
+from src.services.journal import Journal
 from src.services.storage import ExcelStorage
+from src.utils.file_lock import FileLock
 from src.models.record import WorkRecord
+import glob
 import os
+import pytest
 
 def test_storage():
     print("Testing Storage...")
     test_file = "test_work_reports.xlsx"
-    if os.path.exists(test_file):
-        os.remove(test_file)
+    for leftover in glob.glob("test_work_reports.*"): # the workbook, its journal and lock file
+        os.remove(leftover)
         
     storage = ExcelStorage(test_file)
     
@@ -22,25 +30,276 @@ def test_storage():
     assert records[0][1].project_name == "ProjA"
     print("Verified Read")
     
-    # 3. Update (Assuming row 2 since row 1 is header)
-    row_idx = records[0][0]
+    # 3. Update by the record's stable ID
+    record_id = records[0][0]
+    assert record_id == r1.record_id
     r1_updated = WorkRecord(date=date(2023, 10, 27), project_name="ProjA-Updated", summary="Summary 1", details="Details 1")
-    storage.update_record_by_row(row_idx, r1_updated)
+    storage.update_record(record_id, r1_updated)
     
     records_updated = storage.get_records_by_date(date(2023, 10, 27))
     assert records_updated[0][1].project_name == "ProjA-Updated"
     print("Verified Update")
     
     # 4. Delete
-    storage.delete_record_by_row(row_idx)
+    storage.delete_record(record_id)
     records_deleted = storage.get_records_by_date(date(2023, 10, 27))
     assert len(records_deleted) == 0
     print("Verified Delete")
     
     # Cleanup
-    if os.path.exists(test_file):
-        os.remove(test_file)
+    for leftover in glob.glob("test_work_reports.*"): # the workbook, its journal and lock file
+        os.remove(leftover)
     print("Test Passed!")
 
+def test_storage_cache(tmp_path):
+    test_file = tmp_path / "cache_reports.xlsx"
+    storage = ExcelStorage(str(test_file))
+
+    storage.save_record(WorkRecord(date=date(2023, 10, 27), project_name="ProjA", summary="S1", details="D1"))
+    reloads = storage.stats.reloads
+
+    # Repeated reads are served from memory
+    for _ in range(3):
+        assert len(storage.get_records_by_date(date(2023, 10, 27))) == 1
+    assert storage.stats.reloads == reloads
+    assert storage.stats.hits >= 3
+
+    # A change made by someone else (e.g. Excel) triggers a reload
+    other = ExcelStorage(str(test_file))
+    other.save_record(WorkRecord(date=date(2023, 10, 27), project_name="ProjB", summary="S2", details="D2"))
+    os.utime(test_file, ns=(0, os.stat(test_file).st_mtime_ns + 1_000_000))
+
+    records = storage.get_records_by_date(date(2023, 10, 27))
+    assert [r.project_name for _, r in records] == ["ProjA", "ProjB"]
+    assert storage.stats.reloads == reloads + 1
+
+def test_storage_date_queries(tmp_path):
+    storage = ExcelStorage(str(tmp_path / "range_reports.xlsx"))
+    for d in [date(2024, 1, 1), date(2024, 1, 3), date(2024, 1, 7), date(2024, 1, 8), date(2024, 2, 1)]:
+        storage.save_record(WorkRecord(date=d, project_name="P", summary=d.isoformat(), details=""))
+
+    in_range = storage.get_records_in_range(date(2024, 1, 2), date(2024, 1, 8))
+    assert [r.summary for _, r in in_range] == ["2024-01-03", "2024-01-07", "2024-01-08"]
+
+    # ISO week 1 of 2024 runs Mon 2024-01-01 .. Sun 2024-01-07
+    week = storage.get_records_for_week(2024, 1)
+    assert [r.date.day for _, r in week] == [1, 3, 7]
+
+    assert storage.count_records_by_month(2024, 1) == 4
+    assert storage.count_records_by_month(2024, 3) == 0
+    assert storage.month_summary(2024, 1) == {1: 1, 3: 1, 7: 1, 8: 1}
+
+    # Index stays consistent after moving and deleting records
+    record_id, record = storage.get_records_by_date(date(2024, 1, 3))[0]
+    storage.update_record(record_id, WorkRecord(date=date(2024, 2, 2), project_name="P", summary="moved", details=""))
+    assert storage.count_records_by_month(2024, 2) == 2
+    storage.delete_record(storage.get_records_by_date(date(2024, 1, 1))[0][0])
+    assert [r.summary for _, r in storage.get_records_in_range(date(2024, 1, 1), date(2024, 12, 31))] == [
+        "2024-01-07", "2024-01-08", "2024-02-01", "moved"
+    ]
+    assert storage.get_record(record_id).summary == "moved"
+
+def test_storage_write_behind(tmp_path):
+    test_file = tmp_path / "batched_reports.xlsx"
+    storage = ExcelStorage(str(test_file), write_behind=True, flush_interval=60)
+
+    with storage.batch():
+        for day in range(1, 6):
+            storage.save_record(WorkRecord(date=date(2024, 3, day), project_name="P", summary=str(day), details=""))
+    # The workbook hasn't been rewritten yet, but the records are journaled and reads see them
+    assert storage.has_pending_writes
+    assert storage.count_records_by_month(2024, 3) == 5
+    assert list(xlsx_io.iter_records(str(test_file))) == []
+    assert len(list(Journal(storage.journal_path).entries())) == 5
+
+    storage.close()
+    assert list(Journal(storage.journal_path).entries()) == []
+    assert not storage.has_pending_writes
+    assert storage.stats.flushes == 1
+    assert ExcelStorage(str(test_file)).count_records_by_month(2024, 3) == 5
+
+def test_storage_releases_exit_hook_on_close(tmp_path, monkeypatch):
+    hooks = []
+    monkeypatch.setattr(atexit, "register", hooks.append)
+    monkeypatch.setattr(atexit, "unregister", hooks.remove)
+    storage = ExcelStorage(str(tmp_path / "hooked_reports.xlsx"), write_behind=True, flush_interval=3600)
+    assert hooks == [] # nothing to flush at exit yet
+
+    storage.save_record(WorkRecord(date(2024, 3, 1), "P", "a", ""))
+    storage.save_record(WorkRecord(date(2024, 3, 2), "P", "b", ""))
+    assert hooks == [storage.close]
+    storage.close()
+    assert hooks == [] # a closed instance isn't kept alive until exit
+
+    # Used again after close(): pending writes are covered again
+    storage.save_record(WorkRecord(date(2024, 3, 3), "P", "c", ""))
+    assert hooks == [storage.close]
+    storage.close()
+    assert hooks == []
+
+def test_storage_stable_ids(tmp_path):
+    test_file = tmp_path / "id_reports.xlsx"
+    storage = ExcelStorage(str(test_file), write_behind=True, flush_interval=60)
+    ids = [
+        storage.save_record(WorkRecord(date=date(2024, 5, day), project_name="P", summary=str(day), details=""))
+        for day in range(1, 6)
+    ]
+
+    # Several deletes and edits between flushes must hit the right rows
+    storage.delete_record(ids[0])
+    storage.delete_record(ids[2])
+    storage.update_record(ids[3], WorkRecord(date=date(2024, 5, 4), project_name="P", summary="edited", details=""))
+    storage.delete_record(ids[1])
+    storage.flush()
+    storage.update_record(ids[4], WorkRecord(date=date(2024, 5, 5), project_name="P", summary="edited again", details=""))
+    storage.close()
+
+    reopened = ExcelStorage(str(test_file))
+    records = reopened.get_records_in_range(date(2024, 5, 1), date(2024, 5, 31))
+    assert [(rid, r.summary) for rid, r in records] == [(ids[3], "edited"), (ids[4], "edited again")]
+
+def test_storage_assigns_ids_to_legacy_rows(tmp_path):
+    import openpyxl
+    test_file = tmp_path / "legacy_reports.xlsx"
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = ExcelStorage.SHEET_NAME
+    sheet.append(["Date", "Project", "Summary", "Details"])
+    sheet.append(["2023-10-27", "ProjA", "S1", "D1"])
+    workbook.save(test_file)
+
+    record_id = ExcelStorage(str(test_file)).get_records_by_date(date(2023, 10, 27))[0][0]
+    assert record_id
+    # The assigned ID was written back, so it survives a fresh load
+    assert ExcelStorage(str(test_file)).get_records_by_date(date(2023, 10, 27))[0][0] == record_id
+
+def test_storage_compaction_matches_model(tmp_path):
+    import random
+    from datetime import timedelta
+    test_file = tmp_path / "compaction.xlsx"
+    storage = ExcelStorage(str(test_file), write_behind=True, flush_interval=3600)
+    rng = random.Random(1)
+    expected = {}
+    for step in range(20):
+        record = WorkRecord(date(2024, 1, 1) + timedelta(days=step), "P", f"saved {step}", "")
+        expected[storage.save_record(record)] = record.summary
+    storage.close()
+
+    # Someone formats one record's row in Excel; its formatting must follow it as rows above are deleted
+    formatted_id = list(expected)[15]
+    workbook = openpyxl.load_workbook(test_file)
+    sheet = workbook[xlsx_io.SHEET_NAME]
+    row = next(cells for cells in sheet.iter_rows(min_row=2) if cells[-1].value == formatted_id)
+    row[0].value = datetime(2024, 1, 16)
+    row[0].number_format = "yyyy/mm/dd"
+    row[1].hyperlink = "https://example.com/p"
+    row[2].comment = Comment("checked", "reviewer")
+    workbook.save(test_file)
+
+    for step in range(20, 400):
+        if rng.random() < 0.5 or not expected:
+            record = WorkRecord(date(2024, 1, 1) + timedelta(days=rng.randint(0, 30)), "P", f"saved {step}", "")
+            expected[storage.save_record(record)] = record.summary
+        elif rng.random() < 0.5:
+            record_id = rng.choice([i for i in expected if i != formatted_id])
+            storage.delete_record(record_id)
+            del expected[record_id]
+        else:
+            record_id = rng.choice([i for i in expected if i != formatted_id])
+            old = storage.get_record(record_id)
+            storage.update_record(record_id, WorkRecord(old.date, "P", f"updated {step}", ""))
+            expected[record_id] = f"updated {step}"
+        if rng.random() < 0.05:
+            storage.flush()
+    storage.close()
+
+    on_disk = {r.record_id: r.summary for _, r in xlsx_io.iter_records(str(test_file))}
+    assert on_disk == expected
+    sheet = openpyxl.load_workbook(test_file)[xlsx_io.SHEET_NAME]
+    formatted_rows = [cells for cells in sheet.iter_rows(min_row=2) if cells[0].number_format == "yyyy/mm/dd"]
+    assert [cells[-1].value for cells in formatted_rows] == [formatted_id]
+    assert formatted_rows[0][1].hyperlink.target == "https://example.com/p"
+    assert formatted_rows[0][2].comment.text == "checked"
+    assert sum(1 for cells in sheet.iter_rows(min_row=2) if cells[1].hyperlink or cells[2].comment) == 1
+
+def test_storage_replays_journal_after_crash(tmp_path):
+    test_file = tmp_path / "crash_reports.xlsx"
+    storage = ExcelStorage(str(test_file), write_behind=True, flush_interval=3600)
+    kept = storage.save_record(WorkRecord(date(2024, 6, 1), "P", "kept", ""))
+    storage.flush()
+    edited = storage.save_record(WorkRecord(date(2024, 6, 2), "P", "new", ""))
+    storage.update_record(edited, WorkRecord(date(2024, 6, 3), "P", "edited", ""))
+    storage.delete_record(kept)
+    # Crash: the process dies before the deferred compaction; a torn line ends the journal
+    storage._flush_timer.cancel()
+    storage._journal.close()
+    with open(storage.journal_path, "ab") as f:
+        f.write(b'{"op": "save", "id": "torn", "rec')
+
+    recovered = ExcelStorage(str(test_file))
+    assert recovered.get_records_in_range(date(2024, 6, 1), date(2024, 6, 30)) == [
+        (edited, WorkRecord(date(2024, 6, 3), "P", "edited", "", edited))
+    ]
+    # Replaying compacted the workbook and emptied the journal; no temp files are left behind
+    assert list(Journal(recovered.journal_path).entries()) == []
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
+    assert [r.summary for _, r in xlsx_io.iter_records(str(test_file))] == ["edited"]
+
+def test_storage_merges_changes_from_another_process(tmp_path):
+    test_file = tmp_path / "shared_reports.xlsx"
+    seed = ExcelStorage(str(test_file))
+    edited_id = seed.save_record(WorkRecord(date(2024, 7, 1), "P", "original", ""))
+    deleted_id = seed.save_record(WorkRecord(date(2024, 7, 1), "P", "doomed", ""))
+
+    # Two instances (standing in for two processes) load the same version of the file
+    first = ExcelStorage(str(test_file), write_behind=True, flush_interval=3600)
+    second = ExcelStorage(str(test_file), write_behind=True, flush_interval=3600)
+    first.preload()
+    second.preload()
+
+    first_id = first.save_record(WorkRecord(date(2024, 7, 2), "P", "from first", ""))
+    first.update_record(edited_id, WorkRecord(date(2024, 7, 1), "P", "edited by first", ""))
+    second_id = second.save_record(WorkRecord(date(2024, 7, 3), "P", "from second", ""))
+    second.delete_record(deleted_id)
+    first.flush()
+    assert first.stats.merges == 1 # the journal holds the second instance's changes
+    second.flush()
+    assert second.stats.merges == 1 # the workbook changed under it
+    assert second.poll_external_changes()
+    assert not second.poll_external_changes()
+
+    expected = {edited_id: "edited by first", first_id: "from first", second_id: "from second"}
+    for storage in (ExcelStorage(str(test_file)), first, second):
+        records = storage.get_records_in_range(date(2024, 7, 1), date(2024, 7, 31))
+        assert {record_id: record.summary for record_id, record in records} == expected
+    first.close()
+    second.close()
+
+def test_storage_poll_external_changes(tmp_path):
+    test_file = tmp_path / "watched_reports.xlsx"
+    viewer = ExcelStorage(str(test_file))
+    viewer.preload()
+    assert not viewer.poll_external_changes()
+
+    writer = ExcelStorage(str(test_file))
+    writer.save_record(WorkRecord(date(2024, 8, 1), "P", "elsewhere", ""))
+    os.utime(test_file, ns=(0, 1)) # the save may land in the same mtime tick as the load
+
+    assert viewer.poll_external_changes()
+    assert viewer.count_records_by_month(2024, 8) == 1
+    assert not viewer.poll_external_changes()
+
+def test_file_lock_excludes_other_holders(tmp_path):
+    lock_path = tmp_path / "test.lock"
+    holder = FileLock(lock_path)
+    other = FileLock(lock_path, timeout=0.1, poll_interval=0.01)
+    with holder:
+        with holder: # reentrant
+            pass
+        with pytest.raises(TimeoutError):
+            other.acquire()
+    with other:
+        pass
+
 if __name__ == "__main__":
     test_storage()
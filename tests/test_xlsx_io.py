@@ -0,0 +1,69 @@
+from datetime import date, datetime
+import openpyxl
+from src.services import xlsx_io
+
+def _write_mixed_workbook(path):
+    workbook = openpyxl.Workbook()
+    workbook.active.title = "Other"
+    sheet = workbook.create_sheet(xlsx_io.SHEET_NAME)
+    sheet.append(xlsx_io.HEADERS)
+    sheet.append(["2024-01-02", "ProjA", "S1", "D1", "id-1"])
+    sheet.append([])
+    sheet.append([datetime(2024, 1, 3), "中文專案", None, "多行\n內容"])
+    sheet.append(["not-a-date", "ProjB", "S3", "D3"])
+    workbook.save(path)
+
+def test_streaming_engines_agree(tmp_path):
+    path = tmp_path / "mixed.xlsx"
+    _write_mixed_workbook(path)
+    errors = []
+
+    xml_records = list(xlsx_io.iter_records(str(path), on_error=lambda i, e: errors.append(i)))
+    openpyxl_records = list(xlsx_io.iter_records(str(path), engine="openpyxl"))
+
+    assert xml_records == openpyxl_records
+    assert [(i, r.date, r.project_name) for i, r in xml_records] == [
+        (2, date(2024, 1, 2), "ProjA"),
+        (4, date(2024, 1, 3), "中文專案"),
+    ]
+    assert xml_records[0][1].record_id == "id-1"
+    assert errors == [5]
+
+def test_streaming_reader_roundtrip(tmp_path):
+    from src.models.record import WorkRecord
+    path = tmp_path / "export.xlsx"
+    records = [WorkRecord(date=date(2024, 2, d), project_name="P", summary=str(d), details="", record_id=f"id{d}")
+               for d in range(1, 29)]
+    assert xlsx_io.write_records(records, str(path)) == 28
+    assert xlsx_io.read_records(str(path)) == records
+
+# Furigana as Excel stores them: rich-text runs plus an <rPh> phonetic run
+_PHONETIC = '<r><t>漢</t></r><r><t>字</t></r><rPh sb="0" eb="2"><t>かんじ</t></rPh>'
+
+def test_xml_reader_skips_phonetic_runs(tmp_path):
+    import zipfile
+    source, path = tmp_path / "plain.xlsx", tmp_path / "phonetic.xlsx"
+    workbook = openpyxl.Workbook()
+    workbook.active.title = xlsx_io.SHEET_NAME
+    workbook.active.append(xlsx_io.HEADERS)
+    workbook.active.append(["2024-01-02", "漢字", "S1", "", "id-1"])
+    workbook.save(source)
+
+    # openpyxl writes inline strings; give the project cell phonetic runs
+    with zipfile.ZipFile(source) as src, zipfile.ZipFile(path, "w") as dst:
+        for item in src.infolist():
+            data = src.read(item)
+            if item.filename.startswith("xl/worksheets/"):
+                data = data.decode("utf-8").replace("<is><t>漢字</t></is>", f"<is>{_PHONETIC}</is>")
+            dst.writestr(item, data)
+
+    [(_, record)] = xlsx_io.iter_records(str(path))
+    assert record.project_name == "漢字"
+
+    shared = tmp_path / "shared.zip"
+    with zipfile.ZipFile(shared, "w") as archive:
+        archive.writestr("xl/sharedStrings.xml",
+                         '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                         f'<si><t>plain</t></si><si>{_PHONETIC}</si></sst>')
+    with zipfile.ZipFile(shared) as archive:
+        assert xlsx_io._read_shared_strings(archive) == ["plain", "漢字"]